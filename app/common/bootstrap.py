@@ -0,0 +1,108 @@
+import numpy as np
+from scipy.stats import norm, chi2
+
+# 单个分块内重抽样下标的个数上限（重抽样次数 × 样本量），控制内存占用
+CHUNK_BUDGET = 1 << 22
+
+STATISTICS = {
+    'mean': '均值',
+    'median': '中位数',
+    'variance': '方差',
+}
+
+
+def statistic(values, name, axis=-1):
+    if name == 'mean':
+        return np.mean(values, axis=axis)
+    elif name == 'median':
+        return np.median(values, axis=axis)
+    elif name == 'variance':
+        return np.var(values, axis=axis, ddof=1)
+    raise ValueError(f"未知的统计量：{name}")
+
+
+def bootstrap_statistics(seed, sample, name, count):
+    """
+    对 sample 做 count 次有放回重抽样并返回各次的统计量
+
+    每个分块一次生成 (行数, 样本量) 的下标数组，按行计算统计量，分块大小受 CHUNK_BUDGET 限制。
+    作为进程池的工作函数，须定义在模块顶层。
+    """
+    rng = np.random.default_rng(seed)
+    n = len(sample)
+    rows = max(CHUNK_BUDGET // n, 1)
+    result = np.empty(count)
+    for start in range(0, count, rows):
+        stop = min(start + rows, count)
+        index = rng.integers(0, n, size=(stop - start, n), dtype=np.int32 if n < 2**31 else np.int64)
+        result[start:stop] = statistic(sample[index], name, axis=1)
+    return result
+
+
+def jackknife(sample, name):
+    """返回逐一剔除每个观测值后的统计量（刀切法），用于 BCa 区间的加速常数"""
+    n = len(sample)
+    if name == 'mean':
+        return (sample.sum() - sample) / (n - 1)
+    elif name == 'variance':
+        total = sample.sum()
+        squares = (sample ** 2).sum()
+        loo_mean = (total - sample) / (n - 1)
+        return (squares - sample ** 2 - (n - 1) * loo_mean ** 2) / (n - 2)
+    elif name == 'median':
+        # 剔除一个观测值后的中位数只取决于它位于原中位数的哪一侧
+        order = np.argsort(sample, kind='stable')
+        x = sample[order]
+        rank = np.empty(n, dtype=np.int64)
+        rank[order] = np.arange(n)
+        m = n // 2
+        if n % 2 == 1:
+            result = np.where(rank < m, (x[m] + x[m + 1]) / 2, (x[m - 1] + x[m]) / 2)
+            result[rank == m] = (x[m - 1] + x[m + 1]) / 2
+        else:
+            result = np.where(rank < m, x[m], x[m - 1])
+        return result
+    raise ValueError(f"未知的统计量：{name}")
+
+
+def percentile_interval(boot, level):
+    alpha = 1 - level
+    return tuple(np.quantile(boot, [alpha / 2, 1 - alpha / 2]))
+
+
+def bca_interval(boot, estimate, jack, level):
+    """偏差校正加速（BCa）区间"""
+    alpha = 1 - level
+    # 偏差校正常数，取等号的部分按一半计入
+    proportion = (np.count_nonzero(boot < estimate) + 0.5 * np.count_nonzero(boot == estimate)) / len(boot)
+    z0 = norm.ppf(np.clip(proportion, 1 / len(boot), 1 - 1 / len(boot)))
+    # 加速常数
+    d = jack.mean() - jack
+    denominator = 6 * (d ** 2).sum() ** 1.5
+    a = (d ** 3).sum() / denominator if denominator > 0 else 0.0
+    z = norm.ppf([alpha / 2, 1 - alpha / 2])
+    q = norm.cdf(z0 + (z0 + z) / (1 - a * (z0 + z)))
+    return tuple(np.quantile(boot, q))
+
+
+def normal_theory_interval(sample, name, level):
+    """
+    正态总体假设下的理论区间
+
+    均值：x̄ ± z·s/√n；中位数：渐近方差 πσ²/(2n)；方差：(n-1)s²/χ² 区间。
+    """
+    alpha = 1 - level
+    n = len(sample)
+    s2 = np.var(sample, ddof=1)
+    z = norm.ppf(1 - alpha / 2)
+    if name == 'mean':
+        half_width = z * np.sqrt(s2 / n)
+        center = sample.mean()
+        return center - half_width, center + half_width
+    elif name == 'median':
+        half_width = z * np.sqrt(np.pi * s2 / (2 * n))
+        center = np.median(sample)
+        return center - half_width, center + half_width
+    elif name == 'variance':
+        return (n - 1) * s2 / chi2.ppf(1 - alpha / 2, n - 1), (n - 1) * s2 / chi2.ppf(alpha / 2, n - 1)
+    raise ValueError(f"未知的统计量：{name}")
@@ -0,0 +1,70 @@
+import numpy as np
+
+# 可由参数名设置的控件属性名后缀，参数名为属性名去掉后缀
+CONTROL_SUFFIXES = ('_spin', '_combo', '_toggle')
+
+
+def link_log_slider(spin, slider, scale=10):
+    """
+    同步跨越多个数量级的数值框与滑块，滑块取 scale 倍的常用对数
+
+    只有滑块位置与数值框当前值对应的位置不同时才回写数值框，
+    避免对数取整后把用户输入的值改成最近的刻度值（如 2000 被改成 1995）。
+    """
+    def position(value):
+        return int(round(scale * np.log10(value)))
+
+    def on_spin_changed(value):
+        slider.setValue(position(value))
+
+    def on_slider_changed(value):
+        if value != position(spin.value()):
+            spin.setValue(int(10 ** (value / scale)))
+
+    spin.valueChanged.connect(on_spin_changed)
+    slider.valueChanged.connect(on_slider_changed)
+
+
+def controls(interface):
+    """返回界面上可设置的参数名及对应控件"""
+    result = {}
+    for attribute in sorted(vars(interface)):
+        for suffix in CONTROL_SUFFIXES:
+            if attribute.endswith(suffix):
+                result[attribute[:-len(suffix)]] = getattr(interface, attribute)
+    return result
+
+
+def set_control(control, value):
+    """按控件类型把字符串形式的参数值写入控件，触发与界面操作相同的信号"""
+    # qfluentwidgets 的 ComboBox 继承自 QPushButton，须先于开关判断
+    if hasattr(control, 'setCurrentIndex'):
+        index = int(value) if value.lstrip('-').isdigit() else control.findText(value)
+        if not 0 <= index < control.count():
+            items = [control.itemText(i) for i in range(control.count())]
+            raise ValueError(f"无效的选项：{value}，可选：{', '.join(items)}")
+        control.setCurrentIndex(index)
+    elif hasattr(control, 'setChecked'):
+        control.setChecked(value.lower() in ('1', 'true', 'yes', 'on'))
+    elif isinstance(control.value(), int):
+        control.setValue(int(round(float(value))))
+    else:
+        control.setValue(float(value))
+
+
+def control_value(control):
+    """控件当前值的字符串形式，可由 set_control 写回"""
+    if hasattr(control, 'currentIndex'):
+        return str(control.currentIndex())
+    elif hasattr(control, 'isChecked'):
+        return 'true' if control.isChecked() else 'false'
+    return f'{control.value():.12g}'
+
+
+def control_signal(control):
+    """控件的值改变时发出的信号"""
+    if hasattr(control, 'currentIndexChanged'):
+        return control.currentIndexChanged
+    elif hasattr(control, 'toggled'):
+        return control.toggled
+    return control.valueChanged
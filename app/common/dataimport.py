@@ -0,0 +1,179 @@
+import os
+
+import numpy as np
+
+# 二进制文件每块读取的数值个数，文本文件每块读取的字节数
+CHUNK_SIZE = 1 << 20
+TEXT_CHUNK_BYTES = 1 << 24
+# 按小端 float64 解释的原始二进制文件扩展名
+BINARY_EXTENSIONS = ('.bin', '.f64', '.dat')
+
+
+def _binary_chunks(f, dtype, count, columns=1, fortran=False):
+    """从文件当前位置按块读取 count 行、每行 columns 个数值的二维数组的第一列"""
+    if fortran:
+        # 列优先存储时第一列是连续的
+        columns = 1
+    done = 0
+    while done < count:
+        rows = min(max(CHUNK_SIZE // columns, 1), count - done)
+        block = np.fromfile(f, dtype=dtype, count=rows * columns)
+        if len(block) < rows * columns:
+            raise ValueError("文件长度与数据头记录的形状不符")
+        done += rows
+        yield block[::columns].astype(float), done, count
+
+
+def _parse_lines(lines, first):
+    """解析一块文本行的第一列，首块解析失败时先尝试跳过表头，仍失败则把无法解析的行记为缺失值"""
+    try:
+        return np.loadtxt(lines, delimiter=',', usecols=0, ndmin=1)
+    except ValueError:
+        pass
+    if first:
+        try:
+            return np.loadtxt(lines[1:], delimiter=',', usecols=0, ndmin=1)
+        except ValueError:
+            pass
+    return np.atleast_1d(np.genfromtxt(lines, delimiter=',', usecols=0))
+
+
+def read_chunks(path):
+    """
+    分块读取数据文件的第一列，依次产生 (本块数值, 已读取量, 总量)
+
+    .npy 与原始二进制文件按块读入，文本文件（CSV）按行分块解析，
+    任何时候只有一块数据在内存中。
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.npy':
+        with open(path, 'rb') as f:
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+            if len(shape) not in (1, 2):
+                raise ValueError(f"不支持 {len(shape)} 维数组")
+            columns = shape[1] if len(shape) == 2 else 1
+            yield from _binary_chunks(f, dtype, shape[0], columns, fortran)
+    elif extension in BINARY_EXTENSIONS:
+        with open(path, 'rb') as f:
+            yield from _binary_chunks(f, '<f8', os.path.getsize(path) // 8)
+    else:
+        total = os.path.getsize(path)
+        done = 0
+        first = True
+        with open(path, encoding='utf-8', errors='replace') as f:
+            while True:
+                lines = f.readlines(TEXT_CHUNK_BYTES)
+                if not lines:
+                    break
+                done += sum(map(len, lines))
+                yield _parse_lines(lines, first), min(done, total), total
+                first = False
+
+
+class StreamingHistogram:
+    """
+    范围未知时的一遍式等宽直方图
+
+    数据超出当前范围时把分箱宽度加倍并两两合并相邻分箱，原有分箱落在扩展后范围的一半中，
+    分箱数保持不变。首块数据均为整数时分箱边界取半整数、宽度取 2 的幂，整数不会落在边界上。
+    """
+    def __init__(self, bins=256):
+        self.bins = bins
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.lo = None
+        self.width = None
+
+    @property
+    def edges(self):
+        return self.lo + self.width * np.arange(self.bins + 1)
+
+    def _grow(self, left):
+        merged = self.counts.reshape(-1, 2).sum(axis=1)
+        empty = np.zeros(self.bins // 2, dtype=np.int64)
+        if left:
+            self.counts = np.concatenate([empty, merged])
+            self.lo -= self.bins * self.width
+        else:
+            self.counts = np.concatenate([merged, empty])
+        self.width *= 2
+
+    def add(self, values):
+        if len(values) == 0:
+            return
+        vmin, vmax = values.min(), values.max()
+        if self.lo is None:
+            if np.all(values == np.round(values)):
+                self.lo = vmin - 0.5
+                self.width = 2.0 ** max(np.ceil(np.log2((vmax - vmin + 1) / self.bins)), 0)
+            else:
+                self.lo = vmin
+                self.width = max(vmax - vmin, abs(vmin) * 1e-9, 1e-300) * (1 + 1e-9) / self.bins
+        while vmin < self.lo:
+            self._grow(left=True)
+        while vmax >= self.lo + self.bins * self.width:
+            self._grow(left=False)
+        index = np.floor((values - self.lo) / self.width).astype(np.intp)
+        np.clip(index, 0, self.bins - 1, out=index)
+        self.counts += np.bincount(index, minlength=self.bins)
+
+
+class StreamingSummary:
+    """
+    一遍扫描中累积的充分统计量与直方图
+
+    均值与离差平方和按块合并（Chan 等的并行算法），避免直接累加平方和造成的精度损失；
+    另记录最小值、最大值、是否全为整数以及 Σln x、Σln(1-x)，供各分布的极大似然估计使用。
+    """
+    def __init__(self, bins=256):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.integer = True
+        self.sum_log = 0.0
+        self.sum_log1m = 0.0
+        self.skipped = 0
+        self.histogram = StreamingHistogram(bins)
+
+    @property
+    def var(self):
+        """方差的极大似然估计（除以 n）"""
+        return self.m2 / self.count if self.count else np.nan
+
+    @property
+    def mean_log(self):
+        return self.sum_log / self.count
+
+    @property
+    def mean_log1m(self):
+        return self.sum_log1m / self.count
+
+    def add(self, values):
+        finite = np.isfinite(values)
+        self.skipped += len(values) - np.count_nonzero(finite)
+        values = values[finite]
+        n = len(values)
+        if n == 0:
+            return
+
+        mean = values.mean()
+        m2 = np.square(values - mean).sum()
+        total = self.count + n
+        delta = mean - self.mean
+        self.m2 += m2 + delta ** 2 * self.count * n / total
+        self.mean += delta * n / total
+        self.count = total
+
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self.integer = self.integer and bool(np.all(values == np.round(values)))
+        # 只在相应的对数有定义时才会被使用，此处对定义域外的值取 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.sum_log += np.log(np.where(values > 0, values, 1)).sum()
+            self.sum_log1m += np.log1p(-np.where(values < 1, values, 0)).sum()
+        self.histogram.add(values)
@@ -0,0 +1,156 @@
+from functools import lru_cache
+
+import numpy as np
+from scipy.special import expit, logit
+from scipy.stats import (
+    norm, uniform, expon, t as student_t, gamma, beta, cauchy,
+    bernoulli, binom, poisson, hypergeom, geom, nbinom, rv_discrete
+)
+
+# 截断支撑区间时舍弃的尾部概率质量（左右各一半）
+TAIL_MASS = 1e-6
+# 连续分布逆分布函数查找表的网格点数
+PPF_TABLE_SIZE = 4096
+
+# 各分布的中文名称与默认参数，与 ContinuousPDF / DiscretePDF 中的默认值保持一致
+CONTINUOUS_FAMILIES = {
+    'uniform': ('均匀分布', {'a': 0, 'b': 1}),
+    'normal': ('正态分布', {'mu': 0, 'sigma': 1}),
+    'exponential': ('指数分布', {'lambda': 1}),
+    't': ('t分布', {'df': 5}),
+    'gamma': ('伽马分布', {'alpha': 2, 'beta': 1}),
+    'beta': ('贝塔分布', {'alpha': 2, 'beta': 5}),
+}
+DISCRETE_FAMILIES = {
+    'bernoulli': ('两点分布', {'p': 0.5}),
+    'binomial': ('二项分布', {'n': 10, 'p': 0.5}),
+    'poisson': ('泊松分布', {'lambda': 5}),
+    'hypergeometric': ('超几何分布', {'M': 50, 'n': 10, 'N': 20}),
+    'geometric': ('几何分布', {'p': 0.5}),
+    'negative_binomial': ('负二项分布', {'r': 5, 'p': 0.5}),
+}
+FAMILIES = {**DISCRETE_FAMILIES, **CONTINUOUS_FAMILIES}
+# 期望不存在的重尾分布，只用于展示大数定律失效的情形，不参与依赖有限方差的实验
+HEAVY_TAILED_FAMILIES = {
+    'cauchy': ('柯西分布', {'x0': 0, 'gamma': 1}),
+}
+
+# 曲线族模式下各连续分布扫描的参数、取值范围及显示名称（均匀分布的 b 为相对 a 的增量）
+FAMILY_SWEEPS = {
+    'uniform': ('b', 0.5, 20, 'b'),
+    'normal': ('sigma', 0.3, 3, 'σ'),
+    'exponential': ('lambda', 0.2, 3, 'λ'),
+    't': ('df', 2, 30, 'ν'),
+    'gamma': ('alpha', 0.5, 10, 'α'),
+    'beta': ('alpha', 0.5, 10, 'α'),
+}
+
+
+def default_params(dist_type):
+    """返回分布的默认参数（副本）"""
+    if dist_type in HEAVY_TAILED_FAMILIES:
+        return dict(HEAVY_TAILED_FAMILIES[dist_type][1])
+    return dict(FAMILIES[dist_type][1])
+
+
+def is_discrete(dist_type):
+    return dist_type in DISCRETE_FAMILIES
+
+
+def freeze(dist_type, params):
+    """按视图中使用的参数字典构造 scipy 冻结分布"""
+    if dist_type == 'uniform':
+        return uniform(loc=params['a'], scale=params['b'] - params['a'])
+    elif dist_type == 'normal':
+        return norm(loc=params['mu'], scale=params['sigma'])
+    elif dist_type == 'exponential':
+        return expon(scale=1 / params['lambda'])
+    elif dist_type == 't':
+        return student_t(df=params['df'])
+    elif dist_type == 'gamma':
+        return gamma(a=params['alpha'], scale=1 / params['beta'])
+    elif dist_type == 'beta':
+        return beta(a=params['alpha'], b=params['beta'])
+    elif dist_type == 'cauchy':
+        return cauchy(loc=params['x0'], scale=params['gamma'])
+    elif dist_type == 'bernoulli':
+        return bernoulli(params['p'])
+    elif dist_type == 'binomial':
+        return binom(params['n'], params['p'])
+    elif dist_type == 'poisson':
+        return poisson(params['lambda'])
+    elif dist_type == 'hypergeometric':
+        return hypergeom(params['M'], params['n'], params['N'])
+    elif dist_type == 'geometric':
+        return geom(params['p'])
+    elif dist_type == 'negative_binomial':
+        return nbinom(params['r'], params['p'])
+    raise ValueError(f"未知的分布类型：{dist_type}")
+
+
+def params_key(params):
+    """将参数字典转换为可哈希的键，用于缓存"""
+    return tuple(sorted(params.items()))
+
+
+@lru_cache(maxsize=256)
+def _support_bounds(dist_type, key, tail):
+    dist = freeze(dist_type, dict(key))
+    lower, upper = dist.support()
+    lo = max(lower, dist.ppf(tail / 2))
+    hi = min(upper, dist.isf(tail / 2))
+    return int(lo), int(hi)
+
+
+def support_bounds(dist_type, params, tail=TAIL_MASS):
+    """返回离散分布覆盖 1-tail 概率质量的整数支撑区间 [lo, hi]，按参数缓存逆分布函数的结果"""
+    return _support_bounds(dist_type, params_key(params), tail)
+
+
+class PPFTable:
+    """
+    逆分布函数查找表
+    
+    构造时一次性向量化计算：离散分布在覆盖 1-TAIL_MASS 概率质量的支撑上计算分布函数，
+    连续分布在概率空间中按 logit 均匀取点计算逆分布函数。之后的分位数查询只做二分查找（离散分布）
+    或在 logit(q) 上插值（连续分布），不再逐次求根。
+    """
+    def __init__(self, dist_type, params, size=PPF_TABLE_SIZE):
+        dist = freeze(dist_type, params)
+        self.discrete = isinstance(dist.dist, rv_discrete)
+        if self.discrete:
+            lo, hi = support_bounds(dist_type, params)
+            self.x = np.arange(lo, hi + 1)
+            # 保证数值误差下分布函数仍单调不减
+            self.cdf = np.maximum.accumulate(dist.cdf(self.x))
+        else:
+            # 密度在支撑端点发散时（如 α < 1 的伽马、贝塔分布）分位数随 q 变化极快，
+            # 在 x 的网格上插值分布函数会差几个数量级，因此直接在 q 的网格上取逆分布函数的值；
+            # logit 均匀的网格在两侧尾部按几何级数加密
+            edge = logit(TAIL_MASS / 2)
+            self.logit_cdf = np.linspace(edge, -edge, size)
+            self.cdf = expit(self.logit_cdf)
+            self.x = np.maximum.accumulate(dist.ppf(self.cdf))
+
+    def quantile(self, q):
+        """返回满足 P(X <= x) = q 的分位数，离散分布取满足 F(k) >= q 的最小 k"""
+        q = np.asarray(q, dtype=float)
+        if self.discrete:
+            index = np.searchsorted(self.cdf, q - 1e-12, side='left')
+            return self.x[np.minimum(index, len(self.x) - 1)]
+        return np.interp(logit(q), self.logit_cdf, self.x)
+
+    def critical_values(self, alpha):
+        """返回显著性水平 alpha 下的双侧临界值 (x_{alpha/2}, x_{1-alpha/2})"""
+        lower, upper = self.quantile([alpha / 2, 1 - alpha / 2])
+        return lower, upper
+
+
+@lru_cache(maxsize=64)
+def _ppf_table(dist_type, key):
+    return PPFTable(dist_type, dict(key))
+
+
+def ppf_table(dist_type, params):
+    """返回按分布类型和参数缓存的逆分布函数查找表"""
+    return _ppf_table(dist_type, params_key(params))
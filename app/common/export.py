@@ -0,0 +1,160 @@
+import itertools
+import os
+import queue
+import threading
+
+import numpy as np
+
+from .rng import BLOCK_STEPS, fill_steps
+from .simulation import toss_coins, roll_dice, normal_sample_means, MEANS_BLOCK_STEPS
+
+# 每块导出的步数，与随机数流的块大小相同
+EXPORT_CHUNK = BLOCK_STEPS
+# 生成线程与写入线程之间最多缓冲的块数
+QUEUE_CHUNKS = 4
+EXPORT_FORMATS = ('.csv', '.parquet', '.arrow')
+
+
+def trace_chunks(view, steps, seed, params=None, chunk_steps=EXPORT_CHUNK):
+    """
+    按块生成实验的原始模拟记录，依次产生 (已生成步数, {列名: 数组})
+
+    使用与界面相同的随机数流（见 rng.fill_steps），相同种子导出的前 n 步与界面中显示的完全一致；
+    每块只生成 chunk_steps 步，累计量（正面次数、平均点数）跨块延续。
+    coin_tossing_experiment：step、toss（1 为正面）、heads、frequency；
+    dice_rolling_experiment：step、roll、mean；
+    consistency_of_point_estimation：trial 与各样本量的样本均值 mean_n{样本量}，
+    params 须给出 mu、sigma 与 sizes（样本量列表）。
+    """
+    params = params or {}
+    if view == 'coin_tossing_experiment':
+        heads = 0
+        for start in range(0, steps, chunk_steps):
+            tosses = np.empty(min(chunk_steps, steps - start), np.uint8)
+            fill_steps(toss_coins, tosses, seed, start)
+            step = np.arange(start + 1, start + len(tosses) + 1)
+            counts = heads + np.cumsum(tosses, dtype=np.int64)
+            heads = int(counts[-1])
+            yield start + len(tosses), {'step': step, 'toss': tosses, 'heads': counts, 'frequency': counts / step}
+    elif view == 'dice_rolling_experiment':
+        total = 0
+        for start in range(0, steps, chunk_steps):
+            rolls = np.empty(min(chunk_steps, steps - start), np.uint8)
+            fill_steps(roll_dice, rolls, seed, start)
+            step = np.arange(start + 1, start + len(rolls) + 1)
+            sums = total + np.cumsum(rolls, dtype=np.int64)
+            total = int(sums[-1])
+            yield start + len(rolls), {'step': step, 'roll': rolls, 'mean': sums / step}
+    elif view == 'consistency_of_point_estimation':
+        sizes = [int(size) for size in params['sizes']]
+        args = (float(params['mu']), float(params['sigma']), sizes)
+        for start in range(0, steps, chunk_steps):
+            means = np.empty((min(chunk_steps, steps - start), len(sizes)))
+            fill_steps(normal_sample_means, means, seed, start, MEANS_BLOCK_STEPS, args)
+            columns = {'trial': np.arange(start + 1, start + len(means) + 1)}
+            for i, size in enumerate(sizes):
+                columns[f'mean_n{size}'] = means[:, i]
+            yield start + len(means), columns
+    else:
+        raise ValueError(f"视图 {view} 没有可导出的模拟记录")
+
+
+class CsvTraceWriter:
+    def __init__(self, path):
+        self.file = open(path, 'w', encoding='utf-8', newline='')
+        self.format = None
+
+    def write(self, columns):
+        if self.format is None:
+            self.file.write(','.join(columns) + '\n')
+            self.format = ','.join('%.10g' if column.dtype.kind == 'f' else '%d' for column in columns.values())
+        rows = zip(*(column.tolist() for column in columns.values()))
+        self.file.write('\n'.join(map(self.format.__mod__, rows)) + '\n')
+
+    def close(self):
+        self.file.close()
+
+
+class ArrowTraceWriter:
+    """Parquet 或 Arrow IPC 文件，需要安装 pyarrow；每块写成一个行组（记录批）"""
+    def __init__(self, path, parquet):
+        try:
+            import pyarrow
+        except ImportError:
+            raise ValueError("导出 Parquet / Arrow 文件需要安装 pyarrow")
+        self.pa = pyarrow
+        self.path = path
+        self.parquet = parquet
+        self.writer = None
+
+    def write(self, columns):
+        table = self.pa.table(columns)
+        if self.writer is None:
+            if self.parquet:
+                import pyarrow.parquet
+                self.writer = pyarrow.parquet.ParquetWriter(self.path, table.schema)
+            else:
+                self.writer = self.pa.ipc.new_file(self.path, table.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def open_writer(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        return CsvTraceWriter(path)
+    elif extension in ('.parquet', '.arrow'):
+        return ArrowTraceWriter(path, extension == '.parquet')
+    raise ValueError(f"不支持的导出格式：{extension or path}，可用格式：{', '.join(EXPORT_FORMATS)}")
+
+
+def export_trace(path, view, steps, seed, params=None, progress=None, stopped=None):
+    """
+    把 trace_chunks 生成的记录流式写入 path（.csv、.parquet 或 .arrow），返回写入的步数
+
+    当前线程生成数据，后台线程格式化并写入，两者之间的队列最多缓冲 QUEUE_CHUNKS 块，
+    因此内存占用与总步数无关。每块写入队列后调用 progress(已生成步数, 总步数)；
+    stopped() 返回 True 时提前结束，已写入的部分保留。
+    """
+    # 先生成第一块，参数有误时不创建（覆盖）输出文件
+    records = trace_chunks(view, steps, seed, params)
+    first = next(records, None)
+    records = itertools.chain([first] if first is not None else [], records)
+    writer = open_writer(path)
+    chunks = queue.Queue(QUEUE_CHUNKS)
+    errors = []
+
+    def drain():
+        while True:
+            columns = chunks.get()
+            if columns is None:
+                return
+            if errors:
+                # 写入出错后继续取出剩余的块，避免生成线程在队列满时阻塞
+                continue
+            try:
+                writer.write(columns)
+            except Exception as e:
+                errors.append(e)
+
+    thread = threading.Thread(target=drain, daemon=True)
+    thread.start()
+    written = 0
+    try:
+        for done, columns in records:
+            if errors or (stopped is not None and stopped()):
+                break
+            chunks.put(columns)
+            written = done
+            if progress is not None:
+                progress(done, steps)
+    finally:
+        chunks.put(None)
+        thread.join()
+        writer.close()
+    if errors:
+        raise errors[0]
+    return written
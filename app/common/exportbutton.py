@@ -0,0 +1,65 @@
+import os
+
+from PyQt5.QtWidgets import QFileDialog
+from qfluentwidgets import PushButton, TeachingTip, InfoBarIcon
+
+from .workers import ExportWorker
+
+EXPORT_FILTER = "CSV 文件 (*.csv);;Parquet 文件 (*.parquet);;Arrow 文件 (*.arrow)"
+
+
+class ExportButton(PushButton):
+    """
+    把实验当前的模拟记录导出到文件的按钮
+
+    source() 返回 (视图键, 步数, 种子, 参数)，与 export.trace_chunks 的参数相同；
+    导出在后台线程中进行，期间按钮显示进度。
+    """
+    def __init__(self, source, filename, parent=None):
+        # PushButton 按参数重载 __init__，带文字的重载会以 __init__(parent=parent) 回调子类，须先只传 parent
+        super().__init__(parent=parent)
+        self.setText("导出数据…")
+        self.source = source
+        self.filename = filename
+        self.worker = None
+        self.clicked.connect(self.export)
+
+    def export(self):
+        path, _ = QFileDialog.getSaveFileName(self, "导出数据", self.filename, EXPORT_FILTER)
+        if not path:
+            return
+        if self.worker is not None:
+            self.worker.stop()
+            self.worker.deleteLater()
+        view, steps, seed, params = self.source()
+        self.worker = ExportWorker(path, view, steps, seed, params, self)
+        self.worker.progress.connect(self.on_progress)
+        self.worker.exported.connect(self.on_exported)
+        self.worker.failed.connect(self.on_failed)
+        self.setEnabled(False)
+        self.worker.start()
+
+    def on_progress(self, count, permille):
+        self.setText(f"正在导出 {permille / 10:.0f}%")
+
+    def on_exported(self, path, count):
+        self.setText("导出数据…")
+        self.setEnabled(True)
+        TeachingTip.create(
+            target=self,
+            icon=InfoBarIcon.SUCCESS,
+            title='导出完成',
+            content=f"已导出 {count:,} 条记录到 {os.path.basename(path)}",
+            isClosable=True
+        )
+
+    def on_failed(self, message):
+        self.setText("导出数据…")
+        self.setEnabled(True)
+        TeachingTip.create(
+            target=self,
+            icon=InfoBarIcon.ERROR,
+            title='导出失败',
+            content=message,
+            isClosable=True
+        )
@@ -0,0 +1,113 @@
+import numpy as np
+from scipy.optimize import minimize, minimize_scalar
+from scipy.special import digamma, polygamma, betaln
+
+from .distributions import FAMILIES, freeze, is_discrete
+
+# ln(mean) - mean(ln x) 不超过该值时视为全部相同的数据（对应变异系数约 1.4e-6），不拟合伽马分布
+GAMMA_DEGENERATE_GAP = 1e-12
+
+
+def binned_log_likelihood(dist, histogram):
+    """按直方图分箱计算的对数似然 Σ 频数 · ln P(落入该箱)，连续与离散分布可以直接比较"""
+    edges = histogram.edges
+    mass = np.diff(dist.cdf(edges))
+    counts = histogram.counts
+    used = counts > 0
+    return float(np.sum(counts[used] * np.log(np.maximum(mass[used], 1e-300))))
+
+
+def _gamma_shape(s):
+    """解 ln α - ψ(α) = s，以 Minka 的近似值为初值做牛顿迭代"""
+    alpha = (3 - s + np.sqrt((s - 3) ** 2 + 24 * s)) / (12 * s)
+    for _ in range(20):
+        step = (np.log(alpha) - digamma(alpha) - s) / (1 / alpha - polygamma(1, alpha))
+        alpha = max(alpha - step, alpha / 10)
+        if abs(step) < 1e-10 * alpha:
+            break
+    return alpha
+
+
+def _fit_beta(summary):
+    """最大化 (a-1)·mean ln x + (b-1)·mean ln(1-x) - ln B(a, b)，以矩估计为初值"""
+    m, v = summary.mean, summary.var
+    common = m * (1 - m) / v - 1 if v > 0 else 1.0
+    start = np.log(np.maximum([m * common, (1 - m) * common], 1e-3))
+
+    def negative(log_ab):
+        a, b = np.exp(log_ab)
+        return -((a - 1) * summary.mean_log + (b - 1) * summary.mean_log1m - betaln(a, b))
+    a, b = np.exp(minimize(negative, start, method='Nelder-Mead').x)
+    return {'alpha': float(a), 'beta': float(b)}
+
+
+def _fit_binned(dist_type, summary, start, unpack):
+    """没有充分统计量的分布，在直方图上最大化分箱似然"""
+    def negative(theta):
+        return -binned_log_likelihood(freeze(dist_type, unpack(theta)), summary.histogram)
+    if len(start) == 1:
+        result = minimize_scalar(lambda x: negative([x]), bounds=(start[0] - 5, start[0] + 5), method='bounded')
+        return unpack([result.x])
+    return unpack(minimize(negative, start, method='Nelder-Mead').x)
+
+
+def fit_params(dist_type, summary):
+    """
+    由充分统计量求分布参数的极大似然估计，数据不在分布的支撑集内时返回 None
+
+    二项分布的试验次数取样本最大值；t 分布与负二项分布没有低维充分统计量，在直方图上做分箱极大似然；
+    超几何分布的参数难以辨识，不做拟合。
+    """
+    s = summary
+    if is_discrete(dist_type) and not s.integer:
+        return None
+    if dist_type == 'normal':
+        return {'mu': s.mean, 'sigma': np.sqrt(s.var)} if s.var > 0 else None
+    elif dist_type == 'uniform':
+        return {'a': s.min, 'b': s.max} if s.max > s.min else None
+    elif dist_type == 'exponential':
+        return {'lambda': 1 / s.mean} if s.min >= 0 and s.mean > 0 else None
+    elif dist_type == 'gamma':
+        # 由 Jensen 不等式 ln(mean) >= mean(ln x)，数据全部相同时取等号，形状参数的估计趋于无穷；
+        # 累加和的舍入误差会留下极小的正差值，同样视为退化样本
+        gap = np.log(s.mean) - s.mean_log if s.min > 0 else 0.0
+        if s.var <= 0 or not gap > GAMMA_DEGENERATE_GAP:
+            return None
+        alpha = _gamma_shape(gap)
+        return {'alpha': alpha, 'beta': alpha / s.mean}
+    elif dist_type == 'beta':
+        return _fit_beta(s) if s.min > 0 and s.max < 1 else None
+    elif dist_type == 't':
+        return _fit_binned('t', s, [np.log(5)], lambda theta: {'df': float(np.exp(theta[0]))})
+    elif dist_type == 'bernoulli':
+        return {'p': s.mean} if s.min >= 0 and s.max <= 1 and 0 < s.mean < 1 else None
+    elif dist_type == 'binomial':
+        n = int(s.max)
+        return {'n': n, 'p': s.mean / n} if s.min >= 0 and 0 < s.mean < n else None
+    elif dist_type == 'poisson':
+        return {'lambda': s.mean} if s.min >= 0 and s.mean > 0 else None
+    elif dist_type == 'geometric':
+        return {'p': 1 / s.mean} if s.min >= 1 else None
+    elif dist_type == 'negative_binomial':
+        if s.min < 0 or s.var <= s.mean:
+            return None
+        p = s.mean / s.var
+        start = [np.log(s.mean * p / (1 - p)), np.log(p / (1 - p))]
+        return _fit_binned('negative_binomial', s, start, lambda theta: {
+            'r': float(np.exp(theta[0])), 'p': float(1 / (1 + np.exp(-theta[1])))
+        })
+    return None
+
+
+def fit_all(summary):
+    """对所有分布族拟合并按 AIC 从小到大排序，返回 [(分布类型, 参数, 对数似然, AIC)]"""
+    fits = []
+    for dist_type in FAMILIES:
+        params = fit_params(dist_type, summary)
+        if params is None:
+            continue
+        params = {k: float(v) if k != 'n' else v for k, v in params.items()}
+        loglik = binned_log_likelihood(freeze(dist_type, params), summary.histogram)
+        fits.append((dist_type, params, loglik, 2 * len(params) - 2 * loglik))
+    fits.sort(key=lambda fit: fit[3])
+    return fits
@@ -0,0 +1,111 @@
+from collections import OrderedDict
+
+from PyQt5.QtGui import QImage, QPainter
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+from qfluentwidgets import isDarkTheme
+
+# 缓存图像的总字节数上限
+FRAME_CACHE_BYTES = 128 << 20
+
+
+class FrameCache:
+    """
+    已渲染图像的 LRU 缓存，按总字节数限制容量
+
+    键由视图名、规范化后的参数、主题与画布像素尺寸组成，见 CachedCanvas.key。
+    """
+    def __init__(self, max_bytes=FRAME_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.enabled = True
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        if not self.enabled:
+            return None
+        image = self.entries.get(key)
+        if image is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return image
+
+    def put(self, key, image):
+        size = image.sizeInBytes()
+        if not self.enabled or size > self.max_bytes:
+            return
+        if key in self.entries:
+            self.bytes -= self.entries.pop(key).sizeInBytes()
+        self.entries[key] = image
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.bytes -= evicted.sizeInBytes()
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+
+# 所有视图共用的缓存
+frame_cache = FrameCache()
+
+
+class CachedCanvas(FigureCanvasQTAgg):
+    """
+    可以直接显示缓存图像的画布
+
+    命中缓存时只绘制保存的图像，Figure 本身仍是上一次的内容；此后任何真正的重绘
+    （改变大小、鼠标旋转三维坐标轴等）都先调用 rebuild 按当前参数重新构建图像。
+    """
+    def __init__(self, figure, rebuild):
+        super().__init__(figure)
+        self.rebuild = rebuild
+        self.cached = None
+
+    def key(self, view, *params):
+        """缓存键：视图名、参数（浮点数四舍五入到 10 位小数）、主题与画布的物理像素尺寸"""
+        params = tuple(round(p, 10) if isinstance(p, float) else p for p in params)
+        return view, params, isDarkTheme(), self.get_width_height(physical=True)
+
+    def show_cached(self, key):
+        """缓存中有 key 对应的图像时显示它并返回 True"""
+        image = frame_cache.get(key)
+        if image is None:
+            return False
+        self.cached = image
+        self.update()
+        return True
+
+    def store(self, key):
+        """把刚绘制完成的画面存入缓存，须在 draw() 之后调用"""
+        if not frame_cache.enabled:
+            return
+        width, height = self.get_width_height(physical=True)
+        image = QImage(self.buffer_rgba(), width, height, QImage.Format_RGBA8888).copy()
+        image.setDevicePixelRatio(self.device_pixel_ratio)
+        frame_cache.put(key, image)
+
+    def draw(self):
+        if self.cached is not None:
+            self.cached = None
+            self.rebuild()
+            return
+        super().draw()
+
+    def paintEvent(self, event):
+        if self.cached is None:
+            super().paintEvent(event)
+            return
+        painter = QPainter(self)
+        painter.eraseRect(event.rect())
+        painter.drawImage(0, 0, self.cached)
+        painter.end()
@@ -0,0 +1,60 @@
+import numpy as np
+from scipy.stats import norm
+
+from .rng import fill_steps
+from .simulation import toss_coins
+
+# 每次推进时生成的投币次数上限（重复次数 × 步数），控制单次计算的内存与耗时
+CHUNK_BUDGET = 1 << 20
+# 每一步要为全部重复各投一次币，随机数流按较小的块划分
+BANDS_BLOCK_STEPS = 16
+# 每一步记录的分位数，依次为 5%、25%、50%、75%、95%
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+class FrequencyBands:
+    """
+    K 次独立重复投币时，每一步正面频率在各次重复之间的分位数
+
+    投币按 (步, 重复) 排列、按整块步数分块生成（见 rng.fill_steps），每块最多 CHUNK_BUDGET 次投币；
+    块内沿步数求累加和并加上此前各次重复的正面次数，逐步求出跨重复的分位数后即丢弃该块，
+    因此内存占用为 重复次数 + 分位数个数 × 步数，单次计算的峰值只取决于块的大小。
+    结果只由种子与重复次数决定，与分块方式无关。
+    """
+    def __init__(self, seed, runs, size):
+        self.seed = seed
+        self.runs = runs
+        self.size = size
+        self.quantiles = np.full((len(QUANTILES), size), np.nan)
+        self.heads = np.zeros(runs, dtype=np.int32)
+        self.done = 0
+
+    @property
+    def finished(self):
+        return self.done >= self.size
+
+    def advance(self):
+        """推进约 CHUNK_BUDGET / 重复次数 步（取整块）"""
+        if self.finished:
+            return
+        start = self.done
+        steps = max(CHUNK_BUDGET // (self.runs * BANDS_BLOCK_STEPS), 1) * BANDS_BLOCK_STEPS
+        stop = min(start + steps, self.size)
+
+        tosses = np.empty((stop - start, self.runs), dtype=np.uint8)
+        fill_steps(toss_coins, tosses, self.seed, start, BANDS_BLOCK_STEPS)
+        counts = np.cumsum(tosses, axis=0, dtype=np.int32)
+        counts += self.heads
+
+        # 同一步各次重复的分母相同，先求正面次数的分位数再除以步数
+        n = np.arange(start + 1, stop + 1)
+        self.quantiles[:, start:stop] = np.quantile(counts, QUANTILES, axis=1) / n
+
+        self.heads = counts[-1].copy()
+        self.done = stop
+
+    def envelope(self, p=0.5):
+        """由中心极限定理得到的各分位数的近似值 p + z·√(p(1−p)/n)，形状与 quantiles 相同"""
+        n = np.arange(1, self.size + 1)
+        z = norm.ppf(QUANTILES)
+        return p + z[:, None] * np.sqrt(p * (1 - p) / n)
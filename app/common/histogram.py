@@ -0,0 +1,47 @@
+import numpy as np
+
+
+class Histogram2D:
+    """
+    固定网格上的二维直方图累加器
+
+    样本分批加入，每批用 np.bincount 统计落入各格的个数后立即丢弃，
+    内存占用只与网格大小有关，与样本总数无关。
+    """
+    def __init__(self, x_range, y_range, bins):
+        self.x_range = x_range
+        self.y_range = y_range
+        self.bins = bins
+        self.x_scale = bins / (x_range[1] - x_range[0])
+        self.y_scale = bins / (y_range[1] - y_range[0])
+        self.counts = np.zeros(bins * bins, dtype=np.int64)
+        # 包括落在网格外的样本，密度按总样本数归一化
+        self.total = 0
+
+    @property
+    def extent(self):
+        return (*self.x_range, *self.y_range)
+
+    def add(self, x, y):
+        ix = np.floor((x - self.x_range[0]) * self.x_scale).astype(np.intp)
+        iy = np.floor((y - self.y_range[0]) * self.y_scale).astype(np.intp)
+        inside = (ix >= 0) & (ix < self.bins) & (iy >= 0) & (iy < self.bins)
+        index = iy[inside] * self.bins + ix[inside]
+        self.counts += np.bincount(index, minlength=self.bins * self.bins)
+        self.total += len(x)
+
+    def density(self):
+        """返回按 (y, x) 排列的经验概率密度，可直接交给 imshow(origin='lower')"""
+        if self.total == 0:
+            return np.zeros((self.bins, self.bins))
+        cell_area = 1 / (self.x_scale * self.y_scale)
+        return (self.counts / (self.total * cell_area)).reshape(self.bins, self.bins)
+
+
+def sample_bivariate_normal(rng, mean, cov, size):
+    """通过协方差矩阵的 Cholesky 分解 L 生成 size 个相关正态样本 (x, y) = mean + L z"""
+    L = np.linalg.cholesky(cov)
+    z = rng.standard_normal((2, size))
+    x = mean[0] + L[0, 0] * z[0]
+    y = mean[1] + L[1, 0] * z[0] + L[1, 1] * z[1]
+    return x, y
@@ -0,0 +1,44 @@
+from functools import lru_cache
+
+import numpy as np
+from scipy.special import ndtr
+from scipy.stats import norm
+
+# 功效曲面的网格：α 与界面滑块的分辨率一致，δ = μ₁ - μ₀ 覆盖 μ₀、μ₁ 各自的取值范围
+ALPHA_GRID = np.arange(1, 201) / 1000
+N_GRID = np.arange(1, 101)
+DELTA_GRID = np.linspace(-10, 10, 201)
+
+
+def critical_values(alpha, mu_0, sigma, n):
+    """双侧 z 检验的拒绝域边界：样本均值落在 (lower, upper) 之外时拒绝 H0"""
+    half_width = norm.ppf(1 - alpha / 2) * sigma / np.sqrt(n)
+    return mu_0 - half_width, mu_0 + half_width
+
+
+def type_two_error(alpha, mu_0, mu_1, sigma, n):
+    """真实均值为 μ₁ 时接受 H0 的概率 β"""
+    lower, upper = critical_values(alpha, mu_0, sigma, n)
+    scale = sigma / np.sqrt(n)
+    return norm.cdf(upper, mu_1, scale) - norm.cdf(lower, mu_1, scale)
+
+
+@lru_cache(maxsize=8)
+def beta_surface(sigma):
+    """
+    在 (α, n, δ) 网格上计算第二类错误概率 β，按 σ 缓存
+    
+    β = Φ(z - δ√n/σ) - Φ(-z - δ√n/σ)，两项拼成一个 float32 广播数组，
+    只调用一次标准正态分布函数（即 norm.cdf 底层的 ndtr，省去参数检查的开销）。
+    返回形状为 (len(ALPHA_GRID), len(N_GRID), len(DELTA_GRID)) 的 float32 数组。
+    """
+    z = norm.ppf(1 - ALPHA_GRID / 2).astype(np.float32)[:, None, None]
+    shift = (DELTA_GRID[None, None, :] * np.sqrt(N_GRID)[None, :, None] / sigma).astype(np.float32)
+    signs = np.array([1.0, -1.0], dtype=np.float32)[:, None, None, None]
+    cdf = ndtr(signs * z - shift)
+    return cdf[0] - cdf[1]
+
+
+def alpha_index(alpha):
+    """α 在网格中最接近的下标"""
+    return int(np.clip(np.rint(alpha * 1000) - 1, 0, len(ALPHA_GRID) - 1))
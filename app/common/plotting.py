@@ -0,0 +1,18 @@
+import numpy as np
+from matplotlib.collections import LineCollection
+
+
+def add_curve_family(ax, x, Y, values, cmap='viridis', linewidth=1.0):
+    """
+    将一族曲线作为单个 LineCollection 添加到坐标轴
+    
+    x 为共用的横坐标，Y 为 (参数个数 × x 点数) 的数组，values 为每条曲线对应的参数值，
+    用于按颜色映射着色。相比逐条调用 ax.plot，只创建一个艺术家对象，绘制开销小得多。
+    """
+    segments = np.empty(Y.shape + (2,))
+    segments[..., 0] = x
+    segments[..., 1] = np.where(np.isfinite(Y), Y, np.nan)
+    collection = LineCollection(segments, cmap=cmap, linewidths=linewidth)
+    collection.set_array(np.asarray(values))
+    ax.add_collection(collection)
+    return collection
@@ -0,0 +1,192 @@
+import json
+import math
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from .export import trace_chunks
+
+# 金字塔最细一层每个桶包含 2^PYRAMID_SHIFT 步，更细的分辨率直接读取逐步数据
+PYRAMID_SHIFT = 6
+# 由下一层归并上一层时每次读取的桶数
+REDUCE_BUCKETS = 1 << 20
+# 各实验逐步记录的量：投币为正面频率，掷骰子为平均点数
+HISTORY_COLUMNS = {
+    'coin_tossing_experiment': 'frequency',
+    'dice_rolling_experiment': 'mean',
+}
+HISTORY_ROOT = os.path.join(tempfile.gettempdir(), 'probviz_history')
+
+
+def history_directory(view, steps, seed):
+    """同一实验、步数与种子的历史只生成一次"""
+    return os.path.join(HISTORY_ROOT, f'{view}_{seed}_{steps}')
+
+
+def prune_histories(keep=None):
+    """删除 keep 以外的全部历史目录，长程历史占用的磁盘空间可达数 GB"""
+    if not os.path.isdir(HISTORY_ROOT):
+        return
+    for name in os.listdir(HISTORY_ROOT):
+        path = os.path.join(HISTORY_ROOT, name)
+        if keep is None or os.path.abspath(path) != os.path.abspath(keep):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def _open_npy(path, shape):
+    """写入 float32 数组的 .npy 文件头，返回用于按顺序追加数据的文件，避免内存映射写入时脏页占用内存"""
+    f = open(path, 'wb')
+    np.lib.format.write_array_header_1_0(f, {'descr': '<f4', 'fortran_order': False, 'shape': shape})
+    return f
+
+
+def _bucket_counts(first, count, shift, steps):
+    """第 shift 层从第 first 个桶起 count 个桶各自包含的步数（最后一个桶可能不满）"""
+    starts = (np.arange(first, first + count, dtype=np.int64) << shift)
+    return np.minimum(starts + (1 << shift), steps) - starts
+
+
+def _reduce_pairs(buckets, counts):
+    """把相邻两桶合并为一桶：最小值、最大值与按步数加权的均值"""
+    if len(buckets) % 2:
+        buckets = np.concatenate([buckets, buckets[-1:]])
+        counts = np.concatenate([counts, [0]])
+    lo = np.minimum(buckets[0::2, 0], buckets[1::2, 0])
+    hi = np.maximum(buckets[0::2, 1], buckets[1::2, 1])
+    total = counts[0::2] + counts[1::2]
+    mean = (buckets[0::2, 2] * counts[0::2] + buckets[1::2, 2] * counts[1::2]) / total
+    return np.column_stack([lo, hi, mean]).astype(np.float32)
+
+
+def build_history(directory, view, steps, seed, progress=None, stopped=None):
+    """
+    把实验的逐步记录写入 directory 下的内存映射文件，并生成 min/max/mean 金字塔
+
+    values.npy 为逐步数据（float32），level_{k}.npy 的第 i 行为第 i·2^k ~ (i+1)·2^k 步的
+    [最小值, 最大值, 均值]，k 从 PYRAMID_SHIFT 到覆盖全部步数的一层。数据由 export.trace_chunks
+    按块生成（与界面中同一种子的结果一致），每块追加到逐步数据并归并为最细一层，再由下层逐层归并上层，
+    内存占用与步数无关。meta.json 最后写入，目录中存在它表示历史完整。
+    stopped() 返回 True 时删除目录并返回 None。
+    """
+    column = HISTORY_COLUMNS.get(view)
+    if column is None:
+        raise ValueError(f"视图 {view} 没有逐步历史")
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory)
+    top = max(math.ceil(math.log2(max(steps, 1))), PYRAMID_SHIFT)
+    shift = PYRAMID_SHIFT
+
+    def open_level(k):
+        return _open_npy(os.path.join(directory, f'level_{k}.npy'), (-(-steps >> k), 3))
+
+    def load_level(k):
+        return np.load(os.path.join(directory, f'level_{k}.npy'), mmap_mode='r')
+
+    files = []
+    try:
+        values = _open_npy(os.path.join(directory, 'values.npy'), (steps,))
+        level = open_level(shift)
+        files += [values, level]
+        start = 0
+        for done, columns in trace_chunks(view, steps, seed):
+            if stopped is not None and stopped():
+                raise InterruptedError
+            chunk = columns[column].astype(np.float32)
+            values.write(chunk.tobytes())
+            # 每块的步数是 2^shift 的倍数，只有最后一块的最后一个桶可能不满
+            first = start >> shift
+            count = -(-len(chunk) >> shift)
+            padded = np.resize(chunk, count << shift).reshape(count, 1 << shift)
+            counts = _bucket_counts(first, count, shift, steps)
+            mask = np.arange(1 << shift) < counts[:, None]
+            buckets = np.column_stack([
+                np.where(mask, padded, np.inf).min(axis=1),
+                np.where(mask, padded, -np.inf).max(axis=1),
+                np.where(mask, padded, 0).sum(axis=1) / counts
+            ]).astype(np.float32)
+            level.write(buckets.tobytes())
+            start = done
+            if progress is not None:
+                progress(done, steps)
+        values.close()
+        level.close()
+
+        for k in range(shift + 1, top + 1):
+            below = load_level(k - 1)
+            level = open_level(k)
+            files.append(level)
+            for first in range(0, len(below), REDUCE_BUCKETS):
+                if stopped is not None and stopped():
+                    raise InterruptedError
+                buckets = np.asarray(below[first:first + REDUCE_BUCKETS])
+                counts = _bucket_counts(first, len(buckets), k - 1, steps)
+                level.write(_reduce_pairs(buckets, counts).tobytes())
+            level.close()
+            del below
+    except InterruptedError:
+        for f in files:
+            f.close()
+        shutil.rmtree(directory, ignore_errors=True)
+        return None
+
+    with open(os.path.join(directory, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump({'view': view, 'steps': steps, 'seed': seed, 'shift': shift, 'top': top}, f)
+    return HistoryPyramid(directory)
+
+
+def open_history(directory):
+    """目录中有完整的历史时返回 HistoryPyramid，否则返回 None"""
+    if not os.path.exists(os.path.join(directory, 'meta.json')):
+        return None
+    return HistoryPyramid(directory)
+
+
+class HistoryPyramid:
+    """
+    只读打开 build_history 生成的历史，按显示范围与像素数读取合适的一层
+
+    所有数组都以内存映射方式打开，每次 window 只读取与像素数同一量级的桶。
+    """
+    def __init__(self, directory):
+        with open(os.path.join(directory, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        self.directory = directory
+        self.view = meta['view']
+        self.steps = meta['steps']
+        self.seed = meta['seed']
+        self.shift = meta['shift']
+        self.top = meta['top']
+        self.values = np.load(os.path.join(directory, 'values.npy'), mmap_mode='r')
+        self.levels = {}
+
+    def level(self, k):
+        if k not in self.levels:
+            self.levels[k] = np.load(os.path.join(self.directory, f'level_{k}.npy'), mmap_mode='r')
+        return self.levels[k]
+
+    def window(self, start, stop, pixels):
+        """
+        第 start ~ stop 步（从 1 开始计数）在 pixels 个像素宽度内显示所需的数据
+
+        返回 (步数, 最小值, 最大值, 均值, k)：每个像素对应不少于 2^k 步，读取第 k 层的桶，
+        点数在 pixels 到 2·pixels 之间；每个像素不足 2^PYRAMID_SHIFT 步时 k 为 0，直接读取逐步数据。
+        """
+        first = max(int(math.floor(start)) - 1, 0)
+        last = min(int(math.ceil(stop)), self.steps)
+        if last <= first:
+            empty = np.empty(0)
+            return empty, empty, empty, empty, 0
+        per_pixel = (last - first) / max(pixels, 1)
+        k = int(math.floor(math.log2(per_pixel))) if per_pixel >= 1 else 0
+        if k < self.shift:
+            values = np.asarray(self.values[first:last])
+            return np.arange(first + 1, last + 1), values, values, values, 0
+        k = min(k, self.top)
+        i0 = first >> k
+        i1 = min(-(-last >> k), len(self.level(k)))
+        buckets = np.asarray(self.level(k)[i0:i1])
+        # 以桶的中点为横坐标
+        x = (np.arange(i0, i1, dtype=np.int64) << k) + (1 << (k - 1)) + 0.5
+        return x, buckets[:, 0], buckets[:, 1], buckets[:, 2], k
@@ -0,0 +1,77 @@
+import numpy as np
+
+# 每次推进时生成的增量个数上限（路径数 × 步数），控制单次计算的内存与耗时
+CHUNK_BUDGET = 1 << 22
+
+
+class RandomWalkEnsemble:
+    """
+    随机游走 / 布朗运动路径族的分块模拟与最小-最大抽稀
+
+    n 步被划分为宽度相同的若干列（列数不超过绘图区的像素宽度），每列只保留各路径在该列内的最小值与最大值，
+    因此内存占用为 列数 × 路径数，而与步数无关。路径按 (步, 路径) 排列并按整列分块，
+    块内用 float32 累加求和，再把块重排为 (列, 列宽, 路径) 一次求出各列的最值。
+    """
+    def __init__(self, rng, paths, steps, columns, kind='walk'):
+        self.rng = rng
+        self.paths = paths
+        self.steps = steps
+        self.kind = kind
+        self.width = -(-steps // max(columns, 1))
+        self.columns = -(-steps // self.width)
+        # 第 c 列覆盖第 edges[c]+1 ~ edges[c+1] 步，只有最后一列可能不满
+        self.edges = np.minimum(np.arange(self.columns + 1) * self.width, steps)
+        self.lower = np.zeros((self.columns, paths), dtype=np.float32)
+        self.upper = np.zeros((self.columns, paths), dtype=np.float32)
+        self.position = np.zeros(paths, dtype=np.float32)
+        self.done_columns = 0
+
+    @property
+    def finished(self):
+        return self.done_columns >= self.columns
+
+    @property
+    def done_steps(self):
+        return int(self.edges[self.done_columns])
+
+    def _increments(self, length):
+        size = length * self.paths
+        if self.kind == 'walk':
+            # 每个随机字节拆成 8 个独立的 ±1 步
+            steps = np.unpackbits(self.rng.integers(0, 256, size=-(-size // 8), dtype=np.uint8))[:size]
+            steps = steps.view(np.int8)
+            steps *= 2
+            steps -= 1
+        else:
+            steps = self.rng.standard_normal(size, dtype=np.float32)
+        return steps.reshape(length, self.paths)
+
+    def advance(self):
+        """推进若干整列，单次生成的增量个数约为 CHUNK_BUDGET"""
+        if self.finished:
+            return
+        c0 = self.done_columns
+        c1 = min(c0 + max(CHUNK_BUDGET // (self.paths * self.width), 1), self.columns)
+        start, stop = self.edges[c0], self.edges[c1]
+
+        path = np.cumsum(self._increments(stop - start), axis=0, dtype=np.float32)
+        path += self.position
+        full = (stop - start) // self.width
+        blocks = path[:full * self.width].reshape(full, self.width, self.paths)
+        self.lower[c0:c0 + full] = blocks.min(axis=1)
+        self.upper[c0:c0 + full] = blocks.max(axis=1)
+        if c0 + full < c1:
+            # 最后一列不满一个列宽
+            self.lower[c1 - 1] = path[full * self.width:].min(axis=0)
+            self.upper[c1 - 1] = path[full * self.width:].max(axis=0)
+        self.position = path[-1].copy()
+        self.done_columns = c1
+
+    def segments(self):
+        """返回已完成各列的折线顶点，形状为 (路径数, 2 × 已完成列数, 2)，每列依次取最小值与最大值"""
+        c = self.done_columns
+        x = np.repeat((self.edges[:c] + self.edges[1:c + 1]) / 2, 2)
+        y = np.empty((self.paths, 2 * c), dtype=np.float32)
+        y[:, 0::2] = self.lower[:c].T
+        y[:, 1::2] = self.upper[:c].T
+        return np.stack([np.broadcast_to(x, y.shape), y], axis=-1)
@@ -0,0 +1,43 @@
+import numpy as np
+
+# 随机数流按块划分，每块的步数
+BLOCK_STEPS = 1 << 16
+# 界面中种子输入框的上限
+MAX_SEED = (1 << 31) - 1
+
+
+def new_seed():
+    """随机取一个种子，显示在界面上以便复现"""
+    return int(np.random.SeedSequence().generate_state(1)[0]) & MAX_SEED
+
+
+def block_generator(seed, block):
+    """
+    种子 seed 的随机数流中第 block 块的生成器
+
+    使用计数器式的 Philox 生成器：密钥由种子经 SeedSequence 导出，计数器的最高 64 位取块号，
+    各块的随机数互不重叠，且可以直接构造任意一块而无需生成之前的块。
+    """
+    key = np.random.SeedSequence(seed).generate_state(2, np.uint64)
+    return np.random.Generator(np.random.Philox(key=key, counter=int(block) << 192))
+
+
+def fill_steps(func, out, seed, start, block_steps=BLOCK_STEPS, args=()):
+    """
+    把种子 seed 的随机数流中第 start ~ start + len(out) 步写入 out
+
+    每块调用 func(rng, out[...], *args) 生成，要求 func 按行顺序消耗随机数（先生成前 m 行、
+    再生成其余行与一次生成全部行结果相同）。从块中间开始时先生成并丢弃块内此前的部分，
+    因此跳到第 k 步的代价不超过一块，结果与任务划分无关。
+    """
+    stop = start + len(out)
+    step = start
+    while step < stop:
+        block = step // block_steps
+        block_start = block * block_steps
+        end = min(block_start + block_steps, stop)
+        rng = block_generator(seed, block)
+        if step > block_start:
+            func(rng, np.empty((step - block_start,) + out.shape[1:], out.dtype), *args)
+        func(rng, out[step - start:end - start], *args)
+        step = end
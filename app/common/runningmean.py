@@ -0,0 +1,48 @@
+import numpy as np
+
+# 每次推进时生成的样本个数上限（轨迹数 × 样本量），控制单次计算的内存与耗时
+CHUNK_BUDGET = 1 << 22
+
+
+class RunningMeanEnsemble:
+    """
+    多次独立重复的样本均值序列 X̄_n = S_n / n 的分块计算与抽稀
+
+    只在按对数均匀分布的检查点 n 上记录各轨迹的均值，内存占用为 轨迹数 × 检查点数，与样本量无关。
+    每次推进时一次抽取 (轨迹数, 块长) 个样本，在块内求累加和并加上此前的部分和，再取出落在块内的检查点。
+    """
+    def __init__(self, dist, rng, runs, size, points=1000):
+        self.dist = dist
+        self.rng = rng
+        self.runs = runs
+        self.size = size
+        self.checkpoints = np.unique(np.geomspace(1, size, points).astype(np.int64))
+        self.means = np.full((runs, len(self.checkpoints)), np.nan)
+        self.total = np.zeros(runs)
+        self.done = 0
+        self.done_points = 0
+
+    @property
+    def finished(self):
+        return self.done >= self.size
+
+    def advance(self):
+        """推进约 CHUNK_BUDGET / 轨迹数 个样本"""
+        if self.finished:
+            return
+        start = self.done
+        stop = min(start + max(CHUNK_BUDGET // self.runs, 1), self.size)
+
+        sample = self.dist.rvs(size=(self.runs, stop - start), random_state=self.rng)
+        partial = np.cumsum(sample, axis=1, dtype=float)
+        partial += self.total[:, None]
+
+        # 落在本块内的检查点，第 n 个样本位于块内下标 n - start - 1 处
+        p0 = self.done_points
+        p1 = np.searchsorted(self.checkpoints, stop, side='right')
+        n = self.checkpoints[p0:p1]
+        self.means[:, p0:p1] = partial[:, n - start - 1] / n
+
+        self.total = partial[:, -1].copy()
+        self.done = stop
+        self.done_points = p1
@@ -0,0 +1,186 @@
+import atexit
+import io
+import json
+import struct
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PyQt5.QtWidgets import QApplication
+
+from .controls import controls, control_value, control_signal
+from .simulation import set_result_hook
+
+# 会话录制文件的开头标记
+MAGIC = b'PVSESSION1\n'
+# 缓冲的事件数或结果字节数超过上限、或距上次写入超过若干秒时写出一块
+FLUSH_EVENTS = 256
+FLUSH_BYTES = 8 << 20
+FLUSH_SECONDS = 5.0
+
+
+class SessionRecorder:
+    """
+    把参数修改与模拟结果追加写入会话录制文件
+
+    文件由 MAGIC 与若干块组成，每块为 4 字节小端长度加一个 np.savez_compressed 的内容：
+    events 为 JSON 事件列表 [时间, 'param', 视图键, 参数名, 值] 或 [时间, 'result', None, 任务签名, 数组名]，
+    其余为该块引用的结果数组。记录事件只是追加到内存中的缓冲区，压缩与写入在单独的线程中按块进行，
+    文件只追加、不调用 fsync；程序异常退出时最后一块可能不完整，读取时忽略。
+    """
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'wb')
+        self.file.write(MAGIC)
+        self.writer = ThreadPoolExecutor(max_workers=1)
+        self.origin = time.perf_counter()
+        self.last_flush = self.origin
+        self.events = []
+        self.arrays = {}
+        self.pending_bytes = 0
+        self.count = 0
+        # 已连接的 (信号, 槽)，停止录制时断开
+        self.connections = []
+
+    def param(self, view, name, value, t=None):
+        if t is None:
+            t = time.perf_counter() - self.origin
+        self._append([t, 'param', view, name, value])
+
+    def result(self, signature, array):
+        key = f'r{self.count}'
+        self.arrays[key] = np.array(array)
+        self.pending_bytes += array.nbytes
+        self._append([time.perf_counter() - self.origin, 'result', None, signature, key])
+
+    def _append(self, event):
+        self.events.append(event)
+        self.count += 1
+        if (len(self.events) >= FLUSH_EVENTS or self.pending_bytes >= FLUSH_BYTES
+                or event[0] + self.origin - self.last_flush >= FLUSH_SECONDS):
+            self.flush()
+
+    def attach(self, view, interface):
+        """记录界面上全部参数的当前值（同一时刻，回放时作为一组），并在参数改变时记录新值"""
+        t = time.perf_counter() - self.origin
+        for name, control in controls(interface).items():
+            self.param(view, name, control_value(control), t)
+            slot = lambda *_, name=name, control=control: self.param(view, name, control_value(control))
+            signal = control_signal(control)
+            signal.connect(slot)
+            self.connections.append((signal, slot))
+
+    def flush(self):
+        chunk = self._take()
+        if chunk is not None:
+            self.writer.submit(self._write_chunk, *chunk)
+
+    def _take(self):
+        """取出缓冲区中的事件与结果，缓冲区为空时返回 None"""
+        if not self.events:
+            return None
+        chunk = (self.events, self.arrays)
+        self.events = []
+        self.arrays = {}
+        self.pending_bytes = 0
+        self.last_flush = time.perf_counter()
+        return chunk
+
+    def _write_chunk(self, events, arrays):
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, events=np.array(json.dumps(events, ensure_ascii=False)), **arrays)
+        data = buffer.getvalue()
+        self.file.write(struct.pack('<I', len(data)))
+        self.file.write(data)
+        self.file.flush()
+
+    def close(self):
+        for signal, slot in self.connections:
+            try:
+                signal.disconnect(slot)
+            except TypeError:
+                # 控件已被销毁
+                pass
+        self.connections = []
+        # 先等待已提交的块写完，最后一块在当前线程中写入：程序退出时写入线程可能已不再接受任务
+        self.writer.shutdown(wait=True)
+        chunk = self._take()
+        if chunk is not None:
+            self._write_chunk(*chunk)
+        self.file.close()
+
+
+def read_session(path):
+    """读取会话录制文件，返回 (按时间排序的参数事件 [(时间, 视图键, 参数名, 值)], {任务签名: 结果数组})"""
+    params = []
+    results = {}
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"不是 ProbViz 会话录制文件：{path}")
+        while True:
+            header = f.read(4)
+            if len(header) < 4:
+                break
+            data = f.read(struct.unpack('<I', header)[0])
+            try:
+                chunk = np.load(io.BytesIO(data), allow_pickle=False)
+                events = json.loads(str(chunk['events']))
+                for t, kind, view, name, value in events:
+                    if kind == 'param':
+                        params.append((t, view, name, value))
+                    elif kind == 'result':
+                        results[name] = chunk[value]
+            except (ValueError, OSError, KeyError, EOFError, zipfile.BadZipFile):
+                # 录制中断时写了一半的块
+                break
+    params.sort(key=lambda event: event[0])
+    return params, results
+
+
+class SessionManager:
+    """
+    主程序中的会话录制
+
+    实验界面创建后通过 add_interface 登记；开始录制时连接已登记界面的控件，
+    之后创建的界面在登记时连接。
+    """
+    def __init__(self):
+        self.interfaces = {}
+        self.recorder = None
+        self._exit_registered = False
+
+    @property
+    def recording(self):
+        return self.recorder is not None
+
+    def add_interface(self, view, interface):
+        self.interfaces[view] = interface
+        if self.recorder is not None:
+            self.recorder.attach(view, interface)
+
+    def start(self, path):
+        self.stop()
+        self.recorder = SessionRecorder(path)
+        for view, interface in self.interfaces.items():
+            self.recorder.attach(view, interface)
+        set_result_hook(self.recorder.result)
+        if not self._exit_registered:
+            # 在事件循环结束时停止录制，此时界面与写入线程都还在；没有 QApplication 时退而使用 atexit
+            app = QApplication.instance()
+            if app is not None:
+                app.aboutToQuit.connect(self.stop)
+            else:
+                atexit.register(self.stop)
+            self._exit_registered = True
+
+    def stop(self):
+        if self.recorder is None:
+            return
+        set_result_hook(None)
+        self.recorder.close()
+        self.recorder = None
+
+
+# 主程序共用的会话录制
+sessions = SessionManager()
@@ -0,0 +1,359 @@
+import atexit
+import json
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory, util
+
+import numpy as np
+
+from .distributions import freeze
+from .rng import BLOCK_STEPS, new_seed, fill_steps
+
+# 单个任务内部分块抽样的块大小，控制工作进程的内存占用
+BLOCK_SIZE = 1 << 20
+# normal_sample_means 每行要抽取多个样本，随机数流按较小的块划分
+MEANS_BLOCK_STEPS = 64
+# 具有可加性、sample_sums 可以直接从和的分布中抽样的分布，其余分布须逐个抽样求和
+ADDITIVE_FAMILIES = (
+    'bernoulli', 'binomial', 'poisson', 'geometric', 'negative_binomial', 'normal', 'exponential', 'gamma'
+)
+
+_executor = None
+# 为 True 时模拟任务在当前进程中同步执行，不启动进程池（见 run_inline）
+_inline = False
+# 尚未释放的共享内存任务，退出时统一释放
+_live_jobs = set()
+# 录制会话时接收已完成任务结果的回调 hook(signature, array)
+_result_hook = None
+# 回放会话时按任务签名取用的已录制结果
+_replay_results = {}
+
+
+def worker_count():
+    return max(os.cpu_count() or 1, 1)
+
+
+class InlineExecutor:
+    """接口与 ProcessPoolExecutor 相同，submit 时在当前进程中立即执行，返回已完成的 Future"""
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+def run_inline():
+    """
+    此后的模拟任务都在当前进程中同步执行，不再启动进程池
+
+    供本身就是进程池工作进程的无界面渲染（sweep、server）调用：在工作进程中再启动每核一个进程的进程池，
+    进程总数不再受工作进程数限制，而且嵌套的进程池不会退出，外层进程池关闭时会一直等待。
+    """
+    global _inline, _executor
+    _inline = True
+    _executor = InlineExecutor()
+    # 进程池的工作进程退出时不执行 atexit，由 multiprocessing 的终结器释放尚未释放的共享内存
+    util.Finalize(None, shutdown_executor, exitpriority=0)
+
+
+def get_executor():
+    """
+    返回全局共享的进程池，首次调用时创建；run_inline 之后返回在当前进程中执行的 InlineExecutor
+
+    统一使用 spawn 方式启动工作进程，避免在已有 Qt 线程的进程中 fork，
+    工作函数必须定义在模块顶层以便子进程导入。
+    """
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=worker_count(),
+            mp_context=multiprocessing.get_context('spawn')
+        )
+        atexit.register(shutdown_executor)
+    return _executor
+
+
+def shutdown_executor():
+    global _executor
+    for job in list(_live_jobs):
+        job.release()
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def set_result_hook(hook):
+    """设置接收已完成任务结果的回调，None 表示不再接收"""
+    global _result_hook
+    _result_hook = hook
+
+
+def set_replay_results(results):
+    """设置 {任务签名: 结果数组}，签名相同的任务直接使用录制的结果而不再模拟"""
+    global _replay_results
+    _replay_results = results
+
+
+def _fill_shared(func, name, shape, dtype, start, stop, seed, offset, block_steps, args):
+    """工作进程中挂载共享内存，填充第 start ~ stop 行，即随机数流的第 offset + start 步起"""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        out = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        fill_steps(func, out[start:stop], seed, offset + start, block_steps, args)
+        del out
+    finally:
+        shm.close()
+
+
+class SharedJob:
+    """
+    在进程池中分块执行、结果直接写入共享内存数组的模拟任务
+
+    第 i 行为种子 seed 的随机数流（见 rng.fill_steps）中的第 offset + i 步，由 func(rng, out, *args) 生成。
+    随机数流按 block_steps 步分块，任务边界与块边界对齐，结果只由种子决定，与工作进程数无关；
+    同一种子下可以用 offset 只计算延长的部分。界面通过 array 直接读取共享内存，结果不经过序列化复制；
+    func 必须定义在模块顶层。
+
+    signature 由工作函数、形状、种子与参数组成，完全决定结果；录制会话时全部完成的任务按签名交给
+    set_result_hook 设置的回调，回放时 set_replay_results 中有相同签名的任务直接复制录制的结果。
+    """
+    def __init__(self, func, shape, dtype, args=(), seed=None, tasks=None, offset=0, block_steps=BLOCK_STEPS):
+        shape = (shape,) if np.isscalar(shape) else tuple(shape)
+        dtype = np.dtype(dtype)
+        self.seed = new_seed() if seed is None else seed
+        self._shm = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * dtype.itemsize, 1))
+        self.array = np.ndarray(shape, dtype=dtype, buffer=self._shm.buf)
+        _live_jobs.add(self)
+        self.signature = json.dumps([func.__name__, shape, dtype.str, int(self.seed), int(offset),
+                                     int(block_steps), args], default=str)
+
+        rows = shape[0]
+        stored = _replay_results.get(self.signature)
+        if stored is not None:
+            self.array[...] = stored
+            self.bounds = np.array([0, rows])
+            self.futures = []
+            self._recorded = True
+            return
+        self._recorded = False
+        if _inline:
+            fill_steps(func, self.array, self.seed, offset, block_steps, args)
+            self.bounds = np.array([0, rows])
+            self.futures = []
+            return
+        first = offset // block_steps
+        blocks = max((offset + rows - 1) // block_steps - first + 1, 1)
+        tasks = max(min(tasks or worker_count(), blocks), 1)
+        edges = first + np.linspace(0, blocks, tasks + 1).astype(int)
+        self.bounds = np.clip(edges * block_steps - offset, 0, rows)
+        executor = get_executor()
+        self.futures = [
+            executor.submit(_fill_shared, func, self._shm.name, shape, dtype.str,
+                            int(self.bounds[i]), int(self.bounds[i + 1]), self.seed, offset, block_steps, args)
+            for i in range(tasks)
+        ]
+
+    def done(self):
+        return all(future.done() for future in self.futures)
+
+    def ready_rows(self):
+        """从第 0 行起连续已完成的行数，可用于按顺序逐步显示结果"""
+        for i, future in enumerate(self.futures):
+            if not future.done():
+                return int(self.bounds[i])
+        self._record()
+        return int(self.bounds[-1])
+
+    def wait(self):
+        """等待全部块完成，工作进程中的异常在此重新抛出"""
+        for future in self.futures:
+            future.result()
+        self._record()
+        return self.array
+
+    def _record(self):
+        """全部块正常完成后把结果交给录制回调，每个任务只交一次"""
+        if self._recorded or _result_hook is None:
+            return
+        if any(future.cancelled() or future.exception() is not None for future in self.futures):
+            return
+        self._recorded = True
+        _result_hook(self.signature, self.array)
+
+    def release(self):
+        """取消尚未开始的块并释放共享内存，之后不能再访问 array"""
+        if self.done():
+            self._record()
+        for future in self.futures:
+            future.cancel()
+        _live_jobs.discard(self)
+        self.array = None
+        try:
+            self._shm.close()
+        except BufferError:
+            # 仍有视图引用缓冲区时由垃圾回收关闭映射
+            pass
+        self._shm.unlink()
+
+
+class StepSeries:
+    """
+    按种子逐步生成的一维模拟结果，供动画按顺序读取
+
+    resize 改变总步数时保留已算出的前缀，只对新增的步数提交 SharedJob（offset 为前缀长度），
+    得到的序列与一次算出全部步数相同；reseed 更换种子后从第 0 步重新计算。
+    """
+    def __init__(self, func, dtype, seed=None):
+        self.func = func
+        self.dtype = np.dtype(dtype)
+        self.seed = new_seed() if seed is None else seed
+        self.values = np.empty(0, self.dtype)
+        self.size = 0
+        self.job = None
+
+    def _collect(self):
+        """把延长任务中已完成的前缀并入 values，放弃其余部分"""
+        if self.job is None:
+            return
+        self.values = np.concatenate([self.values, self.job.array[:self.job.ready_rows()]])
+        self.job.release()
+        self.job = None
+
+    def resize(self, size):
+        self._collect()
+        self.size = size
+        if size <= len(self.values):
+            self.values = self.values[:size]
+        else:
+            self.job = SharedJob(self.func, size - len(self.values), self.dtype,
+                                 seed=self.seed, offset=len(self.values))
+
+    def reseed(self, seed):
+        self.release()
+        self.seed = seed
+        self.values = np.empty(0, self.dtype)
+        self.resize(self.size)
+
+    def ready(self):
+        """从第 0 步起连续已完成的步数"""
+        return len(self.values) + (self.job.ready_rows() if self.job is not None else 0)
+
+    def head(self, stop):
+        """前 stop 步的结果，stop 不超过 ready()"""
+        if stop <= len(self.values):
+            return self.values[:stop]
+        return np.concatenate([self.values, self.job.array[:stop - len(self.values)]])
+
+    def release(self):
+        if self.job is not None:
+            self.job.release()
+            self.job = None
+
+
+def toss_coins(rng, out):
+    """投币，1 为正面、0 为反面；out 为二维时每行为一步、每列为一次独立重复"""
+    out[:] = rng.integers(0, 2, out.shape)
+
+
+def roll_dice(rng, out):
+    """掷骰子，点数为 1 ~ 6"""
+    out[:] = rng.integers(1, 7, len(out))
+
+
+def normal_sample_means(rng, out, mu, sigma, sizes):
+    """
+    out 的第 j 列为样本量 sizes[j] 的正态样本均值，每行为一次独立重复
+
+    每行的全部样本一次按行抽取，再按样本量分段求均值，保证随机数按行顺序消耗（见 rng.fill_steps）。
+    """
+    sizes = np.asarray(sizes)
+    sample = rng.normal(mu, sigma, (len(out), int(sizes.sum())))
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    out[:] = np.add.reduceat(sample, starts, axis=1) / sizes
+
+
+def simulate_z_tests(seed, size, lower, upper, shift):
+    """
+    在 H0 与 H1 下各模拟 size 次双侧 z 检验，返回 (第一类错误次数, 第二类错误次数)
+
+    样本均值的标准化值服从标准正态分布，直接抽取标准化值 z 而不逐个生成样本。
+    lower、upper 为 H0 下标准化的拒绝域边界，shift = (μ₁ - μ₀)√n/σ 为 H1 下的平移量。
+    """
+    rng = np.random.default_rng(seed)
+    lower, upper = np.float32(lower), np.float32(upper)
+    lower_1, upper_1 = np.float32(lower - shift), np.float32(upper - shift)
+    type_one = 0
+    type_two = 0
+    remaining = size
+    while remaining > 0:
+        block = min(remaining, BLOCK_SIZE)
+        z = rng.standard_normal(block, dtype=np.float32)
+        type_one += block - np.count_nonzero((z > lower) & (z < upper))
+        z = rng.standard_normal(block, dtype=np.float32)
+        type_two += np.count_nonzero((z > lower_1) & (z < upper_1))
+        remaining -= block
+    return int(type_one), int(type_two)
+
+
+def buffon_needle_hits(rng, size, ratio):
+    """
+    蒲丰投针：针长与平行线间距之比为 ratio (<= 1)，返回 size 次投针中与直线相交的次数
+
+    以半个线距为单位，针的中点到最近直线的距离 y ~ U(0, 1)，针与直线的夹角 θ ~ U(0, π/2)，
+    相交当且仅当 y <= ratio·sin θ，相交概率为 2·ratio/π。
+    """
+    y = rng.random(size, dtype=np.float32)
+    theta = rng.random(size, dtype=np.float32)
+    theta *= np.float32(np.pi / 2)
+    return np.count_nonzero(y <= np.float32(ratio) * np.sin(theta))
+
+
+def circle_hits(rng, size):
+    """在单位正方形内均匀投点，返回落入内切四分之一圆的点数"""
+    x = rng.random(size, dtype=np.float32)
+    y = rng.random(size, dtype=np.float32)
+    x *= x
+    y *= y
+    return np.count_nonzero(x + y <= np.float32(1))
+
+
+def sample_sums(rng, dist_type, params, n, size):
+    """
+    抽取 size 个“n 个独立同分布变量之和”
+
+    对具有可加性的分布直接从和的分布中抽样（如 n 个两点分布之和服从二项分布、
+    n 个指数分布之和服从伽马分布），与逐个抽样求和同分布但快 n 倍；
+    其余分布（不在 ADDITIVE_FAMILIES 中）分块抽取 (行数, n) 的样本按行求和，每块不超过 BLOCK_SIZE 个样本，
+    耗时与 size·n 成正比。
+    """
+    if dist_type == 'bernoulli':
+        return rng.binomial(n, params['p'], size)
+    elif dist_type == 'binomial':
+        return rng.binomial(n * params['n'], params['p'], size)
+    elif dist_type == 'poisson':
+        return rng.poisson(n * params['lambda'], size)
+    elif dist_type == 'geometric':
+        # scipy 的几何分布取值从 1 开始，numpy 的负二项分布计失败次数
+        return rng.negative_binomial(n, params['p'], size) + n
+    elif dist_type == 'negative_binomial':
+        return rng.negative_binomial(n * params['r'], params['p'], size)
+    elif dist_type == 'normal':
+        return rng.normal(n * params['mu'], np.sqrt(n) * params['sigma'], size)
+    elif dist_type == 'exponential':
+        return rng.gamma(n, 1 / params['lambda'], size)
+    elif dist_type == 'gamma':
+        return rng.gamma(n * params['alpha'], 1 / params['beta'], size)
+
+    dist = freeze(dist_type, params)
+    rows = max(BLOCK_SIZE // n, 1)
+    result = np.empty(size)
+    for start in range(0, size, rows):
+        stop = min(start + rows, size)
+        result[start:stop] = dist.rvs(size=(stop - start, n), random_state=rng).sum(axis=1)
+    return result
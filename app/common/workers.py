@@ -0,0 +1,152 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+from PyQt5.QtWidgets import QApplication
+
+from .dataimport import read_chunks, StreamingSummary
+from .fitting import fit_all
+from .export import export_trace
+from .pyramid import history_directory, prune_histories, open_history, build_history
+
+
+class BatchWorker(QThread):
+    """
+    在后台线程中反复调用 batch(size) 累加计数，直到总次数达到 total 或被停止
+
+    batch(size) 返回本批中"成功"的次数；每批结束后发出 progress(已完成次数, 累计成功次数)，
+    界面只保存累计量，不接收原始样本。
+    """
+    progress = pyqtSignal(int, int)
+
+    def __init__(self, batch, total, batch_size, parent=None):
+        super().__init__(parent)
+        self.batch = batch
+        self.total = total
+        self.batch_size = batch_size
+        self._stopped = False
+        # 程序退出前结束线程，避免线程仍在运行时被销毁
+        QApplication.instance().aboutToQuit.connect(self.stop)
+
+    def stop(self):
+        self._stopped = True
+        self.wait()
+
+    def run(self):
+        done = 0
+        hits = 0
+        while not self._stopped and done < self.total:
+            size = min(self.batch_size, self.total - done)
+            hits += int(self.batch(size))
+            done += size
+            self.progress.emit(done, hits)
+
+
+class DataLoader(QThread):
+    """
+    在后台线程中分块读取数据文件、累积充分统计量并拟合各分布族
+
+    每读完一块发出 progress(已读取数值个数, 进度千分比)；完成后发出 loaded(StreamingSummary, 拟合结果)，
+    出错时发出 failed(错误信息)。
+    """
+    progress = pyqtSignal(int, int)
+    loaded = pyqtSignal(object, object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self._stopped = False
+        QApplication.instance().aboutToQuit.connect(self.stop)
+
+    def stop(self):
+        self._stopped = True
+        self.wait()
+
+    def run(self):
+        try:
+            summary = StreamingSummary()
+            for values, done, total in read_chunks(self.path):
+                if self._stopped:
+                    return
+                summary.add(values)
+                self.progress.emit(summary.count, int(1000 * done / max(total, 1)))
+            if summary.count < 2:
+                raise ValueError("文件中至少需要 2 个有效数值")
+            self.loaded.emit(summary, fit_all(summary))
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+class ExportWorker(QThread):
+    """
+    在后台线程中把实验的模拟记录流式导出到文件（见 export.export_trace）
+
+    每写入一块发出 progress(已导出步数, 进度千分比)；完成后发出 exported(文件路径, 导出步数)，
+    出错时发出 failed(错误信息)。
+    """
+    progress = pyqtSignal(int, int)
+    exported = pyqtSignal(str, int)
+    failed = pyqtSignal(str)
+
+    def __init__(self, path, view, steps, seed, params=None, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.view = view
+        self.steps = steps
+        self.seed = seed
+        self.params = params
+        self._stopped = False
+        QApplication.instance().aboutToQuit.connect(self.stop)
+
+    def stop(self):
+        self._stopped = True
+        self.wait()
+
+    def on_progress(self, done, total):
+        self.progress.emit(done, int(1000 * done / max(total, 1)))
+
+    def run(self):
+        try:
+            done = export_trace(self.path, self.view, self.steps, self.seed, self.params,
+                                self.on_progress, lambda: self._stopped)
+            self.exported.emit(self.path, done)
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+class HistoryBuilder(QThread):
+    """
+    在后台线程中生成长程实验的逐步历史与 min/max/mean 金字塔（见 pyramid.build_history）
+
+    同一实验、步数与种子的历史已经存在时直接打开；否则先删除旧的历史，再逐块生成，
+    每块发出 progress(已生成步数, 进度千分比)。完成后发出 built(HistoryPyramid)，出错时发出 failed(错误信息)。
+    """
+    progress = pyqtSignal(int, int)
+    built = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, view, steps, seed, parent=None):
+        super().__init__(parent)
+        self.view = view
+        self.steps = steps
+        self.seed = seed
+        self._stopped = False
+        QApplication.instance().aboutToQuit.connect(self.stop)
+
+    def stop(self):
+        self._stopped = True
+        self.wait()
+
+    def on_progress(self, done, total):
+        self.progress.emit(done, int(1000 * done / max(total, 1)))
+
+    def run(self):
+        try:
+            directory = history_directory(self.view, self.steps, self.seed)
+            history = open_history(directory)
+            if history is None:
+                prune_histories(keep=directory)
+                history = build_history(directory, self.view, self.steps, self.seed,
+                                        self.on_progress, lambda: self._stopped)
+            if history is not None:
+                self.built.emit(history)
+        except Exception as e:
+            self.failed.emit(str(e))
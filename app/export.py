@@ -0,0 +1,55 @@
+"""
+流式导出实验的原始模拟记录
+
+    python -m app.export --view coin_tossing_experiment --steps 100000000 --seed 42 --out tosses.csv
+    python -m app.export --view consistency_of_point_estimation --steps 1000 --seed 42 \\
+        --param mu=0 --param sigma=1 --param sizes=2,7,15,22,30 --out means.parquet
+
+使用与界面相同的随机数流，同一种子导出的前 n 步与界面中显示的完全一致。数据按块生成，
+由后台线程写入 CSV、Parquet 或 Arrow 文件（后两种需要安装 pyarrow），内存占用与步数无关。
+"""
+import argparse
+import sys
+import time
+
+from . import render
+from .common.export import export_trace
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m app.export', description='流式导出 ProbViz 实验的模拟记录')
+    parser.add_argument('--view', required=True, choices=(
+        'coin_tossing_experiment', 'dice_rolling_experiment', 'consistency_of_point_estimation'
+    ))
+    parser.add_argument('--steps', type=int, required=True, help='导出的步数（投币、掷骰子次数或重复次数）')
+    parser.add_argument('--seed', type=int, required=True, help='随机种子，与界面中的随机种子相同')
+    parser.add_argument('--param', type=render.parse_param, action='append', default=[], metavar='名称=值',
+                        help='点估计的相合性需要 mu、sigma 与 sizes（逗号分隔的样本量）')
+    parser.add_argument('--out', required=True, help='输出文件，格式由扩展名决定（csv、parquet、arrow）')
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    params = dict(args.param)
+    if 'sizes' in params:
+        params['sizes'] = [int(size) for size in params['sizes'].split(',') if size.strip()]
+
+    def progress(done, total):
+        print(f'\r已导出 {done:,} / {total:,} 步', end='', file=sys.stderr, flush=True)
+
+    start = time.perf_counter()
+    try:
+        done = export_trace(args.out, args.view, args.steps, args.seed, params, progress)
+    except (KeyError, ValueError, OSError) as e:
+        message = f"缺少参数 {e.args[0]}" if isinstance(e, KeyError) else str(e)
+        print(f'\n错误：{message}', file=sys.stderr)
+        return 2
+    print(file=sys.stderr)
+    elapsed = time.perf_counter() - start
+    print(f'共 {done:,} 步，用时 {elapsed:.2f} s（{done / max(elapsed, 1e-9) / 1e6:.2f} M 步/s）')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,256 @@
+"""
+无界面渲染实验图像
+
+    python -m app.render --view two_dim_norm --param rho=0.8 --out fig.png
+    python -m app.render --view two_dim_norm --list
+
+程序以 offscreen 平台创建 QApplication（不显示任何窗口），构造实验界面后通过界面上的控件设置参数，
+因此绘图代码与图形界面中的 PlotWidget 完全相同；动画或后台模拟结束（或超时）后用 Agg 渲染保存图像。
+参数名为控件属性名去掉 _spin / _combo / _toggle 后缀，例如 rho_spin 对应 --param rho=0.8。
+"""
+import argparse
+import importlib
+import os
+import sys
+import time
+
+from .common.controls import controls, set_control
+
+# 视图键与模块名（同时也是类名），与主窗口导航中使用的键一致
+VIEWS = {
+    'binomial_distribution': 'BinominalDistribution',
+    'poisson_distribution': 'PoissonDistribution',
+    'poisson_theorem': 'PoissonTheorem',
+    'central_limit_theorem': 'CentralLimitTheorem',
+    'consistency_of_point_estimation': 'ConsistencyOfPointEstimation',
+    'two_types_of_errors': 'TwoTypesOfErrors',
+    'one_dim_norm': 'OneDimNorm',
+    'two_dim_norm': 'TwoDimNorm',
+    'dice_rolling_experiment': 'DiceRollingExperiment',
+    'coin_tossing_experiment': 'CoinTossingExperiment',
+    'continuous_pdf': 'ContinuousPDF',
+    'discrete_pdf': 'DiscretePDF',
+    'galton_board': 'GaltonBoard',
+    'random_walk': 'RandomWalk',
+    'pi_estimation': 'PiEstimation',
+    'bootstrap': 'Bootstrap',
+    'mcmc_sampling': 'MCMCSampling',
+    'law_of_large_numbers': 'LawOfLargeNumbers',
+    'data_fitting': 'DataFitting',
+    'long_run_history': 'LongRunHistory',
+}
+
+_app = None
+
+
+def get_application():
+    """创建（或返回已有的）不显示窗口的 QApplication，并设置与 launch.py 相同的中文字体"""
+    global _app
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtCore import Qt, QCoreApplication
+    from PyQt5.QtWidgets import QApplication
+    import matplotlib
+
+    if _app is None:
+        _app = QApplication.instance()
+    if _app is None:
+        # 实验界面的说明页使用 QtWebEngine，须在创建 QApplication 之前设置
+        QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
+        _app = QApplication([sys.argv[0]])
+        matplotlib.rcParams['font.sans-serif'] = ['Microsoft YaHei', 'SimHei', 'Arial Unicode MS', 'DejaVu Sans']
+        matplotlib.rcParams['axes.unicode_minus'] = False
+    return _app
+
+
+def init_worker():
+    """
+    进程池工作进程的初始化函数：创建 QApplication，并让模拟任务在本进程中同步执行
+
+    工作进程中的界面若再各自启动每核一个进程的模拟进程池，进程数会成倍增长，且嵌套的进程池不会退出，
+    外层进程池关闭时一直等待（见 simulation.run_inline）。
+    """
+    from .common.simulation import run_inline
+
+    get_application()
+    run_inline()
+
+
+def load_view(view):
+    if view not in VIEWS:
+        raise ValueError(f"未知的视图：{view}，可用视图：{', '.join(VIEWS)}")
+    module = importlib.import_module(f'app.view.{VIEWS[view]}')
+    return getattr(module, VIEWS[view])
+
+
+def wait_until_idle(interface, timeout):
+    """
+    处理事件直到界面中的动画定时器与后台线程全部结束，或超过 timeout 秒
+
+    动画定时器不必等到间隔时间，直接触发 timeout 信号快进；只有后台线程与进程池仍在计算时才稍作等待。
+    """
+    from PyQt5.QtCore import QTimer, QThread
+
+    app = get_application()
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        app.processEvents()
+        timers = [timer for timer in interface.findChildren(QTimer)
+                  if timer.isActive() and not timer.isSingleShot()]
+        threads = [thread for thread in interface.findChildren(QThread) if thread.isRunning()]
+        if not timers and not threads:
+            break
+        for timer in timers:
+            if timer.isActive():
+                timer.timeout.emit()
+        if threads:
+            time.sleep(0.001)
+    # 超时时停止仍在运行的动画，以当前状态出图
+    for timer in interface.findChildren(QTimer):
+        timer.stop()
+    app.processEvents()
+
+
+def create_interface(view):
+    """
+    构造视图的实验界面
+
+    界面从不显示，构造完成后控件中的 canvas.draw() 与 blit 动画只会白白渲染，
+    因此改为空操作，由保存图像时的 savefig 统一绘制。
+    """
+    from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+    from .common.framecache import frame_cache
+
+    get_application()
+    # 出图读取的是 Figure 本身，命中图像缓存时 Figure 不会更新
+    frame_cache.enabled = False
+    interface = load_view(view).ExpInterface()
+    for canvas in interface.findChildren(FigureCanvasQTAgg):
+        canvas.draw = lambda: None
+        # 不保留 blit 用的背景，动画回退到（已为空操作的）整体重绘
+        canvas.copy_from_bbox = lambda bbox: None
+    return interface
+
+
+def release_interface(interface):
+    """
+    销毁实验界面
+
+    各视图把 lambda 连接到全局配置的 themeChanged 信号，lambda 持有界面的引用，不断开就无法回收；
+    无界面渲染的进程中没有其他接收者，因此全部断开。
+    """
+    from PyQt5.QtCore import QCoreApplication, QEvent
+    from .common.config import cfg
+
+    try:
+        cfg.themeChanged.disconnect()
+    except TypeError:
+        # 没有任何连接
+        pass
+    interface.deleteLater()
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+
+def apply_params(interface, params):
+    """把 [(参数名, 字符串值)] 按顺序写入对应控件"""
+    available = controls(interface)
+    for name, value in params:
+        if name not in available:
+            raise ValueError(f"没有参数 {name}，可用参数：{', '.join(available)}")
+        set_control(available[name], value)
+
+
+def save_figure(interface, out, figure='plot_widget', size=(800, 600), dpi=100, transparent=False, format=None):
+    """按给定的像素尺寸保存界面中持有图像的控件 figure 的图像，out 为路径或文件对象"""
+    widget = getattr(interface, figure, None)
+    if widget is None or not hasattr(widget, 'figure'):
+        raise ValueError(f"没有图像控件 {figure}")
+    fig = widget.figure
+    fig.set_size_inches(size[0] / dpi, size[1] / dpi)
+    fig.tight_layout()
+    # 动画中用 blit 单独重画的图元（animated=True）不参与普通绘制，保存时临时恢复
+    animated = fig.findobj(lambda artist: artist.get_animated())
+    for artist in animated:
+        artist.set_animated(False)
+    try:
+        fig.savefig(out, dpi=dpi, transparent=transparent, facecolor='none' if transparent else 'white',
+                    format=format)
+    finally:
+        for artist in animated:
+            artist.set_animated(True)
+
+
+def render(view, params, out, figure='plot_widget', size=(800, 600), dpi=100, timeout=60.0, transparent=False,
+           format=None):
+    """
+    渲染一个视图的图像并保存到 out
+
+    params 为 [(参数名, 字符串值)]，按顺序写入对应控件；figure 为持有图像的控件属性名；
+    out 为文件对象时须指定 format（png、svg 等）。
+    """
+    interface = create_interface(view)
+    try:
+        apply_params(interface, params)
+        wait_until_idle(interface, timeout)
+        save_figure(interface, out, figure, size, dpi, transparent, format)
+    finally:
+        release_interface(interface)
+
+
+def parse_param(text):
+    name, sep, value = text.partition('=')
+    if not sep or not name:
+        raise argparse.ArgumentTypeError(f"参数格式应为 名称=值：{text}")
+    return name.strip(), value.strip()
+
+
+def parse_size(text):
+    try:
+        width, height = (int(v) for v in text.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"尺寸格式应为 宽x高（像素）：{text}")
+    return width, height
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m app.render', description='无界面渲染 ProbViz 实验图像')
+    parser.add_argument('--view', required=True, help='视图键，如 two_dim_norm')
+    parser.add_argument('--param', type=parse_param, action='append', default=[], metavar='名称=值',
+                        help='设置界面参数，可重复使用')
+    parser.add_argument('--out', help='输出文件，格式由扩展名决定（png、svg、pdf 等）')
+    parser.add_argument('--figure', default='plot_widget', help='持有图像的控件属性名，默认为 plot_widget')
+    parser.add_argument('--size', type=parse_size, default=(800, 600), metavar='宽x高', help='图像像素尺寸')
+    parser.add_argument('--dpi', type=int, default=100)
+    parser.add_argument('--timeout', type=float, default=60.0, help='等待动画与后台模拟结束的最长秒数')
+    parser.add_argument('--transparent', action='store_true', help='保留透明背景')
+    parser.add_argument('--list', action='store_true', help='列出视图的可用参数及当前值')
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        if args.list:
+            interface = create_interface(args.view)
+            for name, control in controls(interface).items():
+                if hasattr(control, 'currentIndex'):
+                    items = ', '.join(f'{i}:{control.itemText(i)}' for i in range(control.count()))
+                    print(f'{name} = {control.currentIndex()}  ({items})')
+                elif hasattr(control, 'isChecked'):
+                    print(f'{name} = {control.isChecked()}')
+                else:
+                    print(f'{name} = {control.value()}  [{control.minimum()}, {control.maximum()}]')
+            return 0
+        if not args.out:
+            parser.error('需要 --out 或 --list')
+        render(args.view, args.param, args.out, args.figure, args.size, args.dpi, args.timeout, args.transparent)
+    except ValueError as e:
+        print(f'错误：{e}', file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == '__main__':
+    import multiprocessing
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""
+回放录制的会话
+
+    python -m app.replay session.pvsession --speed 5
+    python -m app.replay session.pvsession --out frames/
+
+按录制时的时间间隔（除以 --speed）依次把参数修改写入实验界面；录制文件中已有结果的模拟任务
+直接使用录制的结果（见 simulation.set_replay_results），不再重新模拟。指定 --out 时不显示窗口，
+依次应用全部参数修改，每组同时发生的修改之后按 python -m app.render 的方式保存一帧 frame_0000.png 等。
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+
+from . import render
+from .common.controls import controls, set_control
+from .common.session import read_session
+from .common.simulation import set_replay_results
+
+MIN_SPEED = 1.0
+MAX_SPEED = 20.0
+# 窗口回放时检查到期事件的间隔（毫秒）
+TICK_MS = 10
+
+
+def parse_speed(text):
+    try:
+        speed = float(text)
+    except ValueError:
+        speed = 0.0
+    if not MIN_SPEED <= speed <= MAX_SPEED:
+        raise argparse.ArgumentTypeError(f"回放速度须在 {MIN_SPEED:g} 到 {MAX_SPEED:g} 倍之间：{text}")
+    return speed
+
+
+def group_events(params):
+    """把时间相同的参数修改（如开始录制时的全部初始值）合为一组，返回 [(时间, [(视图键, 参数名, 值)])]"""
+    groups = []
+    for t, view, name, value in params:
+        if groups and groups[-1][0] == t:
+            groups[-1][1].append((view, name, value))
+        else:
+            groups.append((t, [(view, name, value)]))
+    return groups
+
+
+def apply_event(interfaces, create, view, name, value):
+    """把一个参数修改写入对应视图的实验界面，界面不存在时用 create(view) 创建"""
+    interface = interfaces.get(view)
+    if interface is None:
+        interface = interfaces[view] = create(view)
+    control = controls(interface).get(name)
+    if control is None:
+        # 录制时的版本中有、当前版本中没有的参数
+        return interface
+    set_control(control, value)
+    return interface
+
+
+def export_frames(groups, out, figure='plot_widget', size=(800, 600), dpi=100, timeout=60.0):
+    """不显示窗口，每组参数修改之后保存一帧，返回保存的帧数"""
+    os.makedirs(out, exist_ok=True)
+    interfaces = {}
+    digits = max(len(str(len(groups) - 1)), 4)
+    try:
+        for i, (_, events) in enumerate(groups):
+            for view, name, value in events:
+                interface = apply_event(interfaces, render.create_interface, view, name, value)
+            render.wait_until_idle(interface, timeout)
+            render.save_figure(interface, os.path.join(out, f'frame_{i:0{digits}d}.png'), figure, size, dpi)
+    finally:
+        for interface in interfaces.values():
+            render.release_interface(interface)
+    return len(groups)
+
+
+def play(groups, speed):
+    """在窗口中按录制时的节奏（加速 speed 倍）回放，窗口显示最近修改的视图"""
+    from PyQt5.QtCore import Qt, QTimer, QElapsedTimer
+    from PyQt5.QtWidgets import QApplication, QStackedWidget
+    import matplotlib
+
+    QApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
+    app = QApplication(sys.argv)
+    matplotlib.rcParams['font.sans-serif'] = ['Microsoft YaHei', 'SimHei', 'Arial Unicode MS', 'DejaVu Sans']
+    matplotlib.rcParams['axes.unicode_minus'] = False
+
+    window = QStackedWidget()
+    window.setWindowTitle(f'ProbViz 会话回放（{speed:g}×）')
+    window.resize(900, 700)
+    interfaces = {}
+
+    def create(view):
+        interface = render.load_view(view).ExpInterface()
+        window.addWidget(interface)
+        return interface
+
+    clock = QElapsedTimer()
+    timer = QTimer(window)
+    position = [0]
+
+    def tick():
+        elapsed = clock.elapsed() / 1000 * speed
+        while position[0] < len(groups) and groups[position[0]][0] <= elapsed:
+            for view, name, value in groups[position[0]][1]:
+                window.setCurrentWidget(apply_event(interfaces, create, view, name, value))
+            position[0] += 1
+        if position[0] >= len(groups):
+            timer.stop()
+            window.setWindowTitle('ProbViz 会话回放（已结束）')
+
+    timer.timeout.connect(tick)
+    window.show()
+    clock.start()
+    timer.start(TICK_MS)
+    return app.exec_()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m app.replay', description='回放录制的 ProbViz 会话')
+    parser.add_argument('session', help='录制的会话文件')
+    parser.add_argument('--speed', type=parse_speed, default=1.0, help='回放速度（1 ~ 20 倍）')
+    parser.add_argument('--out', help='不显示窗口，把每组参数修改后的图像逐帧保存到该目录')
+    parser.add_argument('--figure', default='plot_widget', help='持有图像的控件属性名，默认为 plot_widget')
+    parser.add_argument('--size', type=render.parse_size, default=(800, 600), metavar='宽x高', help='图像像素尺寸')
+    parser.add_argument('--dpi', type=int, default=100)
+    parser.add_argument('--timeout', type=float, default=60.0, help='每帧等待动画与后台模拟结束的最长秒数')
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        params, results = read_session(args.session)
+        if not params:
+            raise ValueError(f"会话中没有参数修改：{args.session}")
+        set_replay_results(results)
+        groups = group_events(params)
+        if args.out:
+            count = export_frames(groups, args.out, args.figure, args.size, args.dpi, args.timeout)
+            print(f'共 {count} 帧，录制的模拟结果 {len(results)} 个')
+            return 0
+    except (OSError, ValueError) as e:
+        print(f'错误：{e}', file=sys.stderr)
+        return 2
+    return play(groups, args.speed)
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,277 @@
+"""
+本地 HTTP 渲染服务
+
+    python -m app.server --host 0.0.0.0 --port 8000
+
+    GET /render?view=two_dim_norm&rho=0.8&format=svg&size=800x600
+    GET /views
+    GET /stats
+
+/render 的查询参数中 view、format（png 或 svg）、size（宽x高）、dpi、figure 为保留字，其余均作为界面参数，
+含义与 python -m app.render 的 --param 相同。请求在 asyncio 事件循环中处理，渲染交给固定大小的进程池；
+结果按规范化参数的哈希缓存在 LRU 中，同一参数的并发请求只渲染一次。
+"""
+import argparse
+import asyncio
+import hashlib
+import io
+import json
+import multiprocessing
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import urlsplit, parse_qsl
+
+from . import render
+from .common.simulation import worker_count
+
+CONTENT_TYPES = {'png': 'image/png', 'svg': 'image/svg+xml'}
+RESERVED = ('view', 'format', 'size', 'dpi', 'figure')
+MAX_PIXELS = 4000
+# 空闲的保持连接在该秒数后关闭
+KEEP_ALIVE = 15
+REASONS = {
+    200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+    405: 'Method Not Allowed', 500: 'Internal Server Error'
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def render_image(view, params, format, figure, size, dpi, timeout):
+    """在工作进程中渲染一张图像，返回文件内容"""
+    buffer = io.BytesIO()
+    render.render(view, params, buffer, figure, size, dpi, timeout, format=format)
+    return buffer.getvalue()
+
+
+def normalize(value):
+    """数值统一写法（0.80 与 .8 视为相同），其余取去掉首尾空白的原文"""
+    value = value.strip()
+    try:
+        return f'{float(value):.12g}'
+    except ValueError:
+        return value
+
+
+class LRUCache:
+    """按总字节数限制容量的 LRU 缓存"""
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.entries = OrderedDict()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        data = self.entries.get(key)
+        if data is not None:
+            self.entries.move_to_end(key)
+        return data
+
+    def put(self, key, data):
+        if len(data) > self.max_bytes:
+            return
+        if key in self.entries:
+            self.bytes -= len(self.entries.pop(key))
+        self.entries[key] = data
+        self.bytes += len(data)
+        while self.bytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.bytes -= len(evicted)
+
+
+class RenderServer:
+    def __init__(self, workers=None, cache_bytes=256 << 20, timeout=30.0):
+        self.workers = workers or worker_count()
+        self.timeout = timeout
+        self.cache = LRUCache(cache_bytes)
+        # 正在渲染的请求，键为缓存键
+        self.pending = {}
+        self.stats = {'requests': 0, 'hits': 0, 'coalesced': 0, 'renders': 0, 'errors': 0}
+        self.executor = self.create_executor()
+
+    def create_executor(self):
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            # 工作进程中的模拟任务同步执行，不再嵌套启动进程池，进程总数即为 workers
+            initializer=render.init_worker
+        )
+
+    def parse_render_query(self, query):
+        """校验查询参数，返回 (缓存键, 渲染参数)"""
+        fields = dict(parse_qsl(query, keep_blank_values=True))
+        view = fields.get('view')
+        if view not in render.VIEWS:
+            raise HTTPError(400, f"未知的视图：{view}，可用视图：{', '.join(render.VIEWS)}")
+        format = fields.get('format', 'png').lower()
+        if format not in CONTENT_TYPES:
+            raise HTTPError(400, f"不支持的格式：{format}，可用格式：{', '.join(CONTENT_TYPES)}")
+        try:
+            size = render.parse_size(fields.get('size', '800x600'))
+            dpi = int(fields.get('dpi', 100))
+        except (argparse.ArgumentTypeError, ValueError) as e:
+            raise HTTPError(400, str(e))
+        if not (1 <= size[0] <= MAX_PIXELS and 1 <= size[1] <= MAX_PIXELS and 10 <= dpi <= 600):
+            raise HTTPError(400, f"图像尺寸须在 {MAX_PIXELS}x{MAX_PIXELS} 以内，dpi 须在 10 到 600 之间")
+        figure = fields.get('figure', 'plot_widget')
+        # 参数按名称排序后写入控件，与缓存键的顺序一致
+        params = sorted((name, normalize(value)) for name, value in fields.items() if name not in RESERVED)
+        text = json.dumps([view, params, format, figure, size, dpi], ensure_ascii=False)
+        key = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        return key, (view, params, format, figure, size, dpi, self.timeout)
+
+    async def image(self, key, args):
+        """返回缓存中的图像；未缓存时渲染，同一键的并发请求共用一次渲染"""
+        data = self.cache.get(key)
+        if data is not None:
+            self.stats['hits'] += 1
+            return data
+        future = self.pending.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self.render(key, args))
+            self.pending[key] = future
+            future.add_done_callback(lambda _: self.pending.pop(key, None))
+        else:
+            self.stats['coalesced'] += 1
+        # 某个客户端断开时不取消其他客户端也在等待的渲染
+        return await asyncio.shield(future)
+
+    async def render(self, key, args):
+        self.stats['renders'] += 1
+        loop = asyncio.get_running_loop()
+        try:
+            data = await loop.run_in_executor(self.executor, render_image, *args)
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+        except BrokenProcessPool:
+            # 工作进程异常退出，重建进程池以便后续请求
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = self.create_executor()
+            raise HTTPError(500, "渲染进程异常退出")
+        except Exception as e:
+            raise HTTPError(500, f"渲染失败：{e}")
+        self.cache.put(key, data)
+        return data
+
+    async def respond(self, method, target, headers):
+        """处理一个请求，返回 (状态码, 响应头, 响应体)"""
+        if method not in ('GET', 'HEAD'):
+            raise HTTPError(405, f"不支持的方法：{method}")
+        url = urlsplit(target)
+        if url.path == '/render':
+            key, args = self.parse_render_query(url.query)
+            etag = f'"{key}"'
+            if headers.get('if-none-match') == etag and key in self.cache.entries:
+                self.stats['hits'] += 1
+                return 304, {'ETag': etag}, b''
+            data = await self.image(key, args)
+            return 200, {'Content-Type': CONTENT_TYPES[args[2]], 'ETag': etag,
+                         'Cache-Control': 'public, max-age=3600'}, data
+        elif url.path == '/views':
+            body = json.dumps(list(render.VIEWS), ensure_ascii=False)
+        elif url.path == '/stats':
+            body = json.dumps({**self.stats, 'entries': len(self.cache), 'bytes': self.cache.bytes,
+                               'pending': len(self.pending), 'workers': self.workers})
+        else:
+            raise HTTPError(404, f"未知的路径：{url.path}")
+        return 200, {'Content-Type': 'application/json; charset=utf-8'}, body.encode('utf-8')
+
+    async def handle(self, reader, writer):
+        """处理一个连接，支持 HTTP/1.1 保持连接"""
+        try:
+            while True:
+                try:
+                    line = await asyncio.wait_for(reader.readline(), KEEP_ALIVE)
+                except asyncio.TimeoutError:
+                    break
+                if not line:
+                    break
+                try:
+                    method, target, version = line.decode('latin-1').split()
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    header = await reader.readline()
+                    if header in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = header.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get('content-length', 0) or 0)
+                if length:
+                    await reader.readexactly(length)
+
+                self.stats['requests'] += 1
+                try:
+                    status, response_headers, body = await self.respond(method, target, headers)
+                except HTTPError as e:
+                    self.stats['errors'] += 1
+                    status, response_headers, body = e.status, {
+                        'Content-Type': 'text/plain; charset=utf-8'
+                    }, str(e).encode('utf-8')
+
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection == 'keep-alive' or (version == 'HTTP/1.1' and connection != 'close')
+                response_headers['Content-Length'] = str(len(body))
+                response_headers['Connection'] = 'keep-alive' if keep_alive else 'close'
+                head = f'HTTP/1.1 {status} {REASONS[status]}\r\n' + ''.join(
+                    f'{name}: {value}\r\n' for name, value in response_headers.items()
+                ) + '\r\n'
+                writer.write(head.encode('latin-1'))
+                if method != 'HEAD':
+                    writer.write(body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host, port):
+        """开始监听并返回 asyncio.Server，port 为 0 时由系统分配端口"""
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def serve(self, host, port):
+        server = await self.start(host, port)
+        for sock in server.sockets:
+            address = sock.getsockname()
+            print(f'渲染服务已启动：http://{address[0]}:{address[1]}/（{self.workers} 个工作进程）', flush=True)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m app.server', description='ProbViz 本地 HTTP 渲染服务')
+    parser.add_argument('--host', default='127.0.0.1', help='监听地址，供局域网访问时设为 0.0.0.0')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=None, help='渲染进程数，默认为 CPU 核数')
+    parser.add_argument('--cache-mb', type=int, default=256, help='图像缓存的容量（MB）')
+    parser.add_argument('--timeout', type=float, default=30.0, help='每张图像等待动画与后台模拟结束的最长秒数')
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    server = RenderServer(args.workers, args.cache_mb << 20, args.timeout)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    sys.exit(main())
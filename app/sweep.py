@@ -0,0 +1,186 @@
+"""
+参数扫描批量出图
+
+    python -m app.sweep --view poisson_theorem --sweep n=10:400:391 --out frames/
+    python -m app.sweep --view two_dim_norm --sweep rho=-0.99:0.99:500 --out rho.gif --fps 25
+
+--sweep 名称=起点:终点:帧数 在闭区间上等距取值（整数参数四舍五入），名称=a,b,c 直接列出取值，
+多个 --sweep 取笛卡尔积；--param 设置所有帧共用的参数。输出为目录时逐帧保存 frame_0000.png 等，
+输出为 .gif 文件时合成动图。各帧分块交给进程池渲染，每个工作进程只创建一次 QApplication 与实验界面，
+之后逐帧修改控件并出图。
+"""
+import argparse
+import csv
+import itertools
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from . import render
+from .common.simulation import worker_count
+
+# 每个工作进程中已创建的实验界面，按视图键缓存
+_interfaces = {}
+
+
+def parse_sweep(text):
+    name, sep, spec = text.partition('=')
+    if not sep or not name:
+        raise argparse.ArgumentTypeError(f"扫描格式应为 名称=起点:终点:帧数 或 名称=a,b,c：{text}")
+    try:
+        if ':' in spec:
+            start, stop, count = spec.split(':')
+            values = [f'{v:.12g}' for v in np.linspace(float(start), float(stop), int(count))]
+        else:
+            values = [v.strip() for v in spec.split(',') if v.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"扫描格式应为 名称=起点:终点:帧数 或 名称=a,b,c：{text}")
+    if not values:
+        raise argparse.ArgumentTypeError(f"扫描没有取值：{text}")
+    return name.strip(), values
+
+
+def build_frames(sweeps):
+    """各扫描参数取值的笛卡尔积，返回每一帧的 [(参数名, 值)]"""
+    names = [name for name, _ in sweeps]
+    return [list(zip(names, values)) for values in itertools.product(*(values for _, values in sweeps))]
+
+
+def render_frames(view, fixed, frames, figure, size, dpi, timeout):
+    """
+    渲染一组帧 [(序号, 参数, 输出路径)]，返回 [(序号, 耗时)]
+
+    同一进程中的界面在各组之间复用，共用参数只在创建界面时设置一次。
+    """
+    interface = _interfaces.get(view)
+    if interface is None:
+        interface = _interfaces[view] = render.create_interface(view)
+        render.apply_params(interface, fixed)
+    timings = []
+    for index, params, out in frames:
+        start = time.perf_counter()
+        render.apply_params(interface, params)
+        render.wait_until_idle(interface, timeout)
+        render.save_figure(interface, out, figure, size, dpi)
+        timings.append((index, time.perf_counter() - start))
+    return timings
+
+
+def sweep(view, fixed, frames, paths, figure='plot_widget', size=(800, 600), dpi=100, timeout=60.0,
+          jobs=None, progress=None):
+    """
+    渲染所有帧并保存到 paths，返回每帧耗时（秒）的数组
+
+    jobs 为 1 时在当前进程中依次渲染；否则按 spawn 方式启动 jobs 个工作进程，
+    帧按顺序切成约 4 × jobs 块分发，以兼顾负载均衡与界面复用。
+    """
+    jobs = jobs or worker_count()
+    tasks = [(i, params, path) for i, (params, path) in enumerate(zip(frames, paths))]
+    timings = np.zeros(len(tasks))
+    done = 0
+    if jobs == 1:
+        for task in tasks:
+            for index, seconds in render_frames(view, fixed, [task], figure, size, dpi, timeout):
+                timings[index] = seconds
+            done += 1
+            if progress is not None:
+                progress(done, len(tasks))
+        return timings
+
+    chunk = max(len(tasks) // (4 * jobs), 1)
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context('spawn'),
+                             initializer=render.init_worker) as executor:
+        futures = [
+            executor.submit(render_frames, view, fixed, tasks[i:i + chunk], figure, size, dpi, timeout)
+            for i in range(0, len(tasks), chunk)
+        ]
+        try:
+            for future in as_completed(futures):
+                for index, seconds in future.result():
+                    timings[index] = seconds
+                    done += 1
+                if progress is not None:
+                    progress(done, len(tasks))
+        except BaseException:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+    return timings
+
+
+def write_gif(paths, out, fps):
+    from PIL import Image
+    first = Image.open(paths[0]).convert('RGB')
+    rest = (Image.open(path).convert('RGB') for path in paths[1:])
+    first.save(out, save_all=True, append_images=rest, duration=int(round(1000 / fps)), loop=0)
+
+
+def write_timings(path, frames, timings):
+    """每帧一行：序号、各扫描参数的取值、耗时"""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['frame'] + [name for name, _ in frames[0]] + ['seconds'])
+        for i, (params, seconds) in enumerate(zip(frames, timings)):
+            writer.writerow([i] + [value for _, value in params] + [f'{seconds:.4f}'])
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m app.sweep', description='参数扫描批量渲染 ProbViz 实验图像')
+    parser.add_argument('--view', required=True, help='视图键，如 two_dim_norm')
+    parser.add_argument('--sweep', type=parse_sweep, action='append', required=True,
+                        metavar='名称=起点:终点:帧数', help='扫描的参数，可重复使用，取笛卡尔积')
+    parser.add_argument('--param', type=render.parse_param, action='append', default=[], metavar='名称=值',
+                        help='所有帧共用的参数，可重复使用')
+    parser.add_argument('--out', required=True, help='输出目录（逐帧 PNG）或 .gif 文件')
+    parser.add_argument('--figure', default='plot_widget', help='持有图像的控件属性名，默认为 plot_widget')
+    parser.add_argument('--size', type=render.parse_size, default=(800, 600), metavar='宽x高', help='图像像素尺寸')
+    parser.add_argument('--dpi', type=int, default=100)
+    parser.add_argument('--timeout', type=float, default=60.0, help='每帧等待动画与后台模拟结束的最长秒数')
+    parser.add_argument('--fps', type=float, default=20.0, help='GIF 的帧率')
+    parser.add_argument('--jobs', type=int, default=None, help='工作进程数，默认为 CPU 核数，1 表示不使用进程池')
+    parser.add_argument('--timings', help='把每帧的参数与耗时写入 CSV 文件')
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    frames = build_frames(args.sweep)
+    digits = max(len(str(len(frames) - 1)), 4)
+    gif = args.out.lower().endswith('.gif')
+
+    with tempfile.TemporaryDirectory() as scratch:
+        directory = scratch if gif else args.out
+        os.makedirs(directory, exist_ok=True)
+        paths = [os.path.join(directory, f'frame_{i:0{digits}d}.png') for i in range(len(frames))]
+
+        def progress(done, total):
+            print(f'\r已渲染 {done} / {total} 帧', end='', file=sys.stderr, flush=True)
+
+        start = time.perf_counter()
+        try:
+            timings = sweep(args.view, args.param, frames, paths, args.figure, args.size, args.dpi,
+                            args.timeout, args.jobs, progress)
+        except ValueError as e:
+            print(f'\n错误：{e}', file=sys.stderr)
+            return 2
+        print(file=sys.stderr)
+        if gif:
+            write_gif(paths, args.out, args.fps)
+        elapsed = time.perf_counter() - start
+
+    if args.timings:
+        write_timings(args.timings, frames, timings)
+    print(f'共 {len(frames)} 帧，用时 {elapsed:.2f} s（{len(frames) / elapsed:.1f} 帧/s，'
+          f'{args.jobs or worker_count()} 个进程）')
+    print(f'单帧耗时：中位数 {np.median(timings):.3f} s，平均 {timings.mean():.3f} s，'
+          f'最短 {timings.min():.3f} s，最长 {timings.max():.3f} s')
+    return 0
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    sys.exit(main())
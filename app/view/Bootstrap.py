@@ -0,0 +1,395 @@
+import os
+
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QSizePolicy, QGridLayout, QFileDialog
+)
+from qfluentwidgets import (
+    FlowLayout, Slider, CompactDoubleSpinBox, CompactSpinBox, isDarkTheme,
+    TitleLabel, BodyLabel, ScrollArea, FluentStyleSheet, ComboBox, PushButton,
+    TeachingTip, InfoBarIcon
+)
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from scipy.stats import norm, chi2
+import numpy as np
+
+from .ExpWidget import ExpWidget
+from ..common.MarkdownKatex import MarkdownKaTeXWidget
+from ..common.config import cfg
+from ..common.distributions import CONTINUOUS_FAMILIES, default_params, freeze
+from ..common.bootstrap import (
+    STATISTICS, statistic, bootstrap_statistics, jackknife,
+    percentile_interval, bca_interval, normal_theory_interval
+)
+from ..common.simulation import get_executor, worker_count
+from ..common.controls import link_log_slider
+
+class Bootstrap(ExpWidget):
+
+    desc = r"""
+# 自助法（Bootstrap）置信区间
+设 $x_1, x_2, \ldots, x_n$ 为来自未知总体的样本，$\hat\theta = T(x_1, \ldots, x_n)$ 为参数 $\theta$ 的估计。
+自助法从样本中**有放回地**抽取 $n$ 个观测值构成自助样本，重复 $B$ 次得到 $\hat\theta^*_1, \ldots, \hat\theta^*_B$，
+用它们的分布近似 $\hat\theta$ 的抽样分布。
+
+1. **百分位数区间**：取 $\hat\theta^*$ 的 $\frac{\alpha}{2}$ 与 $1-\frac{\alpha}{2}$ 分位数；
+2. **BCa 区间**：用偏差校正常数 $z_0$ 与由刀切法得到的加速常数 $a$ 调整分位数的位置，
+$$
+\alpha_{1,2} = \Phi\left( z_0 + \cfrac{z_0 + z_{\alpha/2, 1-\alpha/2}}{1 - a(z_0 + z_{\alpha/2, 1-\alpha/2})} \right)
+$$
+3. **正态理论区间**：与点估计的相合性实验一致，样本均值近似服从 $\mathcal{N}(\mu, \frac{\sigma^2}{n})$，
+样本中位数的渐近方差为 $\frac{\pi \sigma^2}{2n}$，方差的区间由 $\frac{(n-1)S^2}{\sigma^2} \sim \chi^2(n-1)$ 得到。
+
+重抽样按分块的下标数组批量进行，并分发到多个进程并行计算。
+"""
+
+    class ExpInterface(ScrollArea):
+        windowResizeSignal = pyqtSignal(int, int)
+        
+        class PlotWidget(QWidget):
+            progressChanged = pyqtSignal(str)
+            
+            def __init__(self, parent=None):
+                super().__init__(parent)
+                
+                self.figure = Figure(figsize=(8, 6), dpi=100)
+                self.figure.patch.set_facecolor("none")
+                self.figure.patch.set_edgecolor("none")
+                self.canvas = FigureCanvas(self.figure)
+                self.canvas.setStyleSheet("background: transparent;")
+                self.canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+                
+                self.layout = QVBoxLayout(self)
+                self.layout.addWidget(self.canvas)
+                self.setLayout(self.layout)
+                
+                self.statistic = 'mean'
+                self.level = 0.95
+                self.B = 10000
+                self.sample = None
+                self.futures = []
+                self.results = []
+                # 重抽样任务出错时的错误信息
+                self.error = None
+                self.seed_sequence = np.random.SeedSequence()
+                
+                self.timer = QTimer(self)
+                self.timer.setInterval(100)
+                self.timer.timeout.connect(self.poll)
+                
+                self.parent().windowResizeSignal.connect(self.onParentResize)
+            
+            def onParentResize(self, parent_width, parent_height):
+                """响应父控件大小变化"""
+                available_width = max(parent_width - 100, 400)
+                max_width = 800
+                width = min(available_width, max_width)
+                height = width * 3 / 4
+                
+                self.figure.set_size_inches(width / 100, height / 100)
+                self.canvas.draw()
+            
+            def update_plot(self, sample=None, statistic_name=None, level=None, B=None):
+                if sample is not None:
+                    self.sample = np.ascontiguousarray(sample, dtype=np.float64)
+                if statistic_name is not None:
+                    self.statistic = statistic_name
+                if level is not None:
+                    self.level = level
+                if B is not None:
+                    self.B = B
+                
+                for future in self.futures:
+                    future.cancel()
+                self.futures = []
+                self.results = []
+                self.error = None
+                self.estimate = statistic(self.sample, self.statistic)
+                self.theory = normal_theory_interval(self.sample, self.statistic, self.level)
+                
+                # 重抽样任务按进程数切分，每个任务使用独立的子种子
+                executor = get_executor()
+                tasks = max(1, min(self.B // 1000, 4 * worker_count()))
+                counts = np.diff(np.linspace(0, self.B, tasks + 1).round().astype(int))
+                for seed, count in zip(self.seed_sequence.spawn(tasks), counts):
+                    self.futures.append(executor.submit(
+                        bootstrap_statistics, seed, self.sample, self.statistic, int(count)
+                    ))
+                self.draw()
+                self.timer.start()
+            
+            def poll(self):
+                pending = []
+                updated = False
+                for future in self.futures:
+                    if not future.done():
+                        pending.append(future)
+                    elif not future.cancelled():
+                        try:
+                            self.results.append(future.result())
+                        except Exception as e:
+                            # 停止轮询并取消其余任务，已完成的重抽样结果保留在图中
+                            self.timer.stop()
+                            for other in self.futures:
+                                other.cancel()
+                            self.futures = []
+                            self.error = str(e)
+                            self.draw()
+                            return
+                        updated = True
+                self.futures = pending
+                if not pending:
+                    self.timer.stop()
+                if updated:
+                    self.draw()
+            
+            def draw(self):
+                self.figure.clear()
+                ax = self.figure.add_subplot(111)
+                color = 'white' if isDarkTheme() else 'black'
+                n = len(self.sample)
+                done = sum(len(r) for r in self.results)
+                
+                lines = [f'$\\hat\\theta$ = {self.estimate:.5g}']
+                theory_lo, theory_hi = self.theory
+                span = theory_hi - theory_lo
+                x = np.linspace(theory_lo - span, theory_hi + span, 400)
+                
+                if self.results:
+                    boot = np.concatenate(self.results)
+                    lo, hi = np.quantile(boot, [0.0005, 0.9995])
+                    x = np.linspace(min(lo, x[0]), max(hi, x[-1]), 400)
+                    counts, edges = np.histogram(boot, bins=60, range=(x[0], x[-1]), density=True)
+                    ax.stairs(counts, edges, fill=True, alpha=0.5, color='tab:blue', label=f'自助分布 (B={done:,})')
+                    
+                    p_lo, p_hi = percentile_interval(boot, self.level)
+                    ax.axvline(p_lo, color='tab:blue', linestyle='--', linewidth=1.5, label='百分位数区间')
+                    ax.axvline(p_hi, color='tab:blue', linestyle='--', linewidth=1.5)
+                    lines.append(f'百分位数: [{p_lo:.5g}, {p_hi:.5g}]')
+                    
+                    # BCa 区间在全部重抽样完成后计算
+                    if not self.futures and self.error is None:
+                        b_lo, b_hi = bca_interval(boot, self.estimate, jackknife(self.sample, self.statistic), self.level)
+                        ax.axvline(b_lo, color='green', linestyle='-.', linewidth=1.5, label='BCa 区间')
+                        ax.axvline(b_hi, color='green', linestyle='-.', linewidth=1.5)
+                        lines.append(f'BCa: [{b_lo:.5g}, {b_hi:.5g}]')
+                
+                # 正态理论下统计量的抽样分布
+                s2 = np.var(self.sample, ddof=1)
+                if self.statistic == 'variance':
+                    density = chi2.pdf(x * (n - 1) / s2, n - 1) * (n - 1) / s2
+                else:
+                    scale = np.sqrt(s2 / n) if self.statistic == 'mean' else np.sqrt(np.pi * s2 / (2 * n))
+                    density = norm.pdf(x, self.estimate, scale)
+                ax.plot(x, density, color='red', linewidth=1.5, label='正态理论分布')
+                ax.axvline(theory_lo, color='red', linestyle=':', linewidth=1.5, label='正态理论区间')
+                ax.axvline(theory_hi, color='red', linestyle=':', linewidth=1.5)
+                lines.append(f'正态理论: [{theory_lo:.5g}, {theory_hi:.5g}]')
+                ax.axvline(self.estimate, color=color, linewidth=1.5)
+                
+                ax.text(0.02, 0.97, '\n'.join(lines), transform=ax.transAxes, color=color,
+                        verticalalignment='top', fontsize=9)
+                ax.set_xlim(x[0], x[-1])
+                ax.legend(loc='upper right', fontsize=8)
+                
+                ax.patch.set_alpha(0.1)
+                for spine in ax.spines.values():
+                    spine.set_color(color)
+                ax.tick_params(colors=color, which='both')
+                ax.grid(True, alpha=0.3 if isDarkTheme() else 0.7)
+                ax.set_xlabel(f'样本{STATISTICS[self.statistic]}', color=color)
+                ax.set_ylabel('密度', color=color)
+                ax.set_title(f'自助法 {self.level:.0%} 置信区间 (n={n:,})', color=color)
+                
+                self.figure.tight_layout()
+                self.canvas.draw()
+                if self.error is not None:
+                    self.progressChanged.emit(f"重抽样出错（已完成 {done:,} / {self.B:,} 次）：{self.error}")
+                else:
+                    self.progressChanged.emit(f"已完成 {done:,} / {self.B:,} 次重抽样")
+        
+        def __init__(self, parent=None):
+            super().__init__(parent)
+            self.flow_layout = FlowLayout(self)
+            
+            self.control_container = QWidget()
+            self.control_container.setFixedWidth(400)
+            self.controls_layout = QGridLayout(self.control_container)
+            
+            self.imported = None
+            
+            # 样本来源：由常见连续分布生成，或从文件导入
+            self.source_label = BodyLabel("样本来源：", self)
+            self.source_combo = ComboBox(self)
+            self.source_keys = list(CONTINUOUS_FAMILIES)
+            self.source_combo.addItems([CONTINUOUS_FAMILIES[key][0] for key in self.source_keys])
+            self.source_combo.setCurrentIndex(self.source_keys.index('normal'))
+            self.import_button = PushButton("导入样本…", self)
+            
+            self.controls_layout.addWidget(self.source_label, 0, 0)
+            self.controls_layout.addWidget(self.source_combo, 0, 1)
+            self.controls_layout.addWidget(self.import_button, 0, 2)
+            
+            # 样本量，跨越多个数量级，滑块取 10 倍的常用对数
+            self.n_label = BodyLabel("n（样本量）：", self)
+            self.n_spin = CompactSpinBox(self)
+            self.n_spin.setRange(10, 100000)
+            self.n_spin.setValue(100)
+            self.n_slider = Slider(Qt.Horizontal, self)
+            self.n_slider.setRange(10, 50)
+            self.n_slider.setSingleStep(1)
+            self.n_slider.setValue(20)
+            
+            self.controls_layout.addWidget(self.n_label, 1, 0)
+            self.controls_layout.addWidget(self.n_spin, 1, 1)
+            self.controls_layout.addWidget(self.n_slider, 1, 2)
+            
+            # 统计量
+            self.statistic_label = BodyLabel("统计量：", self)
+            self.statistic_combo = ComboBox(self)
+            self.statistic_combo.addItems(list(STATISTICS.values()))
+            
+            self.controls_layout.addWidget(self.statistic_label, 2, 0)
+            self.controls_layout.addWidget(self.statistic_combo, 2, 1, 1, 2)
+            
+            # 重抽样次数
+            self.B_label = BodyLabel("B（重抽样次数）：", self)
+            self.B_spin = CompactSpinBox(self)
+            self.B_spin.setRange(100, 100000)
+            self.B_spin.setSingleStep(100)
+            self.B_spin.setValue(10000)
+            self.B_slider = Slider(Qt.Horizontal, self)
+            self.B_slider.setRange(20, 50)
+            self.B_slider.setSingleStep(1)
+            self.B_slider.setValue(40)
+            
+            self.controls_layout.addWidget(self.B_label, 3, 0)
+            self.controls_layout.addWidget(self.B_spin, 3, 1)
+            self.controls_layout.addWidget(self.B_slider, 3, 2)
+            
+            # 置信水平
+            self.level_label = BodyLabel("1-α（置信水平）：", self)
+            self.level_spin = CompactDoubleSpinBox(self)
+            self.level_spin.setRange(0.8, 0.99)
+            self.level_spin.setSingleStep(0.01)
+            self.level_spin.setValue(0.95)
+            self.level_slider = Slider(Qt.Horizontal, self)
+            self.level_slider.setRange(80, 99)
+            self.level_slider.setSingleStep(1)
+            self.level_slider.setValue(95)
+            
+            self.controls_layout.addWidget(self.level_label, 4, 0)
+            self.controls_layout.addWidget(self.level_spin, 4, 1)
+            self.controls_layout.addWidget(self.level_slider, 4, 2)
+            
+            self.progress_label = BodyLabel("", self)
+            self.controls_layout.addWidget(self.progress_label, 5, 0, 1, 3)
+            
+            self.flow_layout.addWidget(self.control_container)
+            
+            # 绘图区域
+            self.plot_widget = self.PlotWidget(self)
+            self.flow_layout.addWidget(self.plot_widget)
+            
+            # 连接信号
+            link_log_slider(self.n_spin, self.n_slider)
+            link_log_slider(self.B_spin, self.B_slider)
+            self.level_spin.valueChanged.connect(
+                lambda: self.level_slider.setValue(int(round(self.level_spin.value() * 100)))
+            )
+            self.level_slider.valueChanged.connect(
+                lambda: self.level_spin.setValue(self.level_slider.value() / 100)
+            )
+            
+            self.source_combo.currentIndexChanged.connect(lambda: self.generate_sample())
+            self.n_spin.valueChanged.connect(lambda: self.generate_sample())
+            self.import_button.clicked.connect(self.import_sample)
+            self.statistic_combo.currentIndexChanged.connect(lambda: self.update_parameters())
+            self.B_spin.valueChanged.connect(lambda: self.update_parameters())
+            self.level_spin.valueChanged.connect(lambda: self.update_parameters())
+            self.plot_widget.progressChanged.connect(self.progress_label.setText)
+            
+            cfg.themeChanged.connect(lambda: self.plot_widget.draw())
+            
+            self.generate_sample()
+        
+        def generate_sample(self):
+            """从所选分布（默认参数）生成新样本；选中导入的数据时直接使用导入的样本"""
+            index = self.source_combo.currentIndex()
+            if index >= len(self.source_keys):
+                sample = self.imported
+            else:
+                key = self.source_keys[index]
+                sample = freeze(key, default_params(key)).rvs(size=self.n_spin.value())
+            self.update_parameters(sample)
+        
+        def import_sample(self):
+            path, _ = QFileDialog.getOpenFileName(self, "导入样本", "", "数据文件 (*.csv *.txt);;所有文件 (*)")
+            if not path:
+                return
+            try:
+                # 取第一列，无法解析的行（如表头）记为缺失值后剔除
+                sample = np.genfromtxt(path, delimiter=',', usecols=0)
+                sample = np.atleast_1d(sample)
+                sample = sample[np.isfinite(sample)][:self.n_spin.maximum()]
+                if len(sample) < 3:
+                    raise ValueError("文件中至少需要 3 个有效数值")
+            except Exception as e:
+                TeachingTip.create(
+                    target=self.import_button,
+                    icon=InfoBarIcon.ERROR,
+                    title='导入失败',
+                    content=str(e),
+                    isClosable=True
+                )
+                return
+            
+            self.imported = sample
+            name = f"导入：{os.path.basename(path)}"
+            if self.source_combo.count() > len(self.source_keys):
+                self.source_combo.setItemText(len(self.source_keys), name)
+            else:
+                self.source_combo.addItem(name)
+            if self.source_combo.currentIndex() == len(self.source_keys):
+                self.generate_sample()
+            else:
+                self.source_combo.setCurrentIndex(len(self.source_keys))
+        
+        def update_parameters(self, sample=None):
+            self.plot_widget.update_plot(
+                sample=sample,
+                statistic_name=list(STATISTICS)[self.statistic_combo.currentIndex()],
+                level=self.level_spin.value(),
+                B=self.B_spin.value()
+            )
+        
+        def resizeEvent(self, event):
+            super().resizeEvent(event)
+            current_size = event.size()
+            self.windowResizeSignal.emit(current_size.width(), current_size.height())
+            event.accept()
+    
+    def __init__(self, parent=None):
+        # 创建工厂函数用于懒加载
+        def create_description_interface():
+            descriptionInterface = MarkdownKaTeXWidget()
+            descriptionInterface.set_markdown(self.desc)
+            return descriptionInterface
+        
+        def create_experiment_interface():
+            scroll_area = ScrollArea()
+            experimentInterface = Bootstrap.ExpInterface()
+            scroll_area.setWidget(experimentInterface)
+            scroll_area.setWidgetResizable(True)
+            scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+            scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+            FluentStyleSheet.NAVIGATION_INTERFACE.apply(scroll_area)
+            return scroll_area
+        
+        super().__init__(
+            '自助法置信区间',
+            descriptionFactory=create_description_interface,
+            experimentFactory=create_experiment_interface,
+            parent=parent
+        )
@@ -1,19 +1,24 @@
-from PyQt5.QtCore import Qt, pyqtSignal
+import time
+
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QSizePolicy, QGridLayout
 )
 from qfluentwidgets import (
     FlowLayout, Slider, CompactDoubleSpinBox, CompactSpinBox, isDarkTheme,
-    TitleLabel, BodyLabel, ScrollArea, FluentStyleSheet
+    TitleLabel, BodyLabel, ScrollArea, FluentStyleSheet, ComboBox, TogglePushButton
 )
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from scipy.stats import norm, binom
+from scipy.stats import norm
 import numpy as np
 
 from .ExpWidget import ExpWidget
 from ..common.MarkdownKatex import MarkdownKaTeXWidget
 from ..common.config import cfg
+from ..common.distributions import FAMILIES, default_params, freeze, is_discrete
+from ..common.convolution import sum_distribution
+from ..common.simulation import sample_sums, ADDITIVE_FAMILIES
 
 class CentralLimitTheorem(ExpWidget):
     
@@ -24,12 +29,29 @@ class CentralLimitTheorem(ExpWidget):
 $\sum_{i=1}^n X_i$ 近似服从 $\mathcal{N}(n \mu, n \sigma^2)$。
 特别地，若 $X \sim \mathcal{B}(n, p)$，则当 $n$ 充分大时，
 标准化变量 $\cfrac{X-np}{\sqrt{np(1-p)}}$ 近似服从标准正态分布 $\mathcal{N}(0, 1)$。
+
+实验中可以选择任意常见分布作为总体，程序将总体分布离散化后，
+用快速傅里叶变换反复平方卷积，计算 $n$ 个独立同分布变量之和（或均值）的精确分布，
+并与正态近似 $\mathcal{N}(n \mu, n \sigma^2)$（或 $\mathcal{N}(\mu, \sigma^2 / n)$）对比。
+
+开启模拟抽样后，程序不断抽取容量为 $n$ 的样本并计算其和（或均值），累加到固定分箱的直方图中实时显示。
+对两点分布、泊松分布、正态分布、指数分布等具有可加性的分布，直接从和的分布中抽样（如 $n$ 个两点分布之和服从二项分布），
+每秒可模拟数百万个样本均值。
 """
 
     class ExpInterface(ScrollArea):
         windowResizeSignal = pyqtSignal(int, int)
         
         class PlotWidget(QWidget):
+            statusChanged = pyqtSignal(str)
+            # 模拟直方图的分箱数上限、每批抽取的样本和个数、每帧计算时间上限与模拟总数上限
+            SIMULATION_BINS = 200
+            BATCH_SIZE = 1 << 18
+            # 须逐个抽样求和的分布每批最多抽取的变量个数，保证每批耗时远小于 FRAME_BUDGET
+            BATCH_DRAWS = 1 << 18
+            FRAME_BUDGET = 0.05
+            MAX_SAMPLES = 1 << 32
+            
             def __init__(self, parent=None):
                 super().__init__(parent)
                 
@@ -46,6 +68,12 @@ $\sum_{i=1}^n X_i$ 近似服从 $\mathcal{N}(n \mu, n \sigma^2)$。
                 
                 self.n = 50
                 self.p = 0.5
+                self.source = 'bernoulli'  # 总体分布类型
+                self.show_mean = False     # False 显示和的分布，True 显示均值的分布
+                self.simulating = False
+                
+                self.simulation_timer = QTimer(self)
+                self.simulation_timer.timeout.connect(self.simulate)
                 
                 self.update_plot(self.n, self.p)
                 self.parent().windowResizeSignal.connect(self.onParentResize)
@@ -60,22 +88,66 @@ $\sum_{i=1}^n X_i$ 近似服从 $\mathcal{N}(n \mu, n \sigma^2)$。
                 self.figure.set_size_inches(width / 100, height / 100)
                 self.canvas.draw()
                 
+            def source_params(self, p=None):
+                """总体分布参数：取默认参数，若含成功概率 p 则使用界面上的值"""
+                params = default_params(self.source)
+                if 'p' in params:
+                    params['p'] = self.p if p is None else p
+                return params
+            
             def update_plot(self, n=None, p=None):
                 if n is None:
                     n = self.n
+                else:
+                    self.n = n
                 if p is None:
                     p = self.p
+                else:
+                    self.p = p
                 self.figure.clear()
                 ax = self.figure.add_subplot(111)
                 
-                mu = n * p
-                sigma = np.sqrt(n * p * (1 - p))
-                x = np.arange(max(0, int(mu - 4*sigma)), int(mu + 4*sigma) + 1)
-                pmf_binom = binom.pmf(x, n, p)
-                x_continuous = np.linspace(x[0], x[-1], 1000)
-                pdf_normal = norm.pdf(x_continuous, loc=mu, scale=sigma)
-                ax.bar(x, pmf_binom, width=0.8, label=f'二项分布 B(n={n}, p={p})', alpha=0.6, color='blue', align='center')
-                ax.plot(x_continuous, pdf_normal, label=f'正态分布 N(μ={mu:.1f}, σ²={sigma**2:.1f})', color='red', linewidth=2)
+                params = self.source_params(p)
+                name = FAMILIES[self.source][0]
+                mean, var = freeze(self.source, params).stats('mv')
+                
+                # 精确分布：FFT 卷积得到 n 个独立同分布变量之和
+                lattice = sum_distribution(self.source, params, n)
+                if self.show_mean:
+                    lattice = lattice.scaled(1 / n)
+                    mu, sigma = mean, np.sqrt(var / n)
+                    exact_label = f'{n} 个{name}变量均值的精确分布'
+                    normal_label = f'正态分布 N(μ={mu:.3f}, σ²={sigma**2:.4f})'
+                else:
+                    mu, sigma = n * mean, np.sqrt(n * var)
+                    exact_label = f'{n} 个{name}变量之和的精确分布'
+                    normal_label = f'正态分布 N(μ={mu:.1f}, σ²={sigma**2:.1f})'
+                
+                x, density = lattice.x, lattice.density
+                if np.isfinite(sigma):
+                    x_min, x_max = mu - 4*sigma, mu + 4*sigma
+                else:
+                    # 方差不存在时（如自由度不超过 2 的 t 分布）没有正态极限
+                    x_min, x_max = np.interp([0.005, 0.995], np.cumsum(lattice.p), x)
+                shown = (x >= x_min - lattice.h) & (x <= x_max + lattice.h)
+                x, density = x[shown], density[shown]
+                
+                if is_discrete(self.source) and lattice.h == 1 and len(x) <= 150:
+                    ax.bar(x, density, width=0.8, label=exact_label, alpha=0.6, color='blue', align='center')
+                elif is_discrete(self.source):
+                    ax.fill_between(x, density, step='mid', label=exact_label, alpha=0.6, color='blue')
+                else:
+                    ax.fill_between(x, density, label=exact_label, alpha=0.4, color='blue')
+                
+                if np.isfinite(sigma):
+                    x_continuous = np.linspace(x_min, x_max, 1000)
+                    pdf_normal = norm.pdf(x_continuous, loc=mu, scale=sigma)
+                    ax.plot(x_continuous, pdf_normal, label=normal_label, color='red', linewidth=2)
+                ax.set_xlim(x_min, x_max)
+                
+                self.simulation_timer.stop()
+                if self.simulating:
+                    self.start_simulation(ax, x_min, x_max)
                 
                 ax.patch.set_alpha(0.1)
                 ax.legend()
@@ -84,21 +156,80 @@ $\sum_{i=1}^n X_i$ 近似服从 $\mathcal{N}(n \mu, n \sigma^2)$。
                     for spine in ax.spines.values():
                         spine.set_color('white')
                     ax.tick_params(colors='white', which='both')
-                    ax.set_xlabel('$k$', color='white')
+                    ax.set_xlabel('$\\bar{x}$' if self.show_mean else '$x$', color='white')
                     ax.set_ylabel('概率密度', color='white')
-                    ax.set_title(f'中心极限定理演示: 二项分布 vs 正态分布', color='white')
+                    ax.set_title(f'中心极限定理演示: 精确分布 vs 正态分布', color='white')
                     ax.grid(True, alpha=0.3)
                 else:
                     for spine in ax.spines.values():
                         spine.set_color('black')
                     ax.tick_params(colors='black', which='both')
-                    ax.set_xlabel('$k$', color='black')
+                    ax.set_xlabel('$\\bar{x}$' if self.show_mean else '$x$', color='black')
                     ax.set_ylabel('概率密度', color='black')
-                    ax.set_title(f'中心极限定理演示: 二项分布 vs 正态分布', color='black')
+                    ax.set_title(f'中心极限定理演示: 精确分布 vs 正态分布', color='black')
                     ax.grid(True, alpha=0.7)
                 
                 self.figure.tight_layout()
                 self.canvas.draw()
+                if self.simulating:
+                    self.simulation_timer.start(0)
+            
+            def set_simulating(self, simulating):
+                """开启时重新绘图并建立空的模拟直方图，停止时保留已累积的直方图"""
+                self.simulating = simulating
+                if simulating:
+                    self.update_plot()
+                else:
+                    self.simulation_timer.stop()
+            
+            def start_simulation(self, ax, x_min, x_max):
+                """在和的尺度上建立固定分箱，离散总体的分箱边界落在相邻整数之间，避免混叠"""
+                scale = self.n if self.show_mean else 1
+                lo, hi = x_min * scale, x_max * scale
+                if is_discrete(self.source):
+                    width = max(np.ceil((hi - lo) / self.SIMULATION_BINS), 1)
+                    edges = np.arange(np.floor(lo) - 0.5, np.ceil(hi) + 0.5 + width, width)
+                else:
+                    edges = np.linspace(lo, hi, self.SIMULATION_BINS + 1)
+                self.simulation_edges = edges
+                self.simulation_scale = scale
+                self.simulation_counts = np.zeros(len(edges) - 1, dtype=np.int64)
+                self.simulation_total = 0
+                self.simulation_time = 0.0
+                self.simulation_rng = np.random.default_rng()
+                self.simulation_params = self.source_params()
+                label = '模拟的样本均值' if self.show_mean else '模拟的样本和'
+                self.simulation_hist = ax.stairs(self.simulation_counts.astype(float), edges / scale,
+                                                 fill=True, alpha=0.5, color='orange', label=label)
+            
+            def simulate(self):
+                """抽取若干批样本和，按分箱下标用 bincount 累加到直方图中，不重建直方图"""
+                edges = self.simulation_edges
+                width = edges[1] - edges[0]
+                bins = len(self.simulation_counts)
+                if self.source in ADDITIVE_FAMILIES:
+                    batch = self.BATCH_SIZE
+                else:
+                    # 每个样本和要抽取 n 个变量，按变量个数限制每批的大小
+                    batch = max(self.BATCH_DRAWS // self.n, 1)
+                start = time.perf_counter()
+                while time.perf_counter() - start < self.FRAME_BUDGET:
+                    sums = sample_sums(self.simulation_rng, self.source, self.simulation_params,
+                                       self.n, batch)
+                    index = np.floor((sums - edges[0]) / width)
+                    index = index[(index >= 0) & (index < bins)].astype(np.intp)
+                    self.simulation_counts += np.bincount(index, minlength=bins)
+                    self.simulation_total += len(sums)
+                self.simulation_time += time.perf_counter() - start
+                
+                # 落在分箱范围之外的样本也计入总数，保证直方图与密度曲线的尺度一致
+                density = self.simulation_counts / (self.simulation_total * width / self.simulation_scale)
+                self.simulation_hist.set_data(density, edges / self.simulation_scale)
+                self.canvas.draw_idle()
+                rate = self.simulation_total / self.simulation_time
+                self.statusChanged.emit(f"已模拟 {self.simulation_total:,} 次（{rate / 1e6:.2f} 百万次/秒）")
+                if self.simulation_total >= self.MAX_SAMPLES:
+                    self.simulation_timer.stop()
 
         def __init__(self, parent=None):
             super().__init__(parent)
@@ -108,19 +239,29 @@ $\sum_{i=1}^n X_i$ 近似服从 $\mathcal{N}(n \mu, n \sigma^2)$。
             self.control_container.setFixedWidth(400)
             self.controls_layout = QGridLayout(self.control_container)
             
+            # 总体分布选择
+            self.source_label = BodyLabel("总体分布：", self)
+            self.source_combo = ComboBox(self)
+            self.source_keys = list(FAMILIES)
+            self.source_combo.addItems([FAMILIES[key][0] for key in self.source_keys])
+            self.source_combo.setCurrentIndex(self.source_keys.index('bernoulli'))
+            
+            self.controls_layout.addWidget(self.source_label, 0, 0)
+            self.controls_layout.addWidget(self.source_combo, 0, 1, 1, 2)
+            
             # n 参数设置
-            self.n_label = BodyLabel("n（实验次数）：", self)
+            self.n_label = BodyLabel("n（变量个数）：", self)
             self.n_spin = CompactSpinBox(self)
-            self.n_spin.setRange(10, 200)
+            self.n_spin.setRange(1, 10000)
             self.n_spin.setValue(50)
             self.n_slider = Slider(Qt.Horizontal, self)
-            self.n_slider.setRange(10, 200)
+            self.n_slider.setRange(1, 10000)
             self.n_slider.setSingleStep(1)
             self.n_slider.setValue(50)
             
-            self.controls_layout.addWidget(self.n_label, 0, 0)
-            self.controls_layout.addWidget(self.n_spin, 0, 1)
-            self.controls_layout.addWidget(self.n_slider, 0, 2)
+            self.controls_layout.addWidget(self.n_label, 1, 0)
+            self.controls_layout.addWidget(self.n_spin, 1, 1)
+            self.controls_layout.addWidget(self.n_slider, 1, 2)
             
             # p 参数设置
             self.p_label = BodyLabel("p（成功概率）：", self)
@@ -133,9 +274,19 @@ $\sum_{i=1}^n X_i$ 近似服从 $\mathcal{N}(n \mu, n \sigma^2)$。
             self.p_slider.setSingleStep(1)
             self.p_slider.setValue(50)
 
-            self.controls_layout.addWidget(self.p_label, 1, 0)
-            self.controls_layout.addWidget(self.p_spin, 1, 1)
-            self.controls_layout.addWidget(self.p_slider, 1, 2)
+            self.controls_layout.addWidget(self.p_label, 2, 0)
+            self.controls_layout.addWidget(self.p_spin, 2, 1)
+            self.controls_layout.addWidget(self.p_slider, 2, 2)
+            
+            # 和 / 均值切换
+            self.mean_toggle = TogglePushButton("显示和的分布", self)
+            self.controls_layout.addWidget(self.mean_toggle, 3, 0, 1, 2)
+            
+            # 模拟抽样开关与进度
+            self.simulation_toggle = TogglePushButton("开始模拟抽样", self)
+            self.simulation_label = BodyLabel("", self)
+            self.controls_layout.addWidget(self.simulation_toggle, 4, 0, 1, 2)
+            self.controls_layout.addWidget(self.simulation_label, 5, 0, 1, 3)
             
             self.flow_layout.addWidget(self.control_container)
             
@@ -155,8 +306,30 @@ $\sum_{i=1}^n X_i$ 近似服从 $\mathcal{N}(n \mu, n \sigma^2)$。
             
             self.n_spin.valueChanged.connect(lambda: self.plot_widget.update_plot(n=self.n_spin.value(), p=self.p_spin.value()))
             self.p_spin.valueChanged.connect(lambda: self.plot_widget.update_plot(n=self.n_spin.value(), p=self.p_spin.value()))
+            self.source_combo.currentIndexChanged.connect(self.on_source_changed)
+            self.mean_toggle.toggled.connect(self.on_mean_toggled)
+            self.simulation_toggle.toggled.connect(self.on_simulation_toggled)
+            self.plot_widget.statusChanged.connect(self.simulation_label.setText)
             
             cfg.themeChanged.connect(lambda: self.plot_widget.update_plot())
+        
+        def on_source_changed(self, index):
+            """切换总体分布，只有含成功概率 p 的分布才显示 p 控件"""
+            self.plot_widget.source = self.source_keys[index]
+            has_p = 'p' in default_params(self.plot_widget.source)
+            self.p_label.setVisible(has_p)
+            self.p_spin.setVisible(has_p)
+            self.p_slider.setVisible(has_p)
+            self.plot_widget.update_plot(n=self.n_spin.value(), p=self.p_spin.value())
+        
+        def on_mean_toggled(self, checked):
+            self.mean_toggle.setText("显示均值的分布" if checked else "显示和的分布")
+            self.plot_widget.show_mean = checked
+            self.plot_widget.update_plot(n=self.n_spin.value(), p=self.p_spin.value())
+        
+        def on_simulation_toggled(self, checked):
+            self.simulation_toggle.setText("停止模拟抽样" if checked else "开始模拟抽样")
+            self.plot_widget.set_simulating(checked)
 
         def resizeEvent(self, event):
             """当ExpInterface大小改变时，发送信号给PlotWidget调整大小"""
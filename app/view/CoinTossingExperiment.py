@@ -1,19 +1,25 @@
+import time
+
 from PyQt5.QtCore import Qt, pyqtSignal, QTimer
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QSizePolicy, QGridLayout
 )
 from qfluentwidgets import (
     FlowLayout, Slider, CompactDoubleSpinBox, CompactSpinBox, isDarkTheme,
-    TitleLabel, BodyLabel, ScrollArea, FluentStyleSheet
+    TitleLabel, BodyLabel, ScrollArea, FluentStyleSheet, PushButton
 )
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 import numpy as np
-import random
 
 from .ExpWidget import ExpWidget
 from ..common.MarkdownKatex import MarkdownKaTeXWidget
 from ..common.config import cfg
+from ..common.simulation import StepSeries, toss_coins
+from ..common.rng import MAX_SEED, new_seed
+from ..common.exportbutton import ExportButton
+from ..common.controls import link_log_slider
+from ..common.frequencybands import FrequencyBands
 
 class CoinTossingExperiment(ExpWidget):
     
@@ -22,12 +28,17 @@ class CoinTossingExperiment(ExpWidget):
 
 1. 投掷一枚质地均匀的硬币，观察其出现正面的频数，并同时计算出现正面的概率，分析频率的变化规律
 2. 利用图形动态演示频率的稳定性规律：随着投掷硬币次数的增加，出现正面的频率振幅越来越小，逐渐地稳定于 $\frac{1}{2}$ 。
+3. 重复次数 $K > 1$ 时同时进行 $K$ 次独立重复，画出每一步正面频率在各次重复之间的 5%、25%、50%、75%、95% 分位数带，
+并与中心极限定理给出的近似分位数 $p \pm z \sqrt{\cfrac{p(1-p)}{n}}$（虚线）比较。
+全部重复按步数分块一次生成，每块求出分位数后即丢弃，内存占用只取决于块的大小。
 """
     
     class ExpInterface(ScrollArea):
         windowResizeSignal = pyqtSignal(int, int)
         
         class PlotWidget(QWidget):
+            FRAME_BUDGET = 0.1
+            
             def __init__(self, parent=None):
                 super().__init__(parent)
                 
@@ -43,6 +54,8 @@ class CoinTossingExperiment(ExpWidget):
                 self.setLayout(self.layout)
                 
                 self.n = 100
+                self.runs = 1
+                self.bands = None
                 self.current_step = 0
                 self.animation_timer = QTimer(self)
                 self.animation_timer.timeout.connect(self.animate_plot)
@@ -51,6 +64,8 @@ class CoinTossingExperiment(ExpWidget):
                 self.heads_count = 0
                 self.total_tosses = 0
                 self.frequency_history = []
+                # 投币结果由种子决定，改变投币次数时只计算新增的部分
+                self.series = StepSeries(toss_coins, np.uint8)
                 
                 self.update_plot(self.n)
                 self.parent().windowResizeSignal.connect(self.onParentResize)
@@ -65,44 +80,61 @@ class CoinTossingExperiment(ExpWidget):
                 self.figure.set_size_inches(width / 100, height / 100)
                 self.canvas.draw()
             
-            def update_plot(self, n=None):
+            def update_plot(self, n=None, runs=None):
                 if n is None:
                     n = self.n
                 else:
                     self.n = n
+                if runs is not None:
+                    self.runs = runs
                 
-                # 重置数据
-                self.heads_count = 0
-                self.total_tosses = 0
-                self.frequency_history = []
-                self.current_step = 0
+                # 在进程池中生成投币结果，动画只按顺序读取已完成的部分；已显示的部分保持不变
+                self.series.resize(self.n)
+                self.current_step = min(self.current_step, self.n)
                 
                 # 计算每次绘制的步长（总次数的1%或至少1次）
                 self.step_size = max(1, self.n // 50)
                 
+                # 多次重复时重新计算分位数带
+                self.bands = FrequencyBands(self.series.seed, self.runs, self.n) if self.runs > 1 else None
+                if self.bands is not None:
+                    self.draw_bands()
+                elif self.current_step > 0:
+                    self.draw_frame()
+                
                 # 开始动画
                 self.animation_timer.start(20)  # 每20ms更新一次
             
+            def set_seed(self, seed):
+                """更换随机种子，从第一次投币开始重新演示"""
+                self.series.reseed(seed)
+                self.current_step = 0
+                self.update_plot()
+            
             def animate_plot(self):
                 """动画更新绘图 - 每次绘制多个点"""
+                if self.bands is not None:
+                    self.animate_bands()
+                    return
                 if self.current_step >= self.n:
                     self.animation_timer.stop()
                     return
                 
-                # 计算本次要添加的点数
-                remaining_steps = self.n - self.current_step
-                actual_step_size = min(self.step_size, remaining_steps)
-                
-                # 模拟多次投币
-                for _ in range(actual_step_size):
-                    result = random.randint(0, 1)  # 0: 反面, 1: 正面
-                    self.heads_count += result
-                    self.total_tosses += 1
-                    
-                    # 计算当前频率
-                    current_frequency = self.heads_count / self.total_tosses
-                    self.frequency_history.append(current_frequency)
-                    self.current_step += 1
+                # 计算本次要显示到的位置，结果尚未写入时等待下一次定时器回调
+                stop = min(self.current_step + self.step_size, self.series.ready())
+                if stop <= self.current_step:
+                    return
+                self.current_step = stop
+                self.draw_frame()
+            
+            def draw_frame(self):
+                """绘制前 current_step 次投币的频率曲线"""
+                stop = self.current_step
+                # 1: 正面, 0: 反面
+                tosses = self.series.head(stop)
+                self.heads_count = int(tosses.sum())
+                self.total_tosses = stop
+                self.frequency_history = np.cumsum(tosses) / np.arange(1, stop + 1)
                 
                 # 绘制图表
                 self.figure.clear()
@@ -125,6 +157,56 @@ class CoinTossingExperiment(ExpWidget):
                 
                 ax.legend()
                 
+                self.style_axes(ax)
+                self.figure.tight_layout()
+                self.canvas.draw()
+            
+            def animate_bands(self):
+                """每次定时器回调只计算约 FRAME_BUDGET 秒，保持界面响应"""
+                bands = self.bands
+                if bands.finished:
+                    self.animation_timer.stop()
+                    return
+                start = time.perf_counter()
+                while not bands.finished and time.perf_counter() - start < self.FRAME_BUDGET:
+                    bands.advance()
+                self.draw_bands()
+            
+            def draw_bands(self):
+                """绘制已完成各步的分位数带与中心极限定理给出的近似分位数"""
+                bands = self.bands
+                done = bands.done
+                x = np.arange(1, self.n + 1)
+                q05, q25, q50, q75, q95 = bands.quantiles[:, :done]
+                
+                self.figure.clear()
+                ax = self.figure.add_subplot(111)
+                
+                ax.fill_between(x[:done], q05, q95, color='tab:blue', alpha=0.2, linewidth=0, label='5% ~ 95% 分位数')
+                ax.fill_between(x[:done], q25, q75, color='tab:blue', alpha=0.4, linewidth=0, label='25% ~ 75% 分位数')
+                ax.plot(x[:done], q50, 'b-', linewidth=1.5, label='中位数')
+                
+                # 理论概率线与正态近似的分位数
+                envelope = bands.envelope(0.5)
+                ax.axhline(y=0.5, color='r', linestyle='--', label='理论概率 (0.5)', alpha=0.7)
+                ax.plot(x, envelope[0], 'r:', linewidth=1.2, label='$p \\pm z\\sqrt{p(1-p)/n}$')
+                for curve in envelope[[1, 3, 4]]:
+                    ax.plot(x, curve, 'r:', linewidth=1.2)
+                
+                ax.set_xlim(0, self.n)
+                ax.set_ylim(0, 1.1)
+                ax.set_xlabel("投币次数")
+                ax.set_ylabel("正面频率")
+                ax.set_title(f'投币实验: {self.runs} 次独立重复的频率分位数 (投币次数: {self.n})')
+                ax.text(0.02, 0.03, f'已完成 {done} / {self.n} 步', transform=ax.transAxes,
+                        color='white' if isDarkTheme() else 'black')
+                ax.legend(loc='upper right', fontsize=8)
+                
+                self.style_axes(ax)
+                self.figure.tight_layout()
+                self.canvas.draw()
+            
+            def style_axes(self, ax):
                 ax.patch.set_alpha(0.1)
                 if isDarkTheme():
                     for spine in ax.spines.values():
@@ -143,9 +225,6 @@ class CoinTossingExperiment(ExpWidget):
                     ax.set_title(ax.get_title(), color='black')
                     ax.grid(True, alpha=0.7)
                 
-                self.figure.tight_layout()
-                self.canvas.draw()
-                
         def __init__(self, parent=None):
             super().__init__(parent)
             self.flow_layout = FlowLayout(self)
@@ -168,16 +247,52 @@ class CoinTossingExperiment(ExpWidget):
             self.controls_layout.addWidget(self.n_spin, 0, 1)
             self.controls_layout.addWidget(self.n_slider, 0, 2)
             
+            # 随机种子，相同的种子得到相同的投币序列
+            self.seed_label = BodyLabel("随机种子：", self)
+            self.seed_spin = CompactSpinBox(self)
+            self.seed_spin.setRange(0, MAX_SEED)
+            self.seed_button = PushButton("换一个", self)
+            
+            self.controls_layout.addWidget(self.seed_label, 1, 0)
+            self.controls_layout.addWidget(self.seed_spin, 1, 1)
+            self.controls_layout.addWidget(self.seed_button, 1, 2)
+            
+            # 独立重复次数，大于 1 时显示各步频率的分位数带；跨越多个数量级，滑块取 10 倍的常用对数
+            self.runs_label = BodyLabel("K（重复次数）：", self)
+            self.runs_spin = CompactSpinBox(self)
+            self.runs_spin.setRange(1, 10000)
+            self.runs_spin.setValue(1)
+            self.runs_slider = Slider(Qt.Horizontal, self)
+            self.runs_slider.setRange(0, 40)
+            self.runs_slider.setSingleStep(1)
+            self.runs_slider.setValue(0)
+            
+            self.controls_layout.addWidget(self.runs_label, 2, 0)
+            self.controls_layout.addWidget(self.runs_spin, 2, 1)
+            self.controls_layout.addWidget(self.runs_slider, 2, 2)
+            
+            # 导出当前种子下的全部投币记录
+            self.export_button = ExportButton(
+                lambda: ('coin_tossing_experiment', self.plot_widget.n, self.plot_widget.series.seed, None),
+                'coin_tosses.csv', self
+            )
+            self.controls_layout.addWidget(self.export_button, 3, 0, 1, 3)
+            
             self.flow_layout.addWidget(self.control_container)
             
             # 绘图区域
             self.plot_widget = self.PlotWidget(self)
             self.flow_layout.addWidget(self.plot_widget)
+            self.seed_spin.setValue(self.plot_widget.series.seed)
                         
             # 连接信号
             self.n_spin.valueChanged.connect(self.n_slider.setValue)
             self.n_slider.valueChanged.connect(self.n_spin.setValue)
             self.n_spin.valueChanged.connect(lambda: self.plot_widget.update_plot(n=self.n_spin.value()))
+            link_log_slider(self.runs_spin, self.runs_slider)
+            self.runs_spin.valueChanged.connect(lambda: self.plot_widget.update_plot(runs=self.runs_spin.value()))
+            self.seed_spin.valueChanged.connect(self.plot_widget.set_seed)
+            self.seed_button.clicked.connect(lambda: self.seed_spin.setValue(new_seed()))
             
             cfg.themeChanged.connect(lambda: self.plot_widget.update_plot())
             
@@ -4,16 +4,19 @@ from PyQt5.QtWidgets import (
 )
 from qfluentwidgets import (
     FlowLayout, Slider, CompactDoubleSpinBox, CompactSpinBox, isDarkTheme,
-    TitleLabel, BodyLabel, ScrollArea, FluentStyleSheet
+    TitleLabel, BodyLabel, ScrollArea, FluentStyleSheet, PushButton
 )
 from matplotlib.figure import Figure
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from scipy.stats import norm
 import numpy as np
 
 from .ExpWidget import ExpWidget
 from ..common.MarkdownKatex import MarkdownKaTeXWidget
 from ..common.config import cfg
+from ..common.simulation import SharedJob, normal_sample_means, MEANS_BLOCK_STEPS
+from ..common.framecache import CachedCanvas
+from ..common.rng import MAX_SEED, new_seed
+from ..common.exportbutton import ExportButton
 
 class ConsistencyOfPointEstimation(ExpWidget):
     
@@ -40,7 +43,8 @@ $$
                 self.figure = Figure(figsize=(8, 6), dpi=100)
                 self.figure.patch.set_facecolor("none")
                 self.figure.patch.set_edgecolor("none")
-                self.canvas = FigureCanvas(self.figure)
+                # 每次更新都要重新模拟，来回拖动滑块时复用已渲染的图像
+                self.canvas = CachedCanvas(self.figure, self.update_plot)
                 self.canvas.setStyleSheet("background: transparent;")
                 self.canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
                 
@@ -51,6 +55,7 @@ $$
                 self.mu = 0
                 self.sigma = 1
                 self.n = 30
+                self.seed = new_seed()
                 
                 self.update_plot(self.mu, self.sigma, self.n)
                 self.parent().windowResizeSignal.connect(self.onParentResize)
@@ -65,18 +70,38 @@ $$
                 self.figure.set_size_inches(width / 100, height / 100)
                 self.canvas.draw()
             
-            def update_plot(self, mu=None, sigma=None, n=None):
+            def simulation_shape(self):
+                """各子图的样本量及其重复次数"""
+                n = self.n
+                sample_sizes = [2, n//4, n//2, n//4*3, n]
+                sample_sizes = sorted(list(set([max(2, s) for s in sample_sizes])))
+                trials = [min(1000, max(100, 2000 // size)) for size in sample_sizes]
+                return sample_sizes, trials
+            
+            def export_source(self):
+                """导出全部重复的各样本量样本均值，前 trials[i] 行即第 i 个子图中的数据"""
+                sample_sizes, trials = self.simulation_shape()
+                params = {'mu': self.mu, 'sigma': self.sigma, 'sizes': sample_sizes}
+                return 'consistency_of_point_estimation', max(trials), self.seed, params
+            
+            def update_plot(self, mu=None, sigma=None, n=None, seed=None):
                 if mu is None:
                     mu = self.mu
                 if sigma is None:
                     sigma = self.sigma
                 if n is None:
                     n = self.n
+                if seed is None:
+                    seed = self.seed
+                self.mu, self.sigma, self.n, self.seed = mu, sigma, n, seed
+                
+                key = self.canvas.key('consistency_of_point_estimation', mu, sigma, n, seed)
+                if self.canvas.show_cached(key):
+                    return
                 
                 self.figure.clear()
                 
-                sample_sizes = [2, n//4, n//2, n//4*3, n]
-                sample_sizes = sorted(list(set([max(2, s) for s in sample_sizes])))
+                sample_sizes, trials = self.simulation_shape()
                 
                 axes = []
                 for i in range(len(sample_sizes)):
@@ -90,15 +115,17 @@ $$
                 
                 colors = ['red', 'green', 'blue', 'orange', 'purple']
                 
+                # 各样本量的模拟在进程池中并行完成，第 i 列为样本量 sample_sizes[i] 的样本均值；
+                # 重复次数至多 1000，随机数流按 MEANS_BLOCK_STEPS 行分块以便分给多个工作进程
+                job = SharedJob(normal_sample_means, (max(trials), len(sample_sizes)), float,
+                                args=(mu, sigma, sample_sizes), seed=seed, block_steps=MEANS_BLOCK_STEPS)
+                means = job.wait().copy()
+                job.release()
+                
                 for i, size in enumerate(sample_sizes):
                     ax = axes[i]
                     
-                    estimates = []
-                    n_trials = min(1000, max(100, 2000 // size))
-                    for _ in range(n_trials):
-                        sample = np.random.normal(mu, sigma, size)
-                        sample_mean = np.mean(sample)
-                        estimates.append(sample_mean)
+                    estimates = means[:trials[i], i]
                     
                     ax.hist(estimates, bins=30, density=True, alpha=0.6, 
                         color=colors[i % len(colors)], edgecolor='black', linewidth=0.5,
@@ -137,6 +164,7 @@ $$
                 
                 self.figure.tight_layout()
                 self.canvas.draw()
+                self.canvas.store(key)
 
         def __init__(self, parent=None):
             super().__init__(parent)
@@ -187,10 +215,24 @@ $$
             self.controls_layout.addWidget(self.n_spin, 2, 1)
             self.controls_layout.addWidget(self.n_slider, 2, 2)
             
+            # 随机种子，相同的参数与种子得到相同的模拟结果
+            self.seed_label = BodyLabel("随机种子：", self)
+            self.seed_spin = CompactSpinBox(self)
+            self.seed_spin.setRange(0, MAX_SEED)
+            self.seed_button = PushButton("换一个", self)
+            
+            self.controls_layout.addWidget(self.seed_label, 3, 0)
+            self.controls_layout.addWidget(self.seed_spin, 3, 1)
+            self.controls_layout.addWidget(self.seed_button, 3, 2)
+            
+            self.export_button = ExportButton(lambda: self.plot_widget.export_source(), 'sample_means.csv', self)
+            self.controls_layout.addWidget(self.export_button, 4, 0, 1, 3)
+            
             self.flow_layout.addWidget(self.control_container)
             
             self.plot_widget = self.PlotWidget(self)
             self.flow_layout.addWidget(self.plot_widget)
+            self.seed_spin.setValue(self.plot_widget.seed)
                         
             self.mu_spin.valueChanged.connect(lambda value: self.mu_slider.setValue(value * 100))
             self.mu_slider.valueChanged.connect(lambda value: self.mu_spin.setValue(value / 100))
@@ -217,6 +259,8 @@ $$
                 mu=self.mu_spin.value(), 
                 sigma=self.sigma_spin.value(), 
                 n=self.n_spin.value()))
+            self.seed_spin.valueChanged.connect(lambda: self.plot_widget.update_plot(seed=self.seed_spin.value()))
+            self.seed_button.clicked.connect(lambda: self.seed_spin.setValue(new_seed()))
             
             cfg.themeChanged.connect(lambda: self.plot_widget.update_plot(
                 mu=self.mu_spin.value(), 
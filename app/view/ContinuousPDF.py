@@ -5,7 +5,7 @@ from PyQt5.QtWidgets import (
 from qfluentwidgets import (
     FlowLayout, Slider, CompactDoubleSpinBox, CompactSpinBox, isDarkTheme,
     TitleLabel, BodyLabel, ScrollArea, FluentStyleSheet, ComboBox,
-    TeachingTip, InfoBarIcon
+    TeachingTip, InfoBarIcon, TogglePushButton
 )
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
@@ -15,6 +15,8 @@ import numpy as np
 from .ExpWidget import ExpWidget
 from ..common.MarkdownKatex import MarkdownKaTeXWidget
 from ..common.config import cfg
+from ..common.distributions import ppf_table, freeze, FAMILY_SWEEPS
+from ..common.plotting import add_curve_family
 
 
 class ContinuousPDF(ExpWidget):
@@ -164,6 +166,15 @@ $$F(x) = I_x(\alpha, \beta)$$
                 self.distribution_type = 'normal'
                 self.params = {'mu': 0, 'sigma': 1}
                 
+                # 分位数标记：'lower' 为下侧分位数，'two_sided' 为双侧临界值
+                self.quantile_level = 0.95
+                self.quantile_mode = 'lower'
+                self.quantile_lines = []
+                
+                # 曲线族模式：同时绘制参数扫描得到的一族密度曲线
+                self.family_mode = False
+                self.family_size = 100
+                
                 # Add a timer to debounce error messages
                 self.error_timer = QTimer()
                 self.error_timer.setSingleShot(True)
@@ -184,10 +195,13 @@ $$F(x) = I_x(\alpha, \beta)$$
             def update_plot(self):
                 try:
                     self.figure.clear()
+                    self.quantile_lines = []
                     ax = self.figure.add_subplot(111)
                     
                     # 根据分布类型绘制相应的图形
-                    if self.distribution_type == 'uniform':
+                    if self.family_mode:
+                        self._plot_family(ax)
+                    elif self.distribution_type == 'uniform':
                         # 均匀分布
                         a = self.params.get('a', 0)
                         b = self.params.get('b', 1)
@@ -281,21 +295,21 @@ $$F(x) = I_x(\alpha, \beta)$$
                     elif self.distribution_type == 'gamma':
                         # 伽马分布
                         alpha = self.params.get('alpha', 2)
-                        beta = self.params.get('beta', 1)
+                        beta_ = self.params.get('beta', 1)
                         
                         # 参数验证
-                        if alpha <= 0 or beta <= 0:
+                        if alpha <= 0 or beta_ <= 0:
                             raise ValueError("伽马分布参数错误：形状参数α和速率参数β都必须大于0")
                         
                         # 定义x范围
                         x = np.linspace(0, 10, 1000)
                         
                         # PDF
-                        pdf_values = gamma.pdf(x, a=alpha, scale=1/beta)
+                        pdf_values = gamma.pdf(x, a=alpha, scale=1/beta_)
                         ax.plot(x, pdf_values, label='PDF', color='blue', linewidth=2)
                         
                         # CDF
-                        cdf_values = gamma.cdf(x, a=alpha, scale=1/beta)
+                        cdf_values = gamma.cdf(x, a=alpha, scale=1/beta_)
                         ax.plot(x, cdf_values, label='CDF', color='red', linewidth=2)
                         
                         ax.set_xlim(0, 10)
@@ -304,26 +318,27 @@ $$F(x) = I_x(\alpha, \beta)$$
                     elif self.distribution_type == 'beta':
                         # 贝塔分布
                         alpha = self.params.get('alpha', 2)
-                        beta = self.params.get('beta', 5)
+                        beta_ = self.params.get('beta', 5)
                         
                         # 参数验证
-                        if alpha <= 0 or beta <= 0:
+                        if alpha <= 0 or beta_ <= 0:
                             raise ValueError("贝塔分布参数错误：形状参数α和β都必须大于0")
                         
                         # 定义x范围
                         x = np.linspace(0, 1, 1000)
                         
                         # PDF
-                        pdf_values = beta.pdf(x, a=alpha, b=beta)
+                        pdf_values = beta.pdf(x, a=alpha, b=beta_)
                         ax.plot(x, pdf_values, label='PDF', color='blue', linewidth=2)
                         
                         # CDF
-                        cdf_values = beta.cdf(x, a=alpha, b=beta)
+                        cdf_values = beta.cdf(x, a=alpha, b=beta_)
                         ax.plot(x, cdf_values, label='CDF', color='red', linewidth=2)
                         
                         ax.set_xlim(0, 1)
                         ax.set_ylim(0, max(1, max(pdf_values)) * 1.1)
                     
+                    self._draw_quantile_markers(ax)
                     ax.patch.set_alpha(0.1)
                     
                     if isDarkTheme():
@@ -357,6 +372,69 @@ $$F(x) = I_x(\alpha, \beta)$$
                     self._show_error_message(f"绘图过程中出现错误: {str(e)}")
                     self.canvas.draw()  # 确保画布仍然更新，即使出错
                 
+            def _plot_family(self, ax):
+                """曲线族模式：一次广播计算整族密度曲线，并作为单个 LineCollection 绘制"""
+                param, lo, hi, symbol = FAMILY_SWEEPS[self.distribution_type]
+                if self.distribution_type == 'uniform':
+                    lo, hi = self.params['a'] + lo, self.params['a'] + hi
+                values = np.linspace(lo, hi, self.family_size)
+                
+                current = freeze(self.distribution_type, self.params)
+                ends = [freeze(self.distribution_type, {**self.params, param: v}) for v in (lo, hi)]
+                x_min = min(d.ppf(0.005) for d in ends + [current])
+                x_max = max(d.isf(0.005) for d in ends + [current])
+                x = np.linspace(x_min, x_max, 500)
+                
+                # (参数个数 × x 点数) 的密度矩阵由一次广播调用得到
+                family = freeze(self.distribution_type, {**self.params, param: values[:, None]})
+                Y = family.pdf(x[None, :])
+                collection = add_curve_family(ax, x, Y, values)
+                color = 'white' if isDarkTheme() else 'black'
+                ax.plot(x, current.pdf(x), label='当前参数', color=color, linewidth=2)
+                
+                # 形状参数较小时密度在端点趋于无穷，用峰值的中位数限制纵轴
+                peaks = np.nanmax(np.where(np.isfinite(Y), Y, np.nan), axis=1)
+                ax.set_xlim(x_min, x_max)
+                ax.set_ylim(0, min(np.nanmax(peaks), 3 * np.nanmedian(peaks)) * 1.1)
+                
+                cb = self.figure.colorbar(collection, ax=ax)
+                cb.set_label(symbol, color=color)
+                cb.ax.yaxis.set_tick_params(color=color)
+                cb.outline.set_edgecolor(color)
+                for text in cb.ax.get_yticklabels():
+                    text.set_color(color)
+            
+            def quantile_values(self):
+                """由缓存的逆分布函数查找表返回当前概率水平对应的分位数或双侧临界值"""
+                table = ppf_table(self.distribution_type, self.params)
+                if self.quantile_mode == 'two_sided':
+                    return table.critical_values(1 - self.quantile_level)
+                return (table.quantile(self.quantile_level),)
+            
+            def set_quantile(self, level, mode):
+                """更新概率水平，只移动标记线而不重新计算和绘制分布曲线"""
+                self.quantile_level = level
+                self.quantile_mode = mode
+                if self.quantile_lines:
+                    self._move_quantile_markers()
+                    self.canvas.draw_idle()
+            
+            def _draw_quantile_markers(self, ax):
+                self.quantile_lines = [
+                    ax.axvline(0, color='green', linestyle='--', linewidth=1.5, label='分位数'),
+                    ax.axvline(0, color='green', linestyle='--', linewidth=1.5),
+                ]
+                self._move_quantile_markers()
+            
+            def _move_quantile_markers(self):
+                values = self.quantile_values()
+                for i, line in enumerate(self.quantile_lines):
+                    if i < len(values):
+                        line.set_xdata([values[i], values[i]])
+                        line.set_visible(True)
+                    else:
+                        line.set_visible(False)
+                
             def _show_error_message(self, message):
                 """Show error message using Flyout with debouncing"""
                 import time
@@ -524,6 +602,31 @@ $$F(x) = I_x(\alpha, \beta)$$
             self.beta_beta_slider.setSingleStep(1)
             self.beta_beta_slider.setValue(50)
             
+            # 分位数面板
+            self.q_label = BodyLabel("p（概率水平）：", self)
+            self.q_spin = CompactDoubleSpinBox(self)
+            self.q_spin.setDecimals(3)
+            self.q_spin.setRange(0.001, 0.999)
+            self.q_spin.setSingleStep(0.001)
+            self.q_spin.setValue(0.95)
+            self.q_slider = Slider(Qt.Horizontal, self)
+            self.q_slider.setRange(1, 999)
+            self.q_slider.setSingleStep(1)
+            self.q_slider.setValue(950)
+            self.q_mode_toggle = TogglePushButton("下侧分位数", self)
+            self.q_value_label = BodyLabel("", self)
+            
+            # 曲线族模式
+            self.family_toggle = TogglePushButton("曲线族模式", self)
+            self.family_size_label = BodyLabel("曲线条数：", self)
+            self.family_size_spin = CompactSpinBox(self)
+            self.family_size_spin.setRange(50, 200)
+            self.family_size_spin.setValue(100)
+            self.family_size_slider = Slider(Qt.Horizontal, self)
+            self.family_size_slider.setRange(50, 200)
+            self.family_size_slider.setSingleStep(1)
+            self.family_size_slider.setValue(100)
+            
             # 添加所有控件到布局中，但初始时隐藏不需要的控件
             self.control_layout.addWidget(self.dist_label, 0, 0)
             self.control_layout.addWidget(self.dist_combo, 0, 1, 1, 2)
@@ -570,6 +673,20 @@ $$F(x) = I_x(\alpha, \beta)$$
             self.control_layout.addWidget(self.beta_beta_spin, 10, 1)
             self.control_layout.addWidget(self.beta_beta_slider, 10, 2)
             
+            # 分位数控件，不随分布类型切换而隐藏
+            self.quantile_row = 11
+            self.control_layout.addWidget(self.q_label, 11, 0)
+            self.control_layout.addWidget(self.q_spin, 11, 1)
+            self.control_layout.addWidget(self.q_slider, 11, 2)
+            self.control_layout.addWidget(self.q_mode_toggle, 12, 0)
+            self.control_layout.addWidget(self.q_value_label, 12, 1, 1, 2)
+            
+            # 曲线族控件
+            self.control_layout.addWidget(self.family_toggle, 13, 0)
+            self.control_layout.addWidget(self.family_size_label, 14, 0)
+            self.control_layout.addWidget(self.family_size_spin, 14, 1)
+            self.control_layout.addWidget(self.family_size_slider, 14, 2)
+            
             # 初始时只显示正态分布控件
             self.show_only_normal_controls()
             
@@ -585,6 +702,7 @@ $$F(x) = I_x(\alpha, \beta)$$
             self.flow_layout.addWidget(self.plot_widget)
             
             cfg.themeChanged.connect(lambda: self.plot_widget.update_plot())
+            self.refresh_quantile_label()
             
         def setup_connections(self):
             # 均匀分布连接
@@ -666,10 +784,47 @@ $$F(x) = I_x(\alpha, \beta)$$
             self.beta_gamma_spin.valueChanged.connect(self.update_parameters)
             self.alpha_beta_spin.valueChanged.connect(self.update_parameters)
             self.beta_beta_spin.valueChanged.connect(self.update_parameters)
+            
+            # 分位数面板连接
+            self.q_spin.valueChanged.connect(
+                lambda: self.q_slider.setValue(int(round(self.q_spin.value() * 1000)))
+            )
+            self.q_slider.valueChanged.connect(
+                lambda: self.q_spin.setValue(self.q_slider.value() / 1000)
+            )
+            self.q_spin.valueChanged.connect(self.update_quantile)
+            self.q_mode_toggle.toggled.connect(self.on_quantile_mode_toggled)
+            
+            # 曲线族连接
+            self.family_size_spin.valueChanged.connect(self.family_size_slider.setValue)
+            self.family_size_slider.valueChanged.connect(self.family_size_spin.setValue)
+            self.family_size_spin.valueChanged.connect(self.update_family)
+            self.family_toggle.toggled.connect(self.update_family)
+        
+        def update_family(self):
+            self.plot_widget.family_mode = self.family_toggle.isChecked()
+            self.plot_widget.family_size = self.family_size_spin.value()
+            self.plot_widget.update_plot()
+        
+        def on_quantile_mode_toggled(self, checked):
+            self.q_mode_toggle.setText("双侧临界值" if checked else "下侧分位数")
+            self.update_quantile()
+        
+        def update_quantile(self):
+            mode = 'two_sided' if self.q_mode_toggle.isChecked() else 'lower'
+            self.plot_widget.set_quantile(self.q_spin.value(), mode)
+            self.refresh_quantile_label()
+        
+        def refresh_quantile_label(self):
+            try:
+                values = self.plot_widget.quantile_values()
+                self.q_value_label.setText("x = " + ", ".join(f"{v:.6g}" for v in values))
+            except ValueError:
+                self.q_value_label.setText("")
         
         def hide_all_param_controls(self):
-            # 隐藏所有参数控件
-            for i in range(1, self.control_layout.rowCount()):
+            # 隐藏所有参数控件（分位数面板除外）
+            for i in range(1, self.quantile_row):
                 for j in range(self.control_layout.columnCount()):
                     item = self.control_layout.itemAtPosition(i, j)
                     if item and item.widget():
@@ -791,6 +946,7 @@ $$F(x) = I_x(\alpha, \beta)$$
                     self.plot_widget.params = {'alpha': alpha, 'beta': beta}
                 
                 self.plot_widget.update_plot()
+                self.refresh_quantile_label()
             except ValueError as ve:
                 self.plot_widget._show_error_message(str(ve))
             except Exception as e:
@@ -0,0 +1,271 @@
+import os
+
+from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QSizePolicy, QGridLayout, QFileDialog
+)
+from qfluentwidgets import (
+    FlowLayout, Slider, CompactSpinBox, isDarkTheme, TitleLabel, BodyLabel, ScrollArea,
+    FluentStyleSheet, PushButton, ProgressBar, TeachingTip, InfoBarIcon
+)
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+import numpy as np
+
+from .ExpWidget import ExpWidget
+from ..common.MarkdownKatex import MarkdownKaTeXWidget
+from ..common.config import cfg
+from ..common.distributions import FAMILIES, freeze, is_discrete
+from ..common.workers import DataLoader
+
+class DataFitting(ExpWidget):
+
+    desc = r"""
+# 经验数据的分布拟合
+导入一列观测值 $x_1, x_2, \ldots, x_N$，对各常见分布求参数的**极大似然估计**，并按赤池信息准则
+$$
+\text{AIC} = 2k - 2 \ln L(\hat\theta)
+$$
+从小到大排序（$k$ 为参数个数），AIC 越小拟合越好。
+
+许多分布的似然函数只通过少数**充分统计量**依赖于样本，例如正态分布只依赖于 $\sum x_i$ 与 $\sum x_i^2$，
+伽马分布只依赖于 $\sum x_i$ 与 $\sum \ln x_i$，贝塔分布只依赖于 $\sum \ln x_i$ 与 $\sum \ln (1 - x_i)$。
+程序分块读取文件，一遍扫描中只累积这些统计量与一个固定分箱数的直方图，内存占用与文件大小无关，可以处理 $10^8$ 个数值。
+没有低维充分统计量的分布（t 分布、负二项分布）在直方图上做分箱极大似然估计。
+
+支持的文件格式：CSV / 文本文件（取第一列，表头与无法解析的行自动跳过）、NumPy 的 .npy 文件、
+以及按小端 float64 存储的原始二进制文件（.bin、.f64、.dat）。
+"""
+
+    class ExpInterface(ScrollArea):
+        windowResizeSignal = pyqtSignal(int, int)
+        
+        class PlotWidget(QWidget):
+            def __init__(self, parent=None):
+                super().__init__(parent)
+                
+                self.figure = Figure(figsize=(8, 6), dpi=100)
+                self.figure.patch.set_facecolor("none")
+                self.figure.patch.set_edgecolor("none")
+                self.canvas = FigureCanvas(self.figure)
+                self.canvas.setStyleSheet("background: transparent;")
+                self.canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+                
+                self.layout = QVBoxLayout(self)
+                self.layout.addWidget(self.canvas)
+                self.setLayout(self.layout)
+                
+                self.summary = None
+                self.fits = []
+                self.shown = 3
+                self.name = ''
+                
+                self.update_plot()
+                self.parent().windowResizeSignal.connect(self.onParentResize)
+            
+            def onParentResize(self, parent_width, parent_height):
+                """响应父控件大小变化"""
+                available_width = max(parent_width - 100, 400)
+                max_width = 800
+                width = min(available_width, max_width)
+                height = width * 3 / 4
+                
+                self.figure.set_size_inches(width / 100, height / 100)
+                self.canvas.draw()
+            
+            def update_plot(self, summary=None, fits=None, name=None, shown=None):
+                if summary is not None:
+                    self.summary = summary
+                    self.fits = fits
+                    self.name = name
+                if shown is not None:
+                    self.shown = shown
+                
+                self.figure.clear()
+                ax = self.figure.add_subplot(111)
+                color = 'white' if isDarkTheme() else 'black'
+                
+                if self.summary is None:
+                    ax.text(0.5, 0.5, '请导入数据文件', transform=ax.transAxes, color=color,
+                            horizontalalignment='center', verticalalignment='center', fontsize=14)
+                    ax.set_xticks([])
+                    ax.set_yticks([])
+                else:
+                    self.draw_fits(ax)
+                
+                ax.patch.set_alpha(0.1)
+                for spine in ax.spines.values():
+                    spine.set_color(color)
+                ax.tick_params(colors=color, which='both')
+                ax.grid(True, alpha=0.3 if isDarkTheme() else 0.7)
+                ax.set_title(f'经验分布与极大似然拟合{": " + self.name if self.name else ""}', color=color)
+                
+                self.figure.tight_layout()
+                self.canvas.draw()
+            
+            def draw_fits(self, ax):
+                summary = self.summary
+                histogram = summary.histogram
+                edges, width = histogram.edges, histogram.width
+                
+                # 只显示有数据的分箱范围
+                used = np.flatnonzero(histogram.counts)
+                lo, hi = edges[used[0]], edges[used[-1] + 1]
+                ax.stairs(histogram.counts / (summary.count * width), edges, fill=True, alpha=0.5,
+                          color='tab:blue', label=f'经验分布（N = {summary.count:,}）')
+                
+                x = np.linspace(lo, hi, 1000)
+                for rank, (dist_type, params, _, aic) in enumerate(self.fits[:self.shown]):
+                    dist = freeze(dist_type, params)
+                    values = ', '.join(f'{k}={v:.4g}' for k, v in params.items())
+                    label = f'{FAMILIES[dist_type][0]} ({values}), AIC={aic:,.0f}'
+                    style = dict(linewidth=2 if rank == 0 else 1.2, linestyle='-' if rank == 0 else '--', label=label)
+                    if is_discrete(dist_type):
+                        # 离散分布画出每个分箱内的概率除以箱宽
+                        ax.stairs(np.diff(dist.cdf(edges)) / width, edges, **style)
+                    else:
+                        ax.plot(x, dist.pdf(x), **style)
+                
+                ax.set_xlim(lo, hi)
+                ax.legend(loc='upper right', fontsize=8)
+                color = 'white' if isDarkTheme() else 'black'
+                ax.set_xlabel('$x$', color=color)
+                ax.set_ylabel('密度', color=color)
+        
+        def __init__(self, parent=None):
+            super().__init__(parent)
+            self.flow_layout = FlowLayout(self)
+            
+            self.control_container = QWidget()
+            self.control_container.setFixedWidth(400)
+            self.controls_layout = QGridLayout(self.control_container)
+            
+            # 导入数据与读取进度
+            self.import_button = PushButton("导入数据…", self)
+            self.progress_bar = ProgressBar(self)
+            self.progress_bar.setRange(0, 1000)
+            self.progress_label = BodyLabel("", self)
+            
+            self.controls_layout.addWidget(self.import_button, 0, 0, 1, 3)
+            self.controls_layout.addWidget(self.progress_bar, 1, 0, 1, 3)
+            self.controls_layout.addWidget(self.progress_label, 2, 0, 1, 3)
+            
+            # 叠加显示的拟合个数
+            self.shown_label = BodyLabel("显示前几个拟合：", self)
+            self.shown_spin = CompactSpinBox(self)
+            self.shown_spin.setRange(1, len(FAMILIES))
+            self.shown_spin.setValue(3)
+            self.shown_slider = Slider(Qt.Horizontal, self)
+            self.shown_slider.setRange(1, len(FAMILIES))
+            self.shown_slider.setSingleStep(1)
+            self.shown_slider.setValue(3)
+            
+            self.controls_layout.addWidget(self.shown_label, 3, 0)
+            self.controls_layout.addWidget(self.shown_spin, 3, 1)
+            self.controls_layout.addWidget(self.shown_slider, 3, 2)
+            
+            # 全部拟合结果
+            self.result_label = BodyLabel("", self)
+            self.result_label.setWordWrap(True)
+            self.controls_layout.addWidget(self.result_label, 4, 0, 1, 3)
+            
+            self.flow_layout.addWidget(self.control_container)
+            
+            # 绘图区域
+            self.plot_widget = self.PlotWidget(self)
+            self.flow_layout.addWidget(self.plot_widget)
+            
+            self.loader = None
+            
+            # 连接信号
+            self.shown_spin.valueChanged.connect(self.shown_slider.setValue)
+            self.shown_slider.valueChanged.connect(self.shown_spin.setValue)
+            
+            self.import_button.clicked.connect(self.import_data)
+            self.shown_spin.valueChanged.connect(lambda: self.plot_widget.update_plot(shown=self.shown_spin.value()))
+            
+            cfg.themeChanged.connect(lambda: self.plot_widget.update_plot())
+        
+        def import_data(self):
+            path, _ = QFileDialog.getOpenFileName(
+                self, "导入数据", "", "数据文件 (*.csv *.txt *.npy *.bin *.f64 *.dat);;所有文件 (*)"
+            )
+            if path:
+                self.load(path)
+        
+        def load(self, path):
+            """在后台线程中读取文件，读取期间界面只显示进度"""
+            if self.loader is not None:
+                self.loader.stop()
+                self.loader.deleteLater()
+            self.path = path
+            self.progress_bar.setValue(0)
+            self.progress_label.setText(f"正在读取 {os.path.basename(path)}…")
+            self.loader = DataLoader(path, self)
+            self.loader.progress.connect(self.on_progress)
+            self.loader.loaded.connect(self.on_loaded)
+            self.loader.failed.connect(self.on_failed)
+            self.loader.start()
+        
+        def on_progress(self, count, permille):
+            # 忽略已被替换的旧线程发出的信号
+            if self.sender() is not self.loader:
+                return
+            self.progress_bar.setValue(permille)
+            self.progress_label.setText(f"已读取 {count:,} 个数值")
+        
+        def on_loaded(self, summary, fits):
+            if self.sender() is not self.loader:
+                return
+            self.progress_bar.setValue(1000)
+            text = f"有效数值 {summary.count:,} 个"
+            if summary.skipped:
+                text += f"，跳过 {summary.skipped:,} 个缺失值"
+            self.progress_label.setText(text)
+            self.result_label.setText('\n'.join(
+                f"{rank + 1}. {FAMILIES[dist_type][0]}：AIC = {aic:,.1f}"
+                for rank, (dist_type, _, _, aic) in enumerate(fits)
+            ))
+            self.plot_widget.update_plot(summary, fits, os.path.basename(self.path), self.shown_spin.value())
+        
+        def on_failed(self, message):
+            if self.sender() is not self.loader:
+                return
+            self.progress_label.setText("")
+            TeachingTip.create(
+                target=self.import_button,
+                icon=InfoBarIcon.ERROR,
+                title='导入失败',
+                content=message,
+                isClosable=True
+            )
+        
+        def resizeEvent(self, event):
+            super().resizeEvent(event)
+            current_size = event.size()
+            self.windowResizeSignal.emit(current_size.width(), current_size.height())
+            event.accept()
+    
+    def __init__(self, parent=None):
+        # 创建工厂函数用于懒加载
+        def create_description_interface():
+            descriptionInterface = MarkdownKaTeXWidget()
+            descriptionInterface.set_markdown(self.desc)
+            return descriptionInterface
+        
+        def create_experiment_interface():
+            scroll_area = ScrollArea()
+            experimentInterface = DataFitting.ExpInterface()
+            scroll_area.setWidget(experimentInterface)
+            scroll_area.setWidgetResizable(True)
+            scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+            scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+            FluentStyleSheet.NAVIGATION_INTERFACE.apply(scroll_area)
+            return scroll_area
+        
+        super().__init__(
+            '经验数据的分布拟合',
+            descriptionFactory=create_description_interface,
+            experimentFactory=create_experiment_interface,
+            parent=parent
+        )
@@ -4,16 +4,19 @@ from PyQt5.QtWidgets import (
 )
 from qfluentwidgets import (
     FlowLayout, Slider, CompactDoubleSpinBox, CompactSpinBox, isDarkTheme,
-    TitleLabel, BodyLabel, ScrollArea, FluentStyleSheet, TogglePushButton
+    TitleLabel, BodyLabel, ScrollArea, FluentStyleSheet, TogglePushButton,
+    PushButton
 )
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 import numpy as np
-import random
 
 from .ExpWidget import ExpWidget
 from ..common.MarkdownKatex import MarkdownKaTeXWidget
 from ..common.config import cfg
+from ..common.simulation import StepSeries, roll_dice
+from ..common.rng import MAX_SEED, new_seed
+from ..common.exportbutton import ExportButton
 
 class DiceRollingExperiment(ExpWidget):
     
@@ -54,6 +57,8 @@ class DiceRollingExperiment(ExpWidget):
                 self.less_than_4_history = []  # 记录点数<4的频率历史
                 self.equal_to_5_history = []   # 记录点数=5的频率历史
                 self.means = []                # 记录平均值历史
+                # 点数由种子决定，改变试验次数时只计算新增的部分
+                self.series = StepSeries(roll_dice, np.uint8)
                 
                 self.update_plot(self.n)
                 self.parent().windowResizeSignal.connect(self.onParentResize)
@@ -74,48 +79,51 @@ class DiceRollingExperiment(ExpWidget):
                 else:
                     self.n = n
                 
-                # 重置数据
-                self.counts = [0] * 6
-                self.less_than_4_history = []
-                self.equal_to_5_history = []
-                self.means = []
-                self.current_step = 0
+                # 在进程池中生成点数，动画只按顺序读取已完成的部分；已显示的部分保持不变
+                self.series.resize(self.n)
+                self.current_step = min(self.current_step, self.n)
                 
                 # 计算每次绘制的步长（总次数的1%或至少1次）
                 self.step_size = max(1, self.n // 50)
                 
+                if self.current_step > 0:
+                    self.draw_frame()
+                
                 # 开始动画
                 self.animation_timer.start(20)  # 每20ms更新一次
             
+            def set_seed(self, seed):
+                """更换随机种子，从第一次试验开始重新演示"""
+                self.series.reseed(seed)
+                self.current_step = 0
+                self.update_plot()
+            
             def animate_plot(self):
                 """动画更新绘图 - 每次绘制多个点"""
                 if self.current_step >= self.n:
                     self.animation_timer.stop()
                     return
                 
-                # 计算本次要添加的点数
-                remaining_steps = self.n - self.current_step
-                actual_step_size = min(self.step_size, remaining_steps)
+                # 计算本次要显示到的位置，结果尚未写入时等待下一次定时器回调
+                stop = min(self.current_step + self.step_size, self.series.ready())
+                if stop <= self.current_step:
+                    return
+                self.current_step = stop
+                self.draw_frame()
+            
+            def draw_frame(self):
+                """绘制前 current_step 次试验的频率或均值曲线"""
+                stop = self.current_step
+                rolls = self.series.head(stop)
+                self.counts = np.bincount(rolls - 1, minlength=6)
                 
-                # 模拟多次掷骰子
-                for _ in range(actual_step_size):
-                    result = random.randint(1, 6) - 1  # 0-5对应1-6点
-                    self.counts[result] += 1
-                    self.current_step += 1
-                    
-                    # 计算当前频率和均值
-                    total = sum(self.counts)
-                    if total > 0:
-                        if self.mode == 'frequency':
-                            # 计算频率
-                            less_than_4 = sum(self.counts[:3]) / total  # 点数为1,2,3的频率
-                            equal_to_5 = self.counts[4] / total  # 点数为5的频率
-                            self.less_than_4_history.append(less_than_4)
-                            self.equal_to_5_history.append(equal_to_5)
-                        elif self.mode == 'expectation':
-                            # 计算平均值
-                            current_mean = sum((i+1)*count for i, count in enumerate(self.counts)) / total
-                            self.means.append(current_mean)
+                # 计算各次试验后的频率和均值
+                total = np.arange(1, stop + 1)
+                if self.mode == 'frequency':
+                    self.less_than_4_history = np.cumsum(rolls < 4) / total  # 点数为1,2,3的频率
+                    self.equal_to_5_history = np.cumsum(rolls == 5) / total  # 点数为5的频率
+                elif self.mode == 'expectation':
+                    self.means = np.cumsum(rolls, dtype=np.int64) / total
                 
                 # 绘制图表
                 self.figure.clear()
@@ -206,22 +214,42 @@ class DiceRollingExperiment(ExpWidget):
             self.controls_layout.addWidget(self.n_spin, 0, 1)
             self.controls_layout.addWidget(self.n_slider, 0, 2)
             
+            # 随机种子，相同的种子得到相同的点数序列
+            self.seed_label = BodyLabel("随机种子：", self)
+            self.seed_spin = CompactSpinBox(self)
+            self.seed_spin.setRange(0, MAX_SEED)
+            self.seed_button = PushButton("换一个", self)
+            
+            self.controls_layout.addWidget(self.seed_label, 1, 0)
+            self.controls_layout.addWidget(self.seed_spin, 1, 1)
+            self.controls_layout.addWidget(self.seed_button, 1, 2)
+            
             # 模式切换按钮
             self.mode_toggle = TogglePushButton("频率模式", self)
             self.mode_toggle.toggled.connect(self.on_mode_toggled)
             
-            self.controls_layout.addWidget(self.mode_toggle, 1, 0, 1, 2)
+            self.controls_layout.addWidget(self.mode_toggle, 2, 0, 1, 2)
+            
+            # 导出当前种子下的全部点数记录
+            self.export_button = ExportButton(
+                lambda: ('dice_rolling_experiment', self.plot_widget.n, self.plot_widget.series.seed, None),
+                'dice_rolls.csv', self
+            )
+            self.controls_layout.addWidget(self.export_button, 3, 0, 1, 3)
             
             self.flow_layout.addWidget(self.control_container)
             
             # 绘图区域
             self.plot_widget = self.PlotWidget(self)
             self.flow_layout.addWidget(self.plot_widget)
+            self.seed_spin.setValue(self.plot_widget.series.seed)
                         
             # 连接信号
             self.n_spin.valueChanged.connect(self.n_slider.setValue)
             self.n_slider.valueChanged.connect(self.n_spin.setValue)
             self.n_spin.valueChanged.connect(lambda: self.plot_widget.update_plot(n=self.n_spin.value()))
+            self.seed_spin.valueChanged.connect(self.plot_widget.set_seed)
+            self.seed_button.clicked.connect(lambda: self.seed_spin.setValue(new_seed()))
             
             cfg.themeChanged.connect(lambda: self.plot_widget.update_plot())
             
@@ -5,7 +5,7 @@ from PyQt5.QtWidgets import (
 from qfluentwidgets import (
     FlowLayout, Slider, CompactDoubleSpinBox, CompactSpinBox, isDarkTheme,
     TitleLabel, BodyLabel, ScrollArea, FluentStyleSheet, ComboBox,
-    TeachingTip, InfoBarIcon
+    TeachingTip, InfoBarIcon, TogglePushButton
 )
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
@@ -15,6 +15,7 @@ import numpy as np
 from .ExpWidget import ExpWidget
 from ..common.MarkdownKatex import MarkdownKaTeXWidget
 from ..common.config import cfg
+from ..common.distributions import support_bounds, ppf_table
 
 class DiscretePDF(ExpWidget):
     
@@ -127,6 +128,9 @@ $$F(x) = P(X \leq x) = \sum_{k=0}^{\lfloor x \rfloor}\binom{k+r-1}{k}p^r(1-p)^k$
         windowResizeSignal = pyqtSignal(int, int)
         
         class PlotWidget(QWidget):
+            # 超过该点数时不再逐个绘制柱形
+            MAX_BARS = 150
+            
             def __init__(self, parent=None):
                 super().__init__(parent)
                 
@@ -144,6 +148,11 @@ $$F(x) = P(X \leq x) = \sum_{k=0}^{\lfloor x \rfloor}\binom{k+r-1}{k}p^r(1-p)^k$
                 self.distribution_type = 'binomial'
                 self.params = {'n': 10, 'p': 0.5}
                 
+                # 分位数标记：'lower' 为下侧分位数，'two_sided' 为双侧临界值
+                self.quantile_level = 0.95
+                self.quantile_mode = 'lower'
+                self.quantile_lines = []
+                
                 # Add a timer to debounce error messages
                 self.error_timer = QTimer()
                 self.error_timer.setSingleShot(True)
@@ -164,6 +173,7 @@ $$F(x) = P(X \leq x) = \sum_{k=0}^{\lfloor x \rfloor}\binom{k+r-1}{k}p^r(1-p)^k$
             def update_plot(self):
                 try:
                     self.figure.clear()
+                    self.quantile_lines = []
                     ax = self.figure.add_subplot(111)
                     
                     # 根据分布类型绘制相应的图形
@@ -266,18 +276,15 @@ $$F(x) = P(X \leq x) = \sum_{k=0}^{\lfloor x \rfloor}\binom{k+r-1}{k}p^r(1-p)^k$
                         if not 0 < p < 1:
                             raise ValueError("几何分布参数错误：p必须在(0,1)之间")
                         
-                        x = np.arange(1, 21)  # 显示前20项
+                        # 由缓存的分位数确定支撑区间，覆盖 1-1e-6 的概率质量
+                        lo, hi = support_bounds('geometric', self.params)
+                        x = np.arange(lo, hi + 1)
                         from scipy.stats import geom
                         pmf = geom.pmf(x, p)
-                        ax.bar(x, pmf, width=0.4, label='PMF', alpha=0.7, color='blue')
-                        
-                        # 分布函数
                         cdf_vals = geom.cdf(x, p)
-                        ax.step(np.concatenate([[0], x, [x[-1]+0.5]]), 
-                               np.concatenate([[0], cdf_vals, [cdf_vals[-1]]]), 
-                               where='post', label='CDF', color='red', linewidth=2)
+                        self._plot_long_support(ax, x, pmf, cdf_vals, geom.cdf(lo - 1, p))
                         
-                        ax.set_xlim(0.5, x[-1]+0.5)
+                        ax.set_xlim(x[0]-0.5, x[-1]+0.5)
                         ax.set_ylim(0, 1.1)
                         
                     elif self.distribution_type == 'negative_binomial':
@@ -289,20 +296,18 @@ $$F(x) = P(X \leq x) = \sum_{k=0}^{\lfloor x \rfloor}\binom{k+r-1}{k}p^r(1-p)^k$
                         if r <= 0 or not 0 < p < 1:
                             raise ValueError("负二项分布参数错误：r必须大于0，p必须在(0,1)之间")
                         
-                        x = np.arange(0, 20)
+                        # 由缓存的分位数确定支撑区间，覆盖 1-1e-6 的概率质量
+                        lo, hi = support_bounds('negative_binomial', self.params)
+                        x = np.arange(lo, hi + 1)
                         from scipy.stats import nbinom
                         pmf = nbinom.pmf(x, r, p)
-                        ax.bar(x, pmf, width=0.4, label='PMF', alpha=0.7, color='blue')
-                        
-                        # 分布函数
                         cdf_vals = nbinom.cdf(x, r, p)
-                        ax.step(np.concatenate([[-0.5], x, [x[-1]+0.5]]), 
-                               np.concatenate([[0], cdf_vals, [cdf_vals[-1]]]), 
-                               where='post', label='CDF', color='red', linewidth=2)
+                        self._plot_long_support(ax, x, pmf, cdf_vals, nbinom.cdf(lo - 1, r, p))
                         
-                        ax.set_xlim(-0.5, x[-1]+0.5)
+                        ax.set_xlim(x[0]-0.5, x[-1]+0.5)
                         ax.set_ylim(0, 1.1)
                     
+                    self._draw_quantile_markers(ax)
                     ax.patch.set_alpha(0.1)
                     
                     if isDarkTheme():
@@ -336,6 +341,50 @@ $$F(x) = P(X \leq x) = \sum_{k=0}^{\lfloor x \rfloor}\binom{k+r-1}{k}p^r(1-p)^k$
                     self._show_error_message(f"绘图过程中出现错误: {str(e)}")
                     self.canvas.draw()  # 确保画布仍然更新，即使出错
             
+            def _plot_long_support(self, ax, x, pmf, cdf_vals, cdf_start):
+                """绘制支撑区间长度随参数变化的分布，点数过多时改用阶梯填充代替逐个柱形"""
+                if len(x) <= self.MAX_BARS:
+                    ax.bar(x, pmf, width=0.4, label='PMF', alpha=0.7, color='blue')
+                else:
+                    # 数万个柱形会让绘制非常缓慢，此时用单个阶梯填充多边形近似
+                    ax.fill_between(x, pmf, step='mid', label='PMF', alpha=0.7, color='blue')
+                
+                # 分布函数，起点为截断区间左侧的累积概率
+                ax.step(np.concatenate([[x[0]-0.5], x, [x[-1]+0.5]]), 
+                       np.concatenate([[cdf_start], cdf_vals, [cdf_vals[-1]]]), 
+                       where='post', label='CDF', color='red', linewidth=2)
+            
+            def quantile_values(self):
+                """由缓存的逆分布函数查找表返回当前概率水平对应的分位数或双侧临界值"""
+                table = ppf_table(self.distribution_type, self.params)
+                if self.quantile_mode == 'two_sided':
+                    return table.critical_values(1 - self.quantile_level)
+                return (table.quantile(self.quantile_level),)
+            
+            def set_quantile(self, level, mode):
+                """更新概率水平，只移动标记线而不重新计算和绘制分布"""
+                self.quantile_level = level
+                self.quantile_mode = mode
+                if self.quantile_lines:
+                    self._move_quantile_markers()
+                    self.canvas.draw_idle()
+            
+            def _draw_quantile_markers(self, ax):
+                self.quantile_lines = [
+                    ax.axvline(0, color='green', linestyle='--', linewidth=1.5, label='分位数'),
+                    ax.axvline(0, color='green', linestyle='--', linewidth=1.5),
+                ]
+                self._move_quantile_markers()
+            
+            def _move_quantile_markers(self):
+                values = self.quantile_values()
+                for i, line in enumerate(self.quantile_lines):
+                    if i < len(values):
+                        line.set_xdata([values[i], values[i]])
+                        line.set_visible(True)
+                    else:
+                        line.set_visible(False)
+            
             def _show_error_message(self, message):
                 """Show error message using Flyout with debouncing"""
                 import time
@@ -488,6 +537,20 @@ $$F(x) = P(X \leq x) = \sum_{k=0}^{\lfloor x \rfloor}\binom{k+r-1}{k}p^r(1-p)^k$
             self.p_neg_slider.setSingleStep(1)
             self.p_neg_slider.setValue(50)
             
+            # 分位数面板
+            self.q_label = BodyLabel("p（概率水平）：", self)
+            self.q_spin = CompactDoubleSpinBox(self)
+            self.q_spin.setDecimals(3)
+            self.q_spin.setRange(0.001, 0.999)
+            self.q_spin.setSingleStep(0.001)
+            self.q_spin.setValue(0.95)
+            self.q_slider = Slider(Qt.Horizontal, self)
+            self.q_slider.setRange(1, 999)
+            self.q_slider.setSingleStep(1)
+            self.q_slider.setValue(950)
+            self.q_mode_toggle = TogglePushButton("下侧分位数", self)
+            self.q_value_label = BodyLabel("", self)
+            
             # 添加所有控件到布局中，但初始时隐藏不需要的控件
             self.control_layout.addWidget(self.dist_label, 0, 0)
             self.control_layout.addWidget(self.dist_combo, 0, 1, 1, 2)
@@ -529,6 +592,14 @@ $$F(x) = P(X \leq x) = \sum_{k=0}^{\lfloor x \rfloor}\binom{k+r-1}{k}p^r(1-p)^k$
             self.control_layout.addWidget(self.p_neg_spin, 9, 1)
             self.control_layout.addWidget(self.p_neg_slider, 9, 2)
             
+            # 分位数控件，不随分布类型切换而隐藏
+            self.quantile_row = 10
+            self.control_layout.addWidget(self.q_label, 10, 0)
+            self.control_layout.addWidget(self.q_spin, 10, 1)
+            self.control_layout.addWidget(self.q_slider, 10, 2)
+            self.control_layout.addWidget(self.q_mode_toggle, 11, 0)
+            self.control_layout.addWidget(self.q_value_label, 11, 1, 1, 2)
+            
             # 初始时只显示二项分布控件
             self.show_only_binomial_controls()
             
@@ -544,6 +615,7 @@ $$F(x) = P(X \leq x) = \sum_{k=0}^{\lfloor x \rfloor}\binom{k+r-1}{k}p^r(1-p)^k$
             self.flow_layout.addWidget(self.plot_widget)
             
             cfg.themeChanged.connect(lambda: self.plot_widget.update_plot())
+            self.refresh_quantile_label()
             
         def setup_connections(self):
             # 二项分布连接
@@ -600,10 +672,36 @@ $$F(x) = P(X \leq x) = \sum_{k=0}^{\lfloor x \rfloor}\binom{k+r-1}{k}p^r(1-p)^k$
             self.p_geom_spin.valueChanged.connect(self.update_parameters)
             self.r_spin.valueChanged.connect(self.update_parameters)
             self.p_neg_spin.valueChanged.connect(self.update_parameters)
+            
+            # 分位数面板连接
+            self.q_spin.valueChanged.connect(
+                lambda: self.q_slider.setValue(int(round(self.q_spin.value() * 1000)))
+            )
+            self.q_slider.valueChanged.connect(
+                lambda: self.q_spin.setValue(self.q_slider.value() / 1000)
+            )
+            self.q_spin.valueChanged.connect(self.update_quantile)
+            self.q_mode_toggle.toggled.connect(self.on_quantile_mode_toggled)
+        
+        def on_quantile_mode_toggled(self, checked):
+            self.q_mode_toggle.setText("双侧临界值" if checked else "下侧分位数")
+            self.update_quantile()
+        
+        def update_quantile(self):
+            mode = 'two_sided' if self.q_mode_toggle.isChecked() else 'lower'
+            self.plot_widget.set_quantile(self.q_spin.value(), mode)
+            self.refresh_quantile_label()
+        
+        def refresh_quantile_label(self):
+            try:
+                values = self.plot_widget.quantile_values()
+                self.q_value_label.setText("k = " + ", ".join(f"{v:d}" for v in values))
+            except ValueError:
+                self.q_value_label.setText("")
         
         def hide_all_param_controls(self):
-            # 隐藏所有参数控件
-            for i in range(1, self.control_layout.rowCount()):
+            # 隐藏所有参数控件（分位数面板除外）
+            for i in range(1, self.quantile_row):
                 for j in range(self.control_layout.columnCount()):
                     item = self.control_layout.itemAtPosition(i, j)
                     if item and item.widget():
@@ -735,6 +833,7 @@ $$F(x) = P(X \leq x) = \sum_{k=0}^{\lfloor x \rfloor}\binom{k+r-1}{k}p^r(1-p)^k$
                     }
                 
                 self.plot_widget.update_plot()
+                self.refresh_quantile_label()
             except ValueError as ve:
                 self.plot_widget._show_error_message(str(ve))
             except Exception as e:
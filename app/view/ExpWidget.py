@@ -2,10 +2,14 @@ from qfluentwidgets import (FlowLayout, Pivot, qrouter)
 from PyQt5.QtWidgets import QWidget, QStackedWidget, QVBoxLayout, QLabel
 from PyQt5.QtCore import Qt
 
+from ..common.session import sessions
+
 class ExpWidget(QWidget):
     def __init__(self, name, descriptionFactory=None, experimentFactory=None, parent=None):
         super().__init__(parent)
         self.setObjectName(name)
+        # 主窗口导航中的视图键，录制会话时用于标识实验界面
+        self.routeKey = None
         
         self.pivot = Pivot(self)
         self.stackedWidget = QStackedWidget(self)
@@ -68,6 +72,9 @@ class ExpWidget(QWidget):
                     break
             self.stackedWidget.addWidget(self._experimentInterface)
             self.stackedWidget.setCurrentWidget(self._experimentInterface)
+            
+            if self.routeKey is not None:
+                sessions.add_interface(self.routeKey, self._experimentInterface.widget())
 
     def addSubInterface(self, objectName, text):
         """添加子界面，使用懒加载"""
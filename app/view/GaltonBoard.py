@@ -0,0 +1,279 @@
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QSizePolicy, QGridLayout
+)
+from qfluentwidgets import (
+    FlowLayout, Slider, CompactDoubleSpinBox, CompactSpinBox, isDarkTheme,
+    TitleLabel, BodyLabel, ScrollArea, FluentStyleSheet
+)
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from scipy.stats import norm, binom
+import numpy as np
+
+from .ExpWidget import ExpWidget
+from ..common.MarkdownKatex import MarkdownKaTeXWidget
+from ..common.config import cfg
+from ..common.controls import link_log_slider
+
+class GaltonBoard(ExpWidget):
+
+    desc = r"""
+# 高尔顿板实验
+高尔顿板由 $n$ 层钉子组成，小球从顶端落下，每经过一层钉子以概率 $p$ 向右、以概率 $1-p$ 向左偏移一格。
+小球最终落入的格子编号 $X$ 等于向右偏移的次数，因此 $X \sim \mathcal{B}(n, p)$。
+
+1. 不断投入小球，统计各格子中小球的频率，观察频率分布逐渐稳定于二项分布 $\mathcal{B}(n, p)$；
+2. 由中心极限定理，当 $n$ 充分大时，$X$ 近似服从 $\mathcal{N}(np, np(1-p))$，图中红色曲线为对应的正态密度。
+
+实验中每一帧投入的一批小球按格子整体抽样（多项分布），而不是逐个模拟小球的路径，因此可以投入上千万个小球。
+"""
+
+    class ExpInterface(ScrollArea):
+        windowResizeSignal = pyqtSignal(int, int)
+        
+        class PlotWidget(QWidget):
+            # 每次实验的动画帧数，每帧投入 总球数/FRAMES 个小球
+            FRAMES = 200
+            
+            def __init__(self, parent=None):
+                super().__init__(parent)
+                
+                self.figure = Figure(figsize=(8, 6), dpi=100)
+                self.figure.patch.set_facecolor("none")
+                self.figure.patch.set_edgecolor("none")
+                self.canvas = FigureCanvas(self.figure)
+                self.canvas.setStyleSheet("background: transparent;")
+                self.canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+                
+                self.layout = QVBoxLayout(self)
+                self.layout.addWidget(self.canvas)
+                self.setLayout(self.layout)
+                
+                self.n = 20
+                self.p = 0.5
+                self.balls = 100000
+                
+                self.animation_timer = QTimer(self)
+                self.animation_timer.timeout.connect(self.animate_plot)
+                
+                # 重绘整幅图后缓存不含柱子的背景，之后每帧只重画柱子和计数文字
+                self.background = None
+                self.canvas.mpl_connect('draw_event', self.on_draw)
+                
+                self.update_plot()
+                self.parent().windowResizeSignal.connect(self.onParentResize)
+            
+            def onParentResize(self, parent_width, parent_height):
+                """响应父控件大小变化"""
+                available_width = max(parent_width - 100, 400)
+                max_width = 800
+                width = min(available_width, max_width)
+                height = width * 3 / 4
+                
+                self.figure.set_size_inches(width / 100, height / 100)
+                self.canvas.draw()
+            
+            def update_plot(self, n=None, p=None, balls=None):
+                if n is not None:
+                    self.n = n
+                if p is not None:
+                    self.p = p
+                if balls is not None:
+                    self.balls = balls
+                
+                # 重置数据
+                self.rng = np.random.default_rng()
+                self.k = np.arange(self.n + 1)
+                self.pmf = binom.pmf(self.k, self.n, self.p)
+                self.counts = np.zeros(self.n + 1, dtype=np.int64)
+                self.dropped = 0
+                self.batch_size = max(1, self.balls // self.FRAMES)
+                
+                self.draw_background()
+                
+                # 开始动画
+                self.animation_timer.start(20)
+            
+            def draw_background(self):
+                """绘制坐标轴、二项分布与正态曲线等静态部分，柱子设为动画对象"""
+                self.figure.clear()
+                ax = self.figure.add_subplot(111)
+                self.ax = ax
+                
+                n, p = self.n, self.p
+                mu = n * p
+                sigma = np.sqrt(n * p * (1 - p))
+                
+                frequency = self.counts / max(self.dropped, 1)
+                self.bars = ax.bar(self.k, frequency, width=0.8, label='小球频率', alpha=0.6,
+                                   color='blue', align='center', animated=True)
+                ax.plot(self.k, self.pmf, 'o', color='black', markersize=3, label=f'二项分布 B(n={n}, p={p})')
+                x_continuous = np.linspace(-0.5, n + 0.5, 1000)
+                ax.plot(x_continuous, norm.pdf(x_continuous, loc=mu, scale=sigma), color='red',
+                        linewidth=2, label=f'正态分布 N(μ={mu:.1f}, σ²={sigma**2:.1f})')
+                
+                color = 'white' if isDarkTheme() else 'black'
+                self.count_text = ax.text(0.02, 0.95, '', transform=ax.transAxes, color=color,
+                                          verticalalignment='top', animated=True)
+                
+                # 纵轴固定，保证每帧只需更新柱高
+                ax.set_xlim(max(-0.5, mu - 4.5 * sigma), min(n + 0.5, mu + 4.5 * sigma))
+                ax.set_ylim(0, self.pmf.max() * 1.3)
+                ax.patch.set_alpha(0.1)
+                ax.legend(loc='upper right')
+                
+                for spine in ax.spines.values():
+                    spine.set_color(color)
+                ax.tick_params(colors=color, which='both')
+                ax.set_xlabel('格子编号 $k$', color=color)
+                ax.set_ylabel('频率', color=color)
+                ax.set_title(f'高尔顿板实验 (层数: {n}, 向右概率: {p})', color=color)
+                ax.grid(True, alpha=0.3 if isDarkTheme() else 0.7)
+                
+                self.figure.tight_layout()
+                self.canvas.draw()
+            
+            def on_draw(self, event):
+                self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+                self.draw_animated()
+            
+            def draw_animated(self):
+                for bar in self.bars:
+                    self.ax.draw_artist(bar)
+                self.ax.draw_artist(self.count_text)
+            
+            def animate_plot(self):
+                """投入一批小球并只重画柱子，单帧开销与已投入的小球总数无关"""
+                remaining = self.balls - self.dropped
+                if remaining <= 0:
+                    self.animation_timer.stop()
+                    return
+                
+                batch = min(self.batch_size, remaining)
+                self.counts += self.rng.multinomial(batch, self.pmf / self.pmf.sum())
+                self.dropped += batch
+                
+                frequency = self.counts / self.dropped
+                for bar, height in zip(self.bars, frequency):
+                    bar.set_height(height)
+                self.count_text.set_text(f'已投入 {self.dropped:,} 个小球')
+                
+                if self.background is None:
+                    self.canvas.draw()
+                    return
+                self.canvas.restore_region(self.background)
+                self.draw_animated()
+                self.canvas.blit(self.figure.bbox)
+        
+        def __init__(self, parent=None):
+            super().__init__(parent)
+            self.flow_layout = FlowLayout(self)
+            
+            self.control_container = QWidget()
+            self.control_container.setFixedWidth(400)
+            self.controls_layout = QGridLayout(self.control_container)
+            
+            # n 参数设置 (钉子层数)
+            self.n_label = BodyLabel("n（钉子层数）：", self)
+            self.n_spin = CompactSpinBox(self)
+            self.n_spin.setRange(1, 100)
+            self.n_spin.setValue(20)
+            self.n_slider = Slider(Qt.Horizontal, self)
+            self.n_slider.setRange(1, 100)
+            self.n_slider.setSingleStep(1)
+            self.n_slider.setValue(20)
+            
+            self.controls_layout.addWidget(self.n_label, 0, 0)
+            self.controls_layout.addWidget(self.n_spin, 0, 1)
+            self.controls_layout.addWidget(self.n_slider, 0, 2)
+            
+            # p 参数设置 (向右偏移的概率)
+            self.p_label = BodyLabel("p（向右概率）：", self)
+            self.p_spin = CompactDoubleSpinBox(self)
+            self.p_spin.setRange(0.01, 0.99)
+            self.p_spin.setSingleStep(0.01)
+            self.p_spin.setValue(0.5)
+            self.p_slider = Slider(Qt.Horizontal, self)
+            self.p_slider.setRange(1, 99)
+            self.p_slider.setSingleStep(1)
+            self.p_slider.setValue(50)
+            
+            self.controls_layout.addWidget(self.p_label, 1, 0)
+            self.controls_layout.addWidget(self.p_spin, 1, 1)
+            self.controls_layout.addWidget(self.p_slider, 1, 2)
+            
+            # 小球总数设置，跨越多个数量级，滑块取 10 倍的常用对数
+            self.balls_label = BodyLabel("小球总数：", self)
+            self.balls_spin = CompactSpinBox(self)
+            self.balls_spin.setRange(100, 10000000)
+            self.balls_spin.setSingleStep(100)
+            self.balls_spin.setValue(100000)
+            self.balls_slider = Slider(Qt.Horizontal, self)
+            self.balls_slider.setRange(20, 70)
+            self.balls_slider.setSingleStep(1)
+            self.balls_slider.setValue(50)
+            
+            self.controls_layout.addWidget(self.balls_label, 2, 0)
+            self.controls_layout.addWidget(self.balls_spin, 2, 1)
+            self.controls_layout.addWidget(self.balls_slider, 2, 2)
+            
+            self.flow_layout.addWidget(self.control_container)
+            
+            # 绘图区域
+            self.plot_widget = self.PlotWidget(self)
+            self.flow_layout.addWidget(self.plot_widget)
+            
+            # 连接信号
+            self.n_spin.valueChanged.connect(self.n_slider.setValue)
+            self.n_slider.valueChanged.connect(self.n_spin.setValue)
+            self.p_spin.valueChanged.connect(
+                lambda: self.p_slider.setValue(int(round(self.p_spin.value() * 100)))
+            )
+            self.p_slider.valueChanged.connect(
+                lambda: self.p_spin.setValue(self.p_slider.value() / 100)
+            )
+            link_log_slider(self.balls_spin, self.balls_slider)
+            
+            self.n_spin.valueChanged.connect(self.update_parameters)
+            self.p_spin.valueChanged.connect(self.update_parameters)
+            self.balls_spin.valueChanged.connect(self.update_parameters)
+            
+            cfg.themeChanged.connect(lambda: self.plot_widget.draw_background())
+        
+        def update_parameters(self):
+            self.plot_widget.update_plot(
+                n=self.n_spin.value(),
+                p=self.p_spin.value(),
+                balls=self.balls_spin.value()
+            )
+        
+        def resizeEvent(self, event):
+            super().resizeEvent(event)
+            current_size = event.size()
+            self.windowResizeSignal.emit(current_size.width(), current_size.height())
+            event.accept()
+    
+    def __init__(self, parent=None):
+        # 创建工厂函数用于懒加载
+        def create_description_interface():
+            descriptionInterface = MarkdownKaTeXWidget()
+            descriptionInterface.set_markdown(self.desc)
+            return descriptionInterface
+        
+        def create_experiment_interface():
+            scroll_area = ScrollArea()
+            experimentInterface = GaltonBoard.ExpInterface()
+            scroll_area.setWidget(experimentInterface)
+            scroll_area.setWidgetResizable(True)
+            scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+            scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+            FluentStyleSheet.NAVIGATION_INTERFACE.apply(scroll_area)
+            return scroll_area
+        
+        super().__init__(
+            '高尔顿板实验',
+            descriptionFactory=create_description_interface,
+            experimentFactory=create_experiment_interface,
+            parent=parent
+        )
@@ -0,0 +1,280 @@
+import time
+
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QSizePolicy, QGridLayout
+)
+from qfluentwidgets import (
+    FlowLayout, Slider, CompactDoubleSpinBox, CompactSpinBox, isDarkTheme,
+    TitleLabel, BodyLabel, ScrollArea, FluentStyleSheet, ComboBox
+)
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+import numpy as np
+
+from .ExpWidget import ExpWidget
+from ..common.MarkdownKatex import MarkdownKaTeXWidget
+from ..common.config import cfg
+from ..common.distributions import FAMILIES, HEAVY_TAILED_FAMILIES, default_params, freeze
+from ..common.runningmean import RunningMeanEnsemble
+from ..common.controls import link_log_slider
+
+class LawOfLargeNumbers(ExpWidget):
+
+    desc = r"""
+# 大数定律
+设 $X_1, X_2, \ldots$ 独立同分布，$\mathbb{E} X_i = \mu$ 存在，则样本均值
+$$
+\bar{X}_n = \cfrac{1}{n} \sum_{i=1}^{n} X_i \xrightarrow{a.s.} \mu
+$$
+若方差 $\sigma^2$ 也存在，由中心极限定理，$\bar{X}_n$ 的波动幅度约为 $\cfrac{\sigma}{\sqrt{n}}$，图中灰色区域为 $\mu \pm 1.96 \cfrac{\sigma}{\sqrt{n}}$。
+
+**失效的情形**：柯西分布的密度为
+$$
+f(x) = \cfrac{1}{\pi \gamma \left[ 1 + \left( \cfrac{x - x_0}{\gamma} \right)^2 \right]}
+$$
+其期望不存在。可以证明 $n$ 个独立柯西随机变量的均值仍服从同一柯西分布，
+样本均值不会随 $n$ 增大而稳定下来，偶尔出现的极端值会使均值突然跳变。
+
+实验同时进行若干次独立重复，每次最多抽取 $10^8$ 个样本。样本分块生成并求累加和，
+只在横轴按对数均匀分布的约 $1000$ 个位置上记录均值用于绘图。
+"""
+
+    class ExpInterface(ScrollArea):
+        windowResizeSignal = pyqtSignal(int, int)
+        
+        class PlotWidget(QWidget):
+            DIST_TYPES = list(FAMILIES) + list(HEAVY_TAILED_FAMILIES)
+            FRAME_BUDGET = 0.1
+            
+            def __init__(self, parent=None):
+                super().__init__(parent)
+                
+                self.figure = Figure(figsize=(8, 6), dpi=100)
+                self.figure.patch.set_facecolor("none")
+                self.figure.patch.set_edgecolor("none")
+                self.canvas = FigureCanvas(self.figure)
+                self.canvas.setStyleSheet("background: transparent;")
+                self.canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+                
+                self.layout = QVBoxLayout(self)
+                self.layout.addWidget(self.canvas)
+                self.setLayout(self.layout)
+                
+                self.dist_type = 'normal'
+                self.runs = 5
+                self.size = 1000000
+                
+                self.animation_timer = QTimer(self)
+                self.animation_timer.timeout.connect(self.animate_plot)
+                
+                self.update_plot()
+                self.parent().windowResizeSignal.connect(self.onParentResize)
+            
+            def onParentResize(self, parent_width, parent_height):
+                """响应父控件大小变化"""
+                available_width = max(parent_width - 100, 400)
+                max_width = 800
+                width = min(available_width, max_width)
+                height = width * 3 / 4
+                
+                self.figure.set_size_inches(width / 100, height / 100)
+                self.canvas.draw()
+            
+            def update_plot(self, dist_type=None, runs=None, size=None):
+                if dist_type is not None:
+                    self.dist_type = dist_type
+                if runs is not None:
+                    self.runs = runs
+                if size is not None:
+                    self.size = size
+                
+                self.params = default_params(self.dist_type)
+                self.dist = freeze(self.dist_type, self.params)
+                self.ensemble = RunningMeanEnsemble(self.dist, np.random.default_rng(), self.runs, self.size)
+                self.draw_axes()
+                
+                self.last_draw = 0.0
+                self.draw_time = 0.0
+                
+                # 开始动画
+                self.animation_timer.start(0)
+            
+            def draw_axes(self):
+                self.figure.clear()
+                self.ax = self.figure.add_subplot(111)
+                ax = self.ax
+                color = 'white' if isDarkTheme() else 'black'
+                
+                mean, std = self.dist.mean(), self.dist.std()
+                n = np.geomspace(1, self.size, 400)
+                if np.isfinite(mean):
+                    center = mean
+                    ax.axhline(mean, color='red', linestyle='--', linewidth=1.5, label=f'$\\mu = {mean:.4g}$')
+                else:
+                    # 期望不存在时以中位数作参照
+                    center = self.dist.median()
+                    ax.axhline(center, color='red', linestyle='--', linewidth=1.5,
+                               label=f'中位数 ${center:.4g}$（期望不存在）')
+                if np.isfinite(std):
+                    half_width = 1.96 * std / np.sqrt(n)
+                    ax.fill_between(n, center - half_width, center + half_width, color='gray', alpha=0.3,
+                                    label='$\\mu \\pm 1.96\\sigma/\\sqrt{n}$')
+                    ax.set_ylim(center - 3 * std, center + 3 * std)
+                else:
+                    # 方差不存在时按四分位距确定纵轴范围
+                    scale = self.dist.ppf(0.75) - self.dist.ppf(0.25)
+                    ax.set_ylim(center - 5 * scale, center + 5 * scale)
+                
+                self.lines = [ax.plot([], [], linewidth=1.2, label='样本均值' if i == 0 else None)[0]
+                              for i in range(self.runs)]
+                ax.set_xscale('log')
+                ax.set_xlim(1, self.size)
+                ax.legend(loc='upper right')
+                
+                self.count_text = ax.text(0.02, 0.97, '', transform=ax.transAxes, color=color,
+                                          verticalalignment='top')
+                
+                ax.patch.set_alpha(0.1)
+                for spine in ax.spines.values():
+                    spine.set_color(color)
+                ax.tick_params(colors=color, which='both')
+                ax.grid(True, alpha=0.3 if isDarkTheme() else 0.7)
+                ax.set_xlabel('样本量 $n$', color=color)
+                ax.set_ylabel('$\\bar{X}_n$', color=color)
+                name = {**FAMILIES, **HEAVY_TAILED_FAMILIES}[self.dist_type][0]
+                params = ', '.join(f'{k}={v}' for k, v in self.params.items())
+                ax.set_title(f'大数定律: {name} ({params}), {self.runs} 次独立重复', color=color)
+                
+                self.figure.tight_layout()
+                self.update_lines()
+                self.canvas.draw()
+            
+            def animate_plot(self):
+                ensemble = self.ensemble
+                if ensemble.finished:
+                    self.animation_timer.stop()
+                    return
+                
+                # 每次定时器回调只计算约 FRAME_BUDGET 秒，保持界面响应
+                start = time.perf_counter()
+                while not ensemble.finished and time.perf_counter() - start < self.FRAME_BUDGET:
+                    ensemble.advance()
+                
+                # 距上次重绘的时间不足重绘耗时的两倍时只计算不重绘
+                if not ensemble.finished and time.perf_counter() - self.last_draw < 2 * self.draw_time:
+                    return
+                
+                start = time.perf_counter()
+                self.update_lines()
+                self.canvas.draw()
+                self.last_draw = time.perf_counter()
+                self.draw_time = self.last_draw - start
+            
+            def update_lines(self):
+                ensemble = self.ensemble
+                p = ensemble.done_points
+                for line, means in zip(self.lines, ensemble.means):
+                    line.set_data(ensemble.checkpoints[:p], means[:p])
+                self.count_text.set_text(f'已抽取 {ensemble.done:,} / {self.size:,} 个样本')
+        
+        def __init__(self, parent=None):
+            super().__init__(parent)
+            self.flow_layout = FlowLayout(self)
+            
+            self.control_container = QWidget()
+            self.control_container.setFixedWidth(400)
+            self.controls_layout = QGridLayout(self.control_container)
+            
+            # 总体分布选择
+            families = {**FAMILIES, **HEAVY_TAILED_FAMILIES}
+            self.dist_label = BodyLabel("总体分布：", self)
+            self.dist_combo = ComboBox(self)
+            self.dist_combo.addItems([families[key][0] for key in self.PlotWidget.DIST_TYPES])
+            self.dist_combo.setCurrentIndex(self.PlotWidget.DIST_TYPES.index('normal'))
+            
+            self.controls_layout.addWidget(self.dist_label, 0, 0)
+            self.controls_layout.addWidget(self.dist_combo, 0, 1, 1, 2)
+            
+            # 独立重复次数设置
+            self.runs_label = BodyLabel("重复次数：", self)
+            self.runs_spin = CompactSpinBox(self)
+            self.runs_spin.setRange(1, 10)
+            self.runs_spin.setValue(5)
+            self.runs_slider = Slider(Qt.Horizontal, self)
+            self.runs_slider.setRange(1, 10)
+            self.runs_slider.setSingleStep(1)
+            self.runs_slider.setValue(5)
+            
+            self.controls_layout.addWidget(self.runs_label, 1, 0)
+            self.controls_layout.addWidget(self.runs_spin, 1, 1)
+            self.controls_layout.addWidget(self.runs_slider, 1, 2)
+            
+            # 样本量设置，跨越多个数量级，滑块取 10 倍的常用对数
+            self.size_label = BodyLabel("n（样本量）：", self)
+            self.size_spin = CompactSpinBox(self)
+            self.size_spin.setRange(1000, 100000000)
+            self.size_spin.setSingleStep(1000)
+            self.size_spin.setValue(1000000)
+            self.size_slider = Slider(Qt.Horizontal, self)
+            self.size_slider.setRange(30, 80)
+            self.size_slider.setSingleStep(1)
+            self.size_slider.setValue(60)
+            
+            self.controls_layout.addWidget(self.size_label, 2, 0)
+            self.controls_layout.addWidget(self.size_spin, 2, 1)
+            self.controls_layout.addWidget(self.size_slider, 2, 2)
+            
+            self.flow_layout.addWidget(self.control_container)
+            
+            # 绘图区域
+            self.plot_widget = self.PlotWidget(self)
+            self.flow_layout.addWidget(self.plot_widget)
+            
+            # 连接信号
+            self.runs_spin.valueChanged.connect(self.runs_slider.setValue)
+            self.runs_slider.valueChanged.connect(self.runs_spin.setValue)
+            link_log_slider(self.size_spin, self.size_slider)
+            
+            self.dist_combo.currentIndexChanged.connect(self.update_parameters)
+            self.runs_spin.valueChanged.connect(self.update_parameters)
+            self.size_spin.valueChanged.connect(self.update_parameters)
+            
+            cfg.themeChanged.connect(self.update_parameters)
+        
+        def update_parameters(self):
+            self.plot_widget.update_plot(
+                dist_type=self.PlotWidget.DIST_TYPES[self.dist_combo.currentIndex()],
+                runs=self.runs_spin.value(),
+                size=self.size_spin.value()
+            )
+        
+        def resizeEvent(self, event):
+            super().resizeEvent(event)
+            current_size = event.size()
+            self.windowResizeSignal.emit(current_size.width(), current_size.height())
+            event.accept()
+    
+    def __init__(self, parent=None):
+        # 创建工厂函数用于懒加载
+        def create_description_interface():
+            descriptionInterface = MarkdownKaTeXWidget()
+            descriptionInterface.set_markdown(self.desc)
+            return descriptionInterface
+        
+        def create_experiment_interface():
+            scroll_area = ScrollArea()
+            experimentInterface = LawOfLargeNumbers.ExpInterface()
+            scroll_area.setWidget(experimentInterface)
+            scroll_area.setWidgetResizable(True)
+            scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+            scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+            FluentStyleSheet.NAVIGATION_INTERFACE.apply(scroll_area)
+            return scroll_area
+        
+        super().__init__(
+            '大数定律',
+            descriptionFactory=create_description_interface,
+            experimentFactory=create_experiment_interface,
+            parent=parent
+        )
@@ -0,0 +1,338 @@
+from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QSizePolicy, QGridLayout
+)
+from qfluentwidgets import (
+    FlowLayout, Slider, CompactSpinBox, isDarkTheme, BodyLabel, ScrollArea,
+    FluentStyleSheet, ComboBox, PushButton, ProgressBar, TeachingTip, InfoBarIcon
+)
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+import numpy as np
+
+from .ExpWidget import ExpWidget
+from ..common.MarkdownKatex import MarkdownKaTeXWidget
+from ..common.config import cfg
+from ..common.controls import link_log_slider
+from ..common.rng import MAX_SEED, new_seed
+from ..common.workers import HistoryBuilder
+
+class LongRunHistory(ExpWidget):
+
+    desc = r"""
+# 长程频率历史
+投币 $n$ 次时正面出现的频率 $\cfrac{n_A}{n}$、掷骰子 $n$ 次的平均点数 $\bar{X}_n$ 随 $n$ 增大而稳定于
+$\cfrac{1}{2}$ 与 $3.5$，但在任意一段区间内仍有起伏。本实验最多模拟 $10^9$ 步，可以放大查看任意一段的细节。
+
+**操作**：在图上滚动鼠标滚轮以光标为中心缩放横轴，按住左键拖动平移，双击恢复显示全部步数。
+
+逐步的结果写入磁盘上的内存映射文件，同时按 $2^6, 2^7, \ldots$ 步一组生成各层的最小值、最大值与均值（金字塔）。
+显示时按横轴范围内每个像素对应的步数选取一层，只读取与像素数同一量级的数据：
+阴影为每组的最小值到最大值，曲线为每组的均值；每个像素不足 $2^6$ 步时直接显示逐步的结果。
+因此无论总步数多少，每次缩放与平移都只需几毫秒与几 MB 内存。随机数流与投币、掷骰子实验相同，
+同一种子下前 $n$ 步的结果与这两个实验中显示的一致。
+"""
+
+    class ExpInterface(ScrollArea):
+        windowResizeSignal = pyqtSignal(int, int)
+        
+        class PlotWidget(QWidget):
+            EXPERIMENTS = ['coin_tossing_experiment', 'dice_rolling_experiment']
+            # 各实验的名称、纵轴标签与理论值
+            LABELS = {
+                'coin_tossing_experiment': ('投币', '正面频率 $n_A/n$', 0.5),
+                'dice_rolling_experiment': ('掷骰子', '平均点数 $\\bar{X}_n$', 3.5),
+            }
+            # 每格滚轮的缩放倍数与横轴最少显示的步数
+            ZOOM_FACTOR = 0.8
+            MIN_SPAN = 20
+            
+            def __init__(self, parent=None):
+                super().__init__(parent)
+                
+                self.figure = Figure(figsize=(8, 6), dpi=100)
+                self.figure.patch.set_facecolor("none")
+                self.figure.patch.set_edgecolor("none")
+                self.canvas = FigureCanvas(self.figure)
+                self.canvas.setStyleSheet("background: transparent;")
+                self.canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+                
+                self.layout = QVBoxLayout(self)
+                self.layout.addWidget(self.canvas)
+                self.setLayout(self.layout)
+                
+                self.experiment = 'coin_tossing_experiment'
+                self.steps = 10000000
+                self.history = None
+                self.xlim = (1, self.steps)
+                self.drag = None
+                
+                self.canvas.mpl_connect('scroll_event', self.on_scroll)
+                self.canvas.mpl_connect('button_press_event', self.on_press)
+                self.canvas.mpl_connect('motion_notify_event', self.on_motion)
+                self.canvas.mpl_connect('button_release_event', self.on_release)
+                
+                self.update_plot()
+                self.parent().windowResizeSignal.connect(self.onParentResize)
+            
+            def onParentResize(self, parent_width, parent_height):
+                """响应父控件大小变化"""
+                available_width = max(parent_width - 100, 400)
+                max_width = 800
+                width = min(available_width, max_width)
+                height = width * 3 / 4
+                
+                self.figure.set_size_inches(width / 100, height / 100)
+                # 像素数变化后按新的宽度重新选取金字塔的层
+                self.refresh()
+            
+            def update_plot(self, experiment=None, steps=None, history=None):
+                """切换实验或步数时清空历史，等待后台生成；history 生成完成后显示全部步数"""
+                if experiment is not None or steps is not None:
+                    self.history = None
+                    if experiment is not None:
+                        self.experiment = experiment
+                    if steps is not None:
+                        self.steps = steps
+                    self.xlim = (1, self.steps)
+                if history is not None:
+                    self.history = history
+                    self.xlim = (1, history.steps)
+                self.draw_axes()
+            
+            def draw_axes(self):
+                self.figure.clear()
+                self.ax = self.figure.add_subplot(111)
+                ax = self.ax
+                color = 'white' if isDarkTheme() else 'black'
+                name, ylabel, theory = self.LABELS[self.experiment]
+                
+                ax.axhline(theory, color='red', linestyle='--', linewidth=1.5, label=f'理论值 {theory:g}')
+                self.envelope = None
+                self.mean_line, = ax.plot([], [], color='tab:blue', linewidth=1.0, label='均值')
+                ax.legend(loc='upper right')
+                
+                self.status_text = ax.text(0.02, 0.97, '', transform=ax.transAxes, color=color,
+                                           verticalalignment='top')
+                
+                ax.patch.set_alpha(0.1)
+                for spine in ax.spines.values():
+                    spine.set_color(color)
+                ax.tick_params(colors=color, which='both')
+                ax.grid(True, alpha=0.3 if isDarkTheme() else 0.7)
+                ax.set_xlabel('步数 $n$', color=color)
+                ax.set_ylabel(ylabel, color=color)
+                ax.set_title(f'{name} {self.steps:,} 次的长程历史', color=color)
+                ax.set_xlim(*self.xlim)
+                
+                self.figure.tight_layout()
+                self.refresh()
+            
+            def set_progress(self, done):
+                if self.history is None:
+                    self.status_text.set_text(f'正在生成 {done:,} / {self.steps:,} 步…')
+                    self.canvas.draw_idle()
+            
+            def refresh(self):
+                """按当前横轴范围与坐标轴的像素宽度读取金字塔中对应的一层并重绘"""
+                ax = self.ax
+                if self.envelope is not None:
+                    self.envelope.remove()
+                    self.envelope = None
+                if self.history is None:
+                    self.mean_line.set_data([], [])
+                    self.canvas.draw_idle()
+                    return
+                
+                start, stop = self.xlim
+                x, lo, hi, mean, k = self.history.window(start, stop, ax.bbox.width)
+                self.mean_line.set_data(x, mean)
+                if k > 0:
+                    self.envelope = ax.fill_between(x, lo, hi, color='tab:blue', alpha=0.3, linewidth=0)
+                ax.set_xlim(start, stop)
+                if len(x):
+                    # 纵轴随显示范围内的数据伸缩
+                    bottom, top = float(np.min(lo)), float(np.max(hi))
+                    margin = max(top - bottom, 1e-6) * 0.1
+                    ax.set_ylim(bottom - margin, top + margin)
+                resolution = '逐步' if k == 0 else f'每点 $2^{{{k}}}$ 步'
+                self.status_text.set_text(f'第 {int(start):,} ~ {int(stop):,} 步，{resolution}')
+                self.canvas.draw_idle()
+            
+            def set_xlim(self, start, stop):
+                """把横轴范围限制在 [1, 总步数] 内，宽度不少于 MIN_SPAN 步"""
+                total = self.history.steps
+                span = min(max(stop - start, self.MIN_SPAN), total - 1)
+                start = min(max(start, 1), total - span)
+                self.xlim = (start, start + span)
+                self.refresh()
+            
+            def on_scroll(self, event):
+                if self.history is None or event.inaxes is not self.ax:
+                    return
+                factor = self.ZOOM_FACTOR ** event.step
+                start, stop = self.xlim
+                # 以光标所在的步数为中心缩放
+                center = event.xdata
+                self.set_xlim(center - (center - start) * factor, center + (stop - center) * factor)
+            
+            def on_press(self, event):
+                if self.history is None or event.inaxes is not self.ax or event.button != 1:
+                    return
+                if event.dblclick:
+                    self.drag = None
+                    self.set_xlim(1, self.history.steps)
+                    return
+                self.drag = (event.x, self.xlim)
+            
+            def on_motion(self, event):
+                if self.drag is None:
+                    return
+                x, (start, stop) = self.drag
+                shift = (x - event.x) * (stop - start) / self.ax.bbox.width
+                self.set_xlim(start + shift, stop + shift)
+            
+            def on_release(self, event):
+                self.drag = None
+        
+        def __init__(self, parent=None):
+            super().__init__(parent)
+            self.flow_layout = FlowLayout(self)
+            
+            self.control_container = QWidget()
+            self.control_container.setFixedWidth(400)
+            self.controls_layout = QGridLayout(self.control_container)
+            
+            # 实验选择
+            self.experiment_label = BodyLabel("实验：", self)
+            self.experiment_combo = ComboBox(self)
+            self.experiment_combo.addItems(["投币：正面频率", "掷骰子：平均点数"])
+            
+            self.controls_layout.addWidget(self.experiment_label, 0, 0)
+            self.controls_layout.addWidget(self.experiment_combo, 0, 1, 1, 2)
+            
+            # 总步数设置，跨越多个数量级，滑块取 10 倍的常用对数
+            self.steps_label = BodyLabel("总步数：", self)
+            self.steps_spin = CompactSpinBox(self)
+            self.steps_spin.setRange(10000, 1000000000)
+            self.steps_spin.setSingleStep(10000)
+            self.steps_spin.setValue(10000000)
+            self.steps_slider = Slider(Qt.Horizontal, self)
+            self.steps_slider.setRange(40, 90)
+            self.steps_slider.setSingleStep(1)
+            self.steps_slider.setValue(70)
+            
+            self.controls_layout.addWidget(self.steps_label, 1, 0)
+            self.controls_layout.addWidget(self.steps_spin, 1, 1)
+            self.controls_layout.addWidget(self.steps_slider, 1, 2)
+            
+            # 随机种子
+            self.seed_label = BodyLabel("随机种子：", self)
+            self.seed_spin = CompactSpinBox(self)
+            self.seed_spin.setRange(0, MAX_SEED)
+            self.seed_spin.setValue(new_seed())
+            self.seed_button = PushButton("换一个", self)
+            
+            self.controls_layout.addWidget(self.seed_label, 2, 0)
+            self.controls_layout.addWidget(self.seed_spin, 2, 1)
+            self.controls_layout.addWidget(self.seed_button, 2, 2)
+            
+            # 生成进度
+            self.progress_bar = ProgressBar(self)
+            self.progress_bar.setRange(0, 1000)
+            self.progress_label = BodyLabel("", self)
+            
+            self.controls_layout.addWidget(self.progress_bar, 3, 0, 1, 3)
+            self.controls_layout.addWidget(self.progress_label, 4, 0, 1, 3)
+            
+            self.flow_layout.addWidget(self.control_container)
+            
+            # 绘图区域
+            self.plot_widget = self.PlotWidget(self)
+            self.flow_layout.addWidget(self.plot_widget)
+            
+            self.builder = None
+            
+            # 连接信号
+            link_log_slider(self.steps_spin, self.steps_slider)
+            
+            self.experiment_combo.currentIndexChanged.connect(self.update_parameters)
+            self.steps_spin.valueChanged.connect(self.update_parameters)
+            self.seed_spin.valueChanged.connect(self.update_parameters)
+            self.seed_button.clicked.connect(lambda: self.seed_spin.setValue(new_seed()))
+            
+            cfg.themeChanged.connect(lambda: self.plot_widget.draw_axes())
+            
+            self.update_parameters()
+        
+        def update_parameters(self):
+            """参数变化后停止正在生成的历史，在后台线程中生成（或打开已有的）新历史"""
+            if self.builder is not None:
+                self.builder.stop()
+                self.builder.deleteLater()
+            experiment = self.PlotWidget.EXPERIMENTS[self.experiment_combo.currentIndex()]
+            steps = self.steps_spin.value()
+            self.plot_widget.update_plot(experiment=experiment, steps=steps)
+            self.progress_bar.setValue(0)
+            self.progress_label.setText("正在生成历史…")
+            self.builder = HistoryBuilder(experiment, steps, self.seed_spin.value(), self)
+            self.builder.progress.connect(self.on_progress)
+            self.builder.built.connect(self.on_built)
+            self.builder.failed.connect(self.on_failed)
+            self.builder.start()
+        
+        def on_progress(self, done, permille):
+            # 忽略已被替换的旧线程发出的信号
+            if self.sender() is not self.builder:
+                return
+            self.progress_bar.setValue(permille)
+            self.plot_widget.set_progress(done)
+        
+        def on_built(self, history):
+            if self.sender() is not self.builder:
+                return
+            self.progress_bar.setValue(1000)
+            self.progress_label.setText(f"已生成 {history.steps:,} 步")
+            self.plot_widget.update_plot(history=history)
+        
+        def on_failed(self, message):
+            if self.sender() is not self.builder:
+                return
+            self.progress_label.setText("")
+            TeachingTip.create(
+                target=self.progress_bar,
+                icon=InfoBarIcon.ERROR,
+                title='生成失败',
+                content=message,
+                isClosable=True
+            )
+        
+        def resizeEvent(self, event):
+            super().resizeEvent(event)
+            current_size = event.size()
+            self.windowResizeSignal.emit(current_size.width(), current_size.height())
+            event.accept()
+    
+    def __init__(self, parent=None):
+        # 创建工厂函数用于懒加载
+        def create_description_interface():
+            descriptionInterface = MarkdownKaTeXWidget()
+            descriptionInterface.set_markdown(self.desc)
+            return descriptionInterface
+        
+        def create_experiment_interface():
+            scroll_area = ScrollArea()
+            experimentInterface = LongRunHistory.ExpInterface()
+            scroll_area.setWidget(experimentInterface)
+            scroll_area.setWidgetResizable(True)
+            scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+            scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+            FluentStyleSheet.NAVIGATION_INTERFACE.apply(scroll_area)
+            return scroll_area
+        
+        super().__init__(
+            '长程频率历史',
+            descriptionFactory=create_description_interface,
+            experimentFactory=create_experiment_interface,
+            parent=parent
+        )
@@ -0,0 +1,385 @@
+import time
+
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QSizePolicy, QGridLayout
+)
+from qfluentwidgets import (
+    FlowLayout, Slider, CompactDoubleSpinBox, CompactSpinBox, isDarkTheme,
+    TitleLabel, BodyLabel, ScrollArea, FluentStyleSheet, ComboBox
+)
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+import numpy as np
+
+from .ExpWidget import ExpWidget
+from ..common.MarkdownKatex import MarkdownKaTeXWidget
+from ..common.config import cfg
+from ..common.distributions import CONTINUOUS_FAMILIES, default_params, freeze, ppf_table
+from ..common.mcmc import MetropolisHastings, log_density, effective_sample_size
+
+class MCMCSampling(ExpWidget):
+
+    desc = r"""
+# 马尔可夫链蒙特卡洛（Metropolis–Hastings）
+为了从密度为 $\pi(x)$ 的分布中抽样，构造一条以 $\pi$ 为平稳分布的马尔可夫链：
+
+1. 在当前状态 $x$ 处产生提议 $x' = x + \varepsilon, \ \varepsilon \sim \mathcal{N}(0, s^2)$；
+2. 以概率 $\min\left(1, \cfrac{\pi(x')}{\pi(x)}\right)$ 接受 $x'$，否则停留在 $x$。
+
+接受概率只依赖密度之比，因此 $\pi$ 只需已知到相差一个常数。链的初始部分（预烧期）尚未达到平稳，计算时予以舍弃。
+
+相邻状态之间存在相关性，$N$ 个样本所含的信息少于 $N$ 个独立样本，用**有效样本量**衡量：
+$$
+\text{ESS} = \cfrac{N}{1 + 2 \sum_{t=1}^{\infty} \rho_t}
+$$
+其中 $\rho_t$ 为链的 $t$ 阶自相关系数。步长 $s$ 过小时几乎总被接受但移动缓慢，过大时提议常被拒绝，两种情况下有效样本量都很低；
+对一维目标，$s$ 取目标标准差的 $2.4$ 倍左右较为合适，此时接受率约为 $44\%$。
+
+实验同时运行数百条链，所有链的状态保存在同一个数组中，每一步对全部链做一次向量化运算。
+上图为部分链的轨迹，下图为预烧期之后全部样本的直方图与精确密度。
+"""
+
+    class ExpInterface(ScrollArea):
+        windowResizeSignal = pyqtSignal(int, int)
+        
+        class PlotWidget(QWidget):
+            DIST_TYPES = list(CONTINUOUS_FAMILIES)
+            # 轨迹图中显示的链数
+            TRACE_CHAINS = 8
+            # 估计有效样本量所用的链数，以及运行期间只取最近的步数窗口
+            ESS_CHAINS = 64
+            ESS_WINDOW = 4096
+            # 每次定时器回调中推进的步数与计算时间上限
+            STEP_BATCH = 100
+            FRAME_BUDGET = 0.05
+            BINS = 80
+            
+            def __init__(self, parent=None):
+                super().__init__(parent)
+                
+                self.figure = Figure(figsize=(8, 6), dpi=100)
+                self.figure.patch.set_facecolor("none")
+                self.figure.patch.set_edgecolor("none")
+                self.canvas = FigureCanvas(self.figure)
+                self.canvas.setStyleSheet("background: transparent;")
+                self.canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+                
+                self.layout = QVBoxLayout(self)
+                self.layout.addWidget(self.canvas)
+                self.setLayout(self.layout)
+                
+                self.dist_type = 'normal'
+                self.chains = 200
+                self.scale = 2.4
+                self.steps = 5000
+                self.burn_in = 500
+                
+                self.animation_timer = QTimer(self)
+                self.animation_timer.timeout.connect(self.animate_plot)
+                
+                self.update_plot()
+                self.parent().windowResizeSignal.connect(self.onParentResize)
+            
+            def onParentResize(self, parent_width, parent_height):
+                """响应父控件大小变化"""
+                available_width = max(parent_width - 100, 400)
+                max_width = 800
+                width = min(available_width, max_width)
+                height = width * 3 / 4
+                
+                self.figure.set_size_inches(width / 100, height / 100)
+                self.canvas.draw()
+            
+            def update_plot(self, dist_type=None, chains=None, scale=None, steps=None, burn_in=None):
+                if dist_type is not None:
+                    self.dist_type = dist_type
+                if chains is not None:
+                    self.chains = chains
+                if scale is not None:
+                    self.scale = scale
+                if steps is not None:
+                    self.steps = steps
+                if burn_in is not None:
+                    self.burn_in = burn_in
+                # 至少保留一半的步数用于统计
+                self.burn = min(self.burn_in, self.steps // 2)
+                
+                self.params = default_params(self.dist_type)
+                self.dist = freeze(self.dist_type, self.params)
+                table = ppf_table(self.dist_type, self.params)
+                
+                # 初始状态分散在目标分布的 0.1% 到 99.9% 分位数之间，便于观察各链趋于平稳的过程
+                start = table.quantile(np.linspace(0.001, 0.999, self.chains))
+                self.sampler = MetropolisHastings(
+                    log_density(self.dist_type, self.params), start,
+                    self.scale * self.dist.std(), np.random.default_rng()
+                )
+                self.trace = np.empty((self.steps, self.chains), dtype=np.float32)
+                self.done_steps = 0
+                self.trace_index = np.unique(np.linspace(0, self.chains - 1, self.TRACE_CHAINS).astype(int))
+                self.ess_index = np.unique(np.linspace(0, self.chains - 1, self.ESS_CHAINS).astype(int))
+                self.ess = None
+                
+                # 直方图的分箱覆盖目标分布 99.8% 的概率质量
+                self.hist_edges = np.linspace(*table.quantile([0.001, 0.999]), self.BINS + 1)
+                self.hist_counts = np.zeros(self.BINS, dtype=np.int64)
+                
+                self.draw_axes()
+                
+                self.last_draw = 0.0
+                self.draw_time = 0.0
+                
+                # 开始动画
+                self.animation_timer.start(0)
+            
+            def draw_axes(self):
+                self.figure.clear()
+                self.ax_trace, self.ax_hist = self.figure.subplots(2, 1)
+                ax_trace, ax_hist = self.ax_trace, self.ax_hist
+                color = 'white' if isDarkTheme() else 'black'
+                
+                # 部分链的轨迹与预烧期
+                self.trace_lines = [ax_trace.plot([], [], linewidth=0.8, alpha=0.8)[0] for _ in self.trace_index]
+                if self.burn > 0:
+                    ax_trace.axvspan(0, self.burn, color='gray', alpha=0.2, label='预烧期')
+                    ax_trace.legend(loc='upper right')
+                ax_trace.set_xlim(0, self.steps)
+                lo, hi = self.hist_edges[0], self.hist_edges[-1]
+                margin = (hi - lo) * 0.1
+                ax_trace.set_ylim(lo - margin, hi + margin)
+                
+                # 预烧期之后全部样本的直方图与精确密度
+                bin_width = self.hist_edges[1] - self.hist_edges[0]
+                self.hist = ax_hist.stairs(np.zeros(self.BINS), self.hist_edges, fill=True, alpha=0.6,
+                                           color='tab:blue', label='MCMC 样本')
+                x = np.linspace(lo, hi, 400)
+                pdf = self.dist.pdf(x)
+                ax_hist.plot(x, pdf, color='red', linewidth=1.5, label='精确密度')
+                ax_hist.set_xlim(lo, hi)
+                ax_hist.set_ylim(0, max(pdf.max(), 1 / (self.BINS * bin_width)) * 1.3)
+                ax_hist.legend(loc='upper right')
+                
+                self.count_text = ax_hist.text(0.02, 0.95, '', transform=ax_hist.transAxes, color=color,
+                                               verticalalignment='top')
+                
+                for a in [ax_trace, ax_hist]:
+                    a.patch.set_alpha(0.1)
+                    for spine in a.spines.values():
+                        spine.set_color(color)
+                    a.tick_params(colors=color, which='both')
+                    a.grid(True, alpha=0.3 if isDarkTheme() else 0.7)
+                ax_trace.set_xlabel('步数', color=color)
+                ax_trace.set_ylabel('$x$', color=color)
+                ax_hist.set_ylabel('密度', color=color)
+                name = CONTINUOUS_FAMILIES[self.dist_type][0]
+                params = ', '.join(f'{k}={v}' for k, v in self.params.items())
+                ax_trace.set_title(f'Metropolis–Hastings: {name} ({params}), {self.chains} 条链', color=color)
+                
+                self.figure.tight_layout()
+                self.update_artists()
+                self.canvas.draw()
+            
+            def animate_plot(self):
+                if self.done_steps >= self.steps:
+                    self.animation_timer.stop()
+                    return
+                
+                # 每次定时器回调只计算约 FRAME_BUDGET 秒，保持界面响应
+                start = time.perf_counter()
+                while self.done_steps < self.steps and time.perf_counter() - start < self.FRAME_BUDGET:
+                    stop = min(self.done_steps + self.STEP_BATCH, self.steps)
+                    self.sampler.run(self.trace[self.done_steps:stop])
+                    # 只把预烧期之后的新样本计入直方图
+                    new = self.trace[max(self.done_steps, self.burn):stop].ravel()
+                    index = np.floor((new - self.hist_edges[0]) / (self.hist_edges[1] - self.hist_edges[0]))
+                    index = index[(index >= 0) & (index < self.BINS)].astype(np.intp)
+                    self.hist_counts += np.bincount(index, minlength=self.BINS)
+                    self.done_steps = stop
+                
+                # 有效样本量的计算与重绘较耗时，距上次重绘的时间不足其耗时的两倍时只计算不重绘
+                finished = self.done_steps >= self.steps
+                if not finished and time.perf_counter() - self.last_draw < 2 * self.draw_time:
+                    return
+                
+                start = time.perf_counter()
+                self.update_artists()
+                self.canvas.draw()
+                self.last_draw = time.perf_counter()
+                self.draw_time = self.last_draw - start
+            
+            def update_artists(self):
+                n = self.done_steps
+                steps = np.arange(n)
+                for line, chain in zip(self.trace_lines, self.trace_index):
+                    line.set_data(steps, self.trace[:n, chain])
+                
+                kept = max(n - self.burn, 0)
+                bin_width = self.hist_edges[1] - self.hist_edges[0]
+                if kept > 0:
+                    self.hist.set_data(self.hist_counts / (kept * self.chains * bin_width), self.hist_edges)
+                
+                text = f'已完成 {n:,} / {self.steps:,} 步\n接受率：{self.sampler.acceptance_rate:.1%}'
+                if kept >= 4:
+                    text += f'\n有效样本量：{self.estimate_ess(n, kept):,.0f} / {kept * self.chains:,}'
+                self.count_text.set_text(text)
+            
+            def estimate_ess(self, n, kept):
+                """
+                由部分链估计全部链的有效样本量
+                
+                有效样本量近似与链数、步数成正比：运行期间只用最近 ESS_WINDOW 步计算后按比例放大，
+                使每次重绘的开销与总步数、链数无关；全部完成后用预烧期之后的全部步数计算一次并缓存。
+                """
+                if self.ess is not None:
+                    return self.ess
+                finished = n >= self.steps
+                window = kept if finished else min(kept, self.ESS_WINDOW)
+                ess = effective_sample_size(self.trace[n - window:n, self.ess_index])
+                ess *= kept / window * self.chains / len(self.ess_index)
+                if finished:
+                    self.ess = ess
+                return ess
+        
+        def __init__(self, parent=None):
+            super().__init__(parent)
+            self.flow_layout = FlowLayout(self)
+            
+            self.control_container = QWidget()
+            self.control_container.setFixedWidth(400)
+            self.controls_layout = QGridLayout(self.control_container)
+            
+            # 目标分布选择
+            self.dist_label = BodyLabel("目标分布：", self)
+            self.dist_combo = ComboBox(self)
+            self.dist_combo.addItems([name for name, _ in CONTINUOUS_FAMILIES.values()])
+            self.dist_combo.setCurrentIndex(self.PlotWidget.DIST_TYPES.index('normal'))
+            
+            self.controls_layout.addWidget(self.dist_label, 0, 0)
+            self.controls_layout.addWidget(self.dist_combo, 0, 1, 1, 2)
+            
+            # 链数设置
+            self.chains_label = BodyLabel("链数：", self)
+            self.chains_spin = CompactSpinBox(self)
+            self.chains_spin.setRange(1, 1000)
+            self.chains_spin.setValue(200)
+            self.chains_slider = Slider(Qt.Horizontal, self)
+            self.chains_slider.setRange(1, 1000)
+            self.chains_slider.setSingleStep(10)
+            self.chains_slider.setValue(200)
+            
+            self.controls_layout.addWidget(self.chains_label, 1, 0)
+            self.controls_layout.addWidget(self.chains_spin, 1, 1)
+            self.controls_layout.addWidget(self.chains_slider, 1, 2)
+            
+            # 提议步长，以目标分布标准差为单位
+            self.scale_label = BodyLabel("s（步长/标准差）：", self)
+            self.scale_spin = CompactDoubleSpinBox(self)
+            self.scale_spin.setRange(0.1, 20)
+            self.scale_spin.setSingleStep(0.1)
+            self.scale_spin.setValue(2.4)
+            self.scale_slider = Slider(Qt.Horizontal, self)
+            self.scale_slider.setRange(1, 200)
+            self.scale_slider.setSingleStep(1)
+            self.scale_slider.setValue(24)
+            
+            self.controls_layout.addWidget(self.scale_label, 2, 0)
+            self.controls_layout.addWidget(self.scale_spin, 2, 1)
+            self.controls_layout.addWidget(self.scale_slider, 2, 2)
+            
+            # 总步数设置
+            self.steps_label = BodyLabel("步数：", self)
+            self.steps_spin = CompactSpinBox(self)
+            self.steps_spin.setRange(1000, 20000)
+            self.steps_spin.setSingleStep(1000)
+            self.steps_spin.setValue(5000)
+            self.steps_slider = Slider(Qt.Horizontal, self)
+            self.steps_slider.setRange(1000, 20000)
+            self.steps_slider.setSingleStep(1000)
+            self.steps_slider.setValue(5000)
+            
+            self.controls_layout.addWidget(self.steps_label, 3, 0)
+            self.controls_layout.addWidget(self.steps_spin, 3, 1)
+            self.controls_layout.addWidget(self.steps_slider, 3, 2)
+            
+            # 预烧期步数设置
+            self.burn_in_label = BodyLabel("预烧期步数：", self)
+            self.burn_in_spin = CompactSpinBox(self)
+            self.burn_in_spin.setRange(0, 10000)
+            self.burn_in_spin.setSingleStep(100)
+            self.burn_in_spin.setValue(500)
+            self.burn_in_slider = Slider(Qt.Horizontal, self)
+            self.burn_in_slider.setRange(0, 10000)
+            self.burn_in_slider.setSingleStep(100)
+            self.burn_in_slider.setValue(500)
+            
+            self.controls_layout.addWidget(self.burn_in_label, 4, 0)
+            self.controls_layout.addWidget(self.burn_in_spin, 4, 1)
+            self.controls_layout.addWidget(self.burn_in_slider, 4, 2)
+            
+            self.flow_layout.addWidget(self.control_container)
+            
+            # 绘图区域
+            self.plot_widget = self.PlotWidget(self)
+            self.flow_layout.addWidget(self.plot_widget)
+            
+            # 连接信号
+            self.chains_spin.valueChanged.connect(self.chains_slider.setValue)
+            self.chains_slider.valueChanged.connect(self.chains_spin.setValue)
+            self.scale_spin.valueChanged.connect(
+                lambda: self.scale_slider.setValue(int(round(self.scale_spin.value() * 10)))
+            )
+            self.scale_slider.valueChanged.connect(
+                lambda: self.scale_spin.setValue(self.scale_slider.value() / 10)
+            )
+            self.steps_spin.valueChanged.connect(self.steps_slider.setValue)
+            self.steps_slider.valueChanged.connect(self.steps_spin.setValue)
+            self.burn_in_spin.valueChanged.connect(self.burn_in_slider.setValue)
+            self.burn_in_slider.valueChanged.connect(self.burn_in_spin.setValue)
+            
+            self.dist_combo.currentIndexChanged.connect(self.update_parameters)
+            self.chains_spin.valueChanged.connect(self.update_parameters)
+            self.scale_spin.valueChanged.connect(self.update_parameters)
+            self.steps_spin.valueChanged.connect(self.update_parameters)
+            self.burn_in_spin.valueChanged.connect(self.update_parameters)
+            
+            cfg.themeChanged.connect(self.update_parameters)
+        
+        def update_parameters(self):
+            self.plot_widget.update_plot(
+                dist_type=self.PlotWidget.DIST_TYPES[self.dist_combo.currentIndex()],
+                chains=self.chains_spin.value(),
+                scale=self.scale_spin.value(),
+                steps=self.steps_spin.value(),
+                burn_in=self.burn_in_spin.value()
+            )
+        
+        def resizeEvent(self, event):
+            super().resizeEvent(event)
+            current_size = event.size()
+            self.windowResizeSignal.emit(current_size.width(), current_size.height())
+            event.accept()
+    
+    def __init__(self, parent=None):
+        # 创建工厂函数用于懒加载
+        def create_description_interface():
+            descriptionInterface = MarkdownKaTeXWidget()
+            descriptionInterface.set_markdown(self.desc)
+            return descriptionInterface
+        
+        def create_experiment_interface():
+            scroll_area = ScrollArea()
+            experimentInterface = MCMCSampling.ExpInterface()
+            scroll_area.setWidget(experimentInterface)
+            scroll_area.setWidgetResizable(True)
+            scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+            scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+            FluentStyleSheet.NAVIGATION_INTERFACE.apply(scroll_area)
+            return scroll_area
+        
+        super().__init__(
+            'MCMC 抽样',
+            descriptionFactory=create_description_interface,
+            experimentFactory=create_experiment_interface,
+            parent=parent
+        )
@@ -21,6 +21,14 @@ from .TwoDimNorm import TwoDimNorm
 from .CoinTossingExperiment import CoinTossingExperiment
 from .DiscretePDF import DiscretePDF
 from .ContinuousPDF import ContinuousPDF
+from .GaltonBoard import GaltonBoard
+from .RandomWalk import RandomWalk
+from .PiEstimation import PiEstimation
+from .Bootstrap import Bootstrap
+from .MCMCSampling import MCMCSampling
+from .LawOfLargeNumbers import LawOfLargeNumbers
+from .DataFitting import DataFitting
+from .LongRunHistory import LongRunHistory
 from .Settings import SettingsInterface
 
 class Widget(QWidget):
@@ -59,6 +67,14 @@ class MainWindow(FluentWindow):
             'coin_tossing_experiment': lambda: CoinTossingExperiment(self),
             'continuous_pdf': lambda: ContinuousPDF(self),
             'discrete_pdf': lambda: DiscretePDF(self),
+            'galton_board': lambda: GaltonBoard(self),
+            'random_walk': lambda: RandomWalk(self),
+            'pi_estimation': lambda: PiEstimation(self),
+            'bootstrap': lambda: Bootstrap(self),
+            'mcmc_sampling': lambda: MCMCSampling(self),
+            'law_of_large_numbers': lambda: LawOfLargeNumbers(self),
+            'data_fitting': lambda: DataFitting(self),
+            'long_run_history': lambda: LongRunHistory(self),
         }
         
         # 存储已创建的界面
@@ -74,6 +90,7 @@ class MainWindow(FluentWindow):
         """获取现有界面或创建新界面（懒加载）"""
         if key not in self.created_interfaces:
             self.created_interfaces[key] = self.interface_factories[key]()
+            self.created_interfaces[key].routeKey = key
             self.stackedWidget.addWidget(self.created_interfaces[key])
         return self.created_interfaces[key]
 
@@ -94,6 +111,14 @@ class MainWindow(FluentWindow):
         self.addLazySubInterface('coin_tossing_experiment', FIF.ALBUM, '投币实验')
         self.addLazySubInterface('continuous_pdf', FIF.ALBUM, '连续型随机变量概率分布')
         self.addLazySubInterface('discrete_pdf', FIF.ALBUM, '离散型随机变量概率分布')
+        self.addLazySubInterface('galton_board', FIF.ALBUM, '高尔顿板实验')
+        self.addLazySubInterface('random_walk', FIF.ALBUM, '随机游走与布朗运动')
+        self.addLazySubInterface('pi_estimation', FIF.ALBUM, '蒙特卡洛法估计π')
+        self.addLazySubInterface('bootstrap', FIF.ALBUM, '自助法置信区间')
+        self.addLazySubInterface('mcmc_sampling', FIF.ALBUM, 'MCMC 抽样')
+        self.addLazySubInterface('law_of_large_numbers', FIF.ALBUM, '大数定律')
+        self.addLazySubInterface('data_fitting', FIF.ALBUM, '经验数据的分布拟合')
+        self.addLazySubInterface('long_run_history', FIF.ALBUM, '长程频率历史')
 
         self.navigationInterface.addSeparator()
         self.addSubInterface(self.settings, FIF.SETTING, '设置', NavigationItemPosition.BOTTOM)
@@ -4,7 +4,7 @@ from PyQt5.QtWidgets import (
 )
 from qfluentwidgets import (
     FlowLayout, Slider, CompactDoubleSpinBox, CompactSpinBox, isDarkTheme,
-    TitleLabel, BodyLabel, ScrollArea, FluentStyleSheet
+    TitleLabel, BodyLabel, ScrollArea, FluentStyleSheet, ComboBox, TogglePushButton
 )
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
@@ -14,6 +14,7 @@ import numpy as np
 from .ExpWidget import ExpWidget
 from ..common.MarkdownKatex import MarkdownKaTeXWidget
 from ..common.config import cfg
+from ..common.plotting import add_curve_family
 
 class OneDimNorm(ExpWidget):
     
@@ -49,6 +50,11 @@ $$
                 self.mu = 0
                 self.sigma = 1
                 
+                # 曲线族模式：固定另一个参数，扫描 μ 或 σ 得到一族密度曲线
+                self.family_mode = False
+                self.family_param = 'sigma'
+                self.family_size = 100
+                
                 self.update_plot(self.mu, self.sigma)
                 self.parent().windowResizeSignal.connect(self.onParentResize)
                 
@@ -64,8 +70,12 @@ $$
             def update_plot(self, mu=None, sigma=None):
                 if mu is None:
                     mu = self.mu
+                else:
+                    self.mu = mu
                 if sigma is None:
                     sigma = self.sigma
+                else:
+                    self.sigma = sigma
                 self.figure.clear()
                 ax = self.figure.add_subplot(111)
                 
@@ -78,7 +88,27 @@ $$
                 max_y = norm.pdf(mu, mu, 0.1)  # Maximum possible value for any normal distribution
                 y_max = min(max_y, 1.0)  # Cap the y-axis to make visualization better
                 
-                ax.plot(x, pdf, linewidth=2)
+                if self.family_mode:
+                    # 一次广播调用得到 (参数个数 × x 点数) 的密度矩阵，作为单个 LineCollection 绘制
+                    if self.family_param == 'sigma':
+                        values = np.linspace(0.1, 5, self.family_size)
+                        Y = norm.pdf(x[None, :], mu, values[:, None])
+                        symbol = 'σ'
+                    else:
+                        values = np.linspace(-10, 10, self.family_size)
+                        Y = norm.pdf(x[None, :], values[:, None], sigma)
+                        symbol = 'μ'
+                    collection = add_curve_family(ax, x, Y, values)
+                    cb = self.figure.colorbar(collection, ax=ax)
+                    color = 'white' if isDarkTheme() else 'black'
+                    cb.set_label(symbol, color=color)
+                    cb.ax.yaxis.set_tick_params(color=color)
+                    cb.outline.set_edgecolor(color)
+                    for text in cb.ax.get_yticklabels():
+                        text.set_color(color)
+                    ax.plot(x, pdf, linewidth=2, color=color)
+                else:
+                    ax.plot(x, pdf, linewidth=2)
                 
                 # Add coordinate axes
                 ax.axhline(0, color='black', linewidth=0.8)  # x-axis
@@ -149,6 +179,25 @@ $$
             self.control_layout.addWidget(self.sigma_spin, 1, 1)
             self.control_layout.addWidget(self.sigma_slider, 1, 2)
             
+            # 曲线族模式
+            self.family_toggle = TogglePushButton("曲线族模式", self)
+            self.family_param_combo = ComboBox(self)
+            self.family_param_combo.addItems(["扫描 σ", "扫描 μ"])
+            self.family_size_label = BodyLabel("曲线条数：", self)
+            self.family_size_spin = CompactSpinBox(self)
+            self.family_size_spin.setRange(50, 200)
+            self.family_size_spin.setValue(100)
+            self.family_size_slider = Slider(Qt.Horizontal, self)
+            self.family_size_slider.setRange(50, 200)
+            self.family_size_slider.setSingleStep(1)
+            self.family_size_slider.setValue(100)
+            
+            self.control_layout.addWidget(self.family_toggle, 2, 0)
+            self.control_layout.addWidget(self.family_param_combo, 2, 1, 1, 2)
+            self.control_layout.addWidget(self.family_size_label, 3, 0)
+            self.control_layout.addWidget(self.family_size_spin, 3, 1)
+            self.control_layout.addWidget(self.family_size_slider, 3, 2)
+            
             self.flow_layout.addWidget(self.control_container)
             
             # 绘图区域
@@ -174,7 +223,19 @@ $$
             self.mu_spin.valueChanged.connect(lambda: self.plot_widget.update_plot(mu=self.mu_spin.value(), sigma=self.sigma_spin.value()))
             self.sigma_spin.valueChanged.connect(lambda: self.plot_widget.update_plot(mu=self.mu_spin.value(), sigma=self.sigma_spin.value()))
             
+            self.family_size_spin.valueChanged.connect(self.family_size_slider.setValue)
+            self.family_size_slider.valueChanged.connect(self.family_size_spin.setValue)
+            self.family_toggle.toggled.connect(self.update_family)
+            self.family_param_combo.currentIndexChanged.connect(self.update_family)
+            self.family_size_spin.valueChanged.connect(self.update_family)
+            
             cfg.themeChanged.connect(lambda: self.plot_widget.update_plot())
+        
+        def update_family(self):
+            self.plot_widget.family_mode = self.family_toggle.isChecked()
+            self.plot_widget.family_param = 'sigma' if self.family_param_combo.currentIndex() == 0 else 'mu'
+            self.plot_widget.family_size = self.family_size_spin.value()
+            self.plot_widget.update_plot()
             
         def resizeEvent(self, event):
             super().resizeEvent(event)
@@ -0,0 +1,281 @@
+from functools import partial
+
+from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QSizePolicy, QGridLayout
+)
+from qfluentwidgets import (
+    FlowLayout, Slider, CompactDoubleSpinBox, CompactSpinBox, isDarkTheme,
+    TitleLabel, BodyLabel, ScrollArea, FluentStyleSheet, ComboBox
+)
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+import numpy as np
+
+from .ExpWidget import ExpWidget
+from ..common.MarkdownKatex import MarkdownKaTeXWidget
+from ..common.config import cfg
+from ..common.simulation import buffon_needle_hits, circle_hits
+from ..common.workers import BatchWorker
+from ..common.controls import link_log_slider
+
+class PiEstimation(ExpWidget):
+
+    desc = r"""
+# 蒙特卡洛法估计 $\pi$
+
+1. **蒲丰投针**：平面上画有间距为 $d$ 的平行线，向平面随机投掷长为 $l \ (l \le d)$ 的针，针与直线相交的概率为
+$$
+p = \cfrac{2l}{\pi d}
+$$
+投针 $n$ 次，相交 $m$ 次，以频率代替概率得到 $\hat\pi = \cfrac{2ln}{dm}$。
+2. **圆内投点**：在单位正方形内均匀投点，落入内切四分之一圆的概率为 $\cfrac{\pi}{4}$，故 $\hat\pi = \cfrac{4m}{n}$。
+
+由中心极限定理，估计误差 $\left| \hat\pi - \pi \right|$ 的量级为 $\cfrac{\sigma}{\sqrt{n}}$，在双对数坐标下表现为斜率为 $-\cfrac{1}{2}$ 的直线。
+实验在后台线程中分批投点，界面只保存累计的投点数与命中数。
+"""
+
+    class ExpInterface(ScrollArea):
+        windowResizeSignal = pyqtSignal(int, int)
+        
+        class PlotWidget(QWidget):
+            METHODS = ['buffon', 'circle']
+            
+            def __init__(self, parent=None):
+                super().__init__(parent)
+                
+                self.figure = Figure(figsize=(8, 6), dpi=100)
+                self.figure.patch.set_facecolor("none")
+                self.figure.patch.set_edgecolor("none")
+                self.canvas = FigureCanvas(self.figure)
+                self.canvas.setStyleSheet("background: transparent;")
+                self.canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+                
+                self.layout = QVBoxLayout(self)
+                self.layout.addWidget(self.canvas)
+                self.setLayout(self.layout)
+                
+                self.method = 'buffon'
+                self.ratio = 0.8
+                self.n = 100000000
+                self.worker = None
+                
+                self.update_plot()
+                self.parent().windowResizeSignal.connect(self.onParentResize)
+            
+            def onParentResize(self, parent_width, parent_height):
+                """响应父控件大小变化"""
+                available_width = max(parent_width - 100, 400)
+                max_width = 800
+                width = min(available_width, max_width)
+                height = width * 3 / 4
+                
+                self.figure.set_size_inches(width / 100, height / 100)
+                self.canvas.draw()
+            
+            def estimate(self, n, hits):
+                if self.method == 'buffon':
+                    return 2 * self.ratio * n / hits if hits > 0 else np.nan
+                return 4 * hits / n
+            
+            def sigma(self):
+                """单次试验对应的估计量标准差，|π̂ - π| 约为 sigma/√n"""
+                if self.method == 'buffon':
+                    p = 2 * self.ratio / np.pi
+                    return np.pi * np.sqrt((1 - p) / p)
+                p = np.pi / 4
+                return 4 * np.sqrt(p * (1 - p))
+            
+            def update_plot(self, method=None, ratio=None, n=None):
+                if method is not None:
+                    self.method = method
+                if ratio is not None:
+                    self.ratio = ratio
+                if n is not None:
+                    self.n = n
+                
+                if self.worker is not None:
+                    self.worker.stop()
+                    self.worker.deleteLater()
+                
+                # 只保存每批结束时的累计量
+                self.history_n = []
+                self.history_estimate = []
+                self.draw_axes()
+                
+                rng = np.random.default_rng()
+                if self.method == 'buffon':
+                    batch = partial(buffon_needle_hits, rng, ratio=self.ratio)
+                else:
+                    batch = partial(circle_hits, rng)
+                batch_size = int(np.clip(self.n // 200, 1000, 1000000))
+                self.worker = BatchWorker(batch, self.n, batch_size, self)
+                self.worker.progress.connect(self.on_progress)
+                self.worker.start()
+            
+            def draw_axes(self):
+                self.figure.clear()
+                self.ax, self.ax_error = self.figure.subplots(2, 1, sharex=True)
+                ax, ax_error = self.ax, self.ax_error
+                color = 'white' if isDarkTheme() else 'black'
+                
+                n = np.geomspace(1000, max(self.n, 2000), 200)
+                half_width = 1.96 * self.sigma() / np.sqrt(n)
+                ax.fill_between(n, np.pi - half_width, np.pi + half_width, color='gray', alpha=0.3)
+                ax.axhline(np.pi, color='red', linestyle='--', label='$\\pi$')
+                self.estimate_line, = ax.plot([], [], color='tab:blue', linewidth=1.5, label='估计值 $\\hat\\pi$')
+                ax.set_xscale('log')
+                ax.set_xlim(n[0], n[-1])
+                ax.set_ylim(np.pi - half_width[0] * 1.5, np.pi + half_width[0] * 1.5)
+                ax.legend(loc='upper right')
+                
+                ax_error.plot(n, self.sigma() / np.sqrt(n), color='red', linestyle='--',
+                              label='$\\sigma / \\sqrt{n}$ 参考线')
+                self.error_line, = ax_error.plot([], [], color='tab:blue', linewidth=1.5, marker='.',
+                                                 markersize=3, label='$|\\hat\\pi - \\pi|$')
+                ax_error.set_xscale('log')
+                ax_error.set_yscale('log')
+                ax_error.set_ylim(self.sigma() / np.sqrt(n[-1]) / 100, self.sigma() / np.sqrt(n[0]) * 3)
+                ax_error.legend(loc='lower left')
+                
+                self.count_text = ax.text(0.02, 0.95, '', transform=ax.transAxes, color=color,
+                                          verticalalignment='top')
+                
+                for a in [ax, ax_error]:
+                    a.patch.set_alpha(0.1)
+                    for spine in a.spines.values():
+                        spine.set_color(color)
+                    a.tick_params(colors=color, which='both')
+                    a.grid(True, alpha=0.3 if isDarkTheme() else 0.7)
+                ax.set_ylabel('$\\hat\\pi$', color=color)
+                ax_error.set_ylabel('误差', color=color)
+                ax_error.set_xlabel('投点次数 $n$', color=color)
+                name = f'蒲丰投针 ($l/d={self.ratio}$)' if self.method == 'buffon' else '圆内投点'
+                ax.set_title(f'蒙特卡洛法估计 $\\pi$: {name}', color=color)
+                
+                self.figure.tight_layout()
+                self.update_lines()
+                self.canvas.draw()
+            
+            def on_progress(self, n, hits):
+                # 忽略参数变化前旧线程已发出、尚未处理的进度
+                if self.sender() is not self.worker:
+                    return
+                self.history_n.append(n)
+                self.history_estimate.append(self.estimate(n, hits))
+                self.update_lines()
+                self.canvas.draw_idle()
+            
+            def update_lines(self):
+                estimate = np.asarray(self.history_estimate)
+                self.estimate_line.set_data(self.history_n, estimate)
+                self.error_line.set_data(self.history_n, np.abs(estimate - np.pi))
+                if self.history_n:
+                    self.count_text.set_text(f'n = {self.history_n[-1]:,}, $\\hat\\pi$ = {estimate[-1]:.6f}')
+        
+        def __init__(self, parent=None):
+            super().__init__(parent)
+            self.flow_layout = FlowLayout(self)
+            
+            self.control_container = QWidget()
+            self.control_container.setFixedWidth(400)
+            self.controls_layout = QGridLayout(self.control_container)
+            
+            # 估计方法选择
+            self.method_label = BodyLabel("方法：", self)
+            self.method_combo = ComboBox(self)
+            self.method_combo.addItems(["蒲丰投针", "圆内投点"])
+            
+            self.controls_layout.addWidget(self.method_label, 0, 0)
+            self.controls_layout.addWidget(self.method_combo, 0, 1, 1, 2)
+            
+            # 针长与线距之比
+            self.ratio_label = BodyLabel("l/d（针长/线距）：", self)
+            self.ratio_spin = CompactDoubleSpinBox(self)
+            self.ratio_spin.setRange(0.1, 1)
+            self.ratio_spin.setSingleStep(0.01)
+            self.ratio_spin.setValue(0.8)
+            self.ratio_slider = Slider(Qt.Horizontal, self)
+            self.ratio_slider.setRange(10, 100)
+            self.ratio_slider.setSingleStep(1)
+            self.ratio_slider.setValue(80)
+            
+            self.controls_layout.addWidget(self.ratio_label, 1, 0)
+            self.controls_layout.addWidget(self.ratio_spin, 1, 1)
+            self.controls_layout.addWidget(self.ratio_slider, 1, 2)
+            
+            # 投点次数，跨越多个数量级，滑块取 10 倍的常用对数
+            self.n_label = BodyLabel("n（投点次数）：", self)
+            self.n_spin = CompactSpinBox(self)
+            self.n_spin.setRange(10000, 1000000000)
+            self.n_spin.setSingleStep(10000)
+            self.n_spin.setValue(100000000)
+            self.n_slider = Slider(Qt.Horizontal, self)
+            self.n_slider.setRange(40, 90)
+            self.n_slider.setSingleStep(1)
+            self.n_slider.setValue(80)
+            
+            self.controls_layout.addWidget(self.n_label, 2, 0)
+            self.controls_layout.addWidget(self.n_spin, 2, 1)
+            self.controls_layout.addWidget(self.n_slider, 2, 2)
+            
+            self.flow_layout.addWidget(self.control_container)
+            
+            # 绘图区域
+            self.plot_widget = self.PlotWidget(self)
+            self.flow_layout.addWidget(self.plot_widget)
+            
+            # 连接信号
+            self.ratio_spin.valueChanged.connect(
+                lambda: self.ratio_slider.setValue(int(round(self.ratio_spin.value() * 100)))
+            )
+            self.ratio_slider.valueChanged.connect(
+                lambda: self.ratio_spin.setValue(self.ratio_slider.value() / 100)
+            )
+            link_log_slider(self.n_spin, self.n_slider)
+            
+            self.method_combo.currentIndexChanged.connect(self.update_parameters)
+            self.ratio_spin.valueChanged.connect(self.update_parameters)
+            self.n_spin.valueChanged.connect(self.update_parameters)
+            
+            cfg.themeChanged.connect(lambda: self.plot_widget.draw_axes())
+        
+        def update_parameters(self):
+            method = self.PlotWidget.METHODS[self.method_combo.currentIndex()]
+            for widget in [self.ratio_label, self.ratio_spin, self.ratio_slider]:
+                widget.setVisible(method == 'buffon')
+            self.plot_widget.update_plot(
+                method=method,
+                ratio=self.ratio_spin.value(),
+                n=self.n_spin.value()
+            )
+        
+        def resizeEvent(self, event):
+            super().resizeEvent(event)
+            current_size = event.size()
+            self.windowResizeSignal.emit(current_size.width(), current_size.height())
+            event.accept()
+    
+    def __init__(self, parent=None):
+        # 创建工厂函数用于懒加载
+        def create_description_interface():
+            descriptionInterface = MarkdownKaTeXWidget()
+            descriptionInterface.set_markdown(self.desc)
+            return descriptionInterface
+        
+        def create_experiment_interface():
+            scroll_area = ScrollArea()
+            experimentInterface = PiEstimation.ExpInterface()
+            scroll_area.setWidget(experimentInterface)
+            scroll_area.setWidgetResizable(True)
+            scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+            scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+            FluentStyleSheet.NAVIGATION_INTERFACE.apply(scroll_area)
+            return scroll_area
+        
+        super().__init__(
+            '蒙特卡洛法估计π',
+            descriptionFactory=create_description_interface,
+            experimentFactory=create_experiment_interface,
+            parent=parent
+        )
@@ -0,0 +1,276 @@
+import time
+
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QSizePolicy, QGridLayout
+)
+from qfluentwidgets import (
+    FlowLayout, Slider, CompactDoubleSpinBox, CompactSpinBox, isDarkTheme,
+    TitleLabel, BodyLabel, ScrollArea, FluentStyleSheet, ComboBox
+)
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.collections import LineCollection
+from scipy.stats import norm
+import numpy as np
+
+from .ExpWidget import ExpWidget
+from ..common.MarkdownKatex import MarkdownKaTeXWidget
+from ..common.config import cfg
+from ..common.randomwalk import RandomWalkEnsemble
+from ..common.controls import link_log_slider
+
+class RandomWalk(ExpWidget):
+
+    desc = r"""
+# 随机游走与布朗运动
+设 $X_1, X_2, \ldots$ 独立同分布，$\mathbb{E} X_i = 0, \ \mathbb{D} X_i = 1$，称部分和
+$$
+S_n = X_1 + X_2 + \cdots + X_n
+$$
+构成的序列为随机游走。若 $P(X_i = 1) = P(X_i = -1) = \frac{1}{2}$，称为简单随机游走；
+若 $X_i \sim \mathcal{N}(0, 1)$，则 $S_n$ 为布朗运动在整数时刻的取值。
+
+1. $\mathbb{E} S_n = 0, \ \mathbb{D} S_n = n$，路径的典型波动幅度为 $\sqrt{n}$，图中虚线为 $\pm\sqrt{n}$、$\pm 2\sqrt{n}$ 包络；
+2. 由中心极限定理，$S_n$ 近似服从 $\mathcal{N}(0, n)$，右侧为各路径终点的直方图与对应的正态密度。
+
+路径按绘图区的像素宽度抽稀，每个像素列只保留路径在该列内的最小值与最大值，因此可以同时显示上千条长达 $10^6$ 步的路径。
+"""
+
+    class ExpInterface(ScrollArea):
+        windowResizeSignal = pyqtSignal(int, int)
+        
+        class PlotWidget(QWidget):
+            KINDS = ['walk', 'brownian']
+            FRAME_BUDGET = 0.1
+            
+            def __init__(self, parent=None):
+                super().__init__(parent)
+                
+                self.figure = Figure(figsize=(8, 6), dpi=100)
+                self.figure.patch.set_facecolor("none")
+                self.figure.patch.set_edgecolor("none")
+                self.canvas = FigureCanvas(self.figure)
+                self.canvas.setStyleSheet("background: transparent;")
+                self.canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+                
+                self.layout = QVBoxLayout(self)
+                self.layout.addWidget(self.canvas)
+                self.setLayout(self.layout)
+                
+                self.kind = 'walk'
+                self.paths = 500
+                self.steps = 10000
+                
+                self.animation_timer = QTimer(self)
+                self.animation_timer.timeout.connect(self.animate_plot)
+                
+                self.update_plot()
+                self.parent().windowResizeSignal.connect(self.onParentResize)
+            
+            def onParentResize(self, parent_width, parent_height):
+                """响应父控件大小变化"""
+                available_width = max(parent_width - 100, 400)
+                max_width = 800
+                width = min(available_width, max_width)
+                height = width * 3 / 4
+                
+                self.figure.set_size_inches(width / 100, height / 100)
+                self.canvas.draw()
+            
+            def update_plot(self, kind=None, paths=None, steps=None):
+                if kind is not None:
+                    self.kind = kind
+                if paths is not None:
+                    self.paths = paths
+                if steps is not None:
+                    self.steps = steps
+                
+                self.draw_axes()
+                # 列数取路径图的像素宽度，更细的抽稀在屏幕上无法分辨
+                columns = int(self.ax.get_window_extent().width)
+                self.ensemble = RandomWalkEnsemble(np.random.default_rng(), self.paths, self.steps,
+                                                   columns, self.kind)
+                
+                self.last_draw = 0.0
+                self.draw_time = 0.0
+                
+                # 开始动画
+                self.animation_timer.start(0)
+            
+            def draw_axes(self):
+                self.figure.clear()
+                self.ax, self.ax_hist = self.figure.subplots(
+                    1, 2, sharey=True, gridspec_kw={'width_ratios': [4, 1], 'wspace': 0.05}
+                )
+                ax, ax_hist = self.ax, self.ax_hist
+                steps = self.steps
+                color = 'white' if isDarkTheme() else 'black'
+                
+                alpha = float(np.clip(30 / self.paths, 0.03, 0.6))
+                self.collection = LineCollection([], linewidths=0.5, colors='tab:blue', alpha=alpha)
+                ax.add_collection(self.collection)
+                
+                # ±√n 与 ±2√n 包络
+                x = np.linspace(0, steps, 400)
+                for k in [1, 2]:
+                    ax.plot(x, k * np.sqrt(x), color='red', linestyle='--', linewidth=1.2)
+                    ax.plot(x, -k * np.sqrt(x), color='red', linestyle='--', linewidth=1.2)
+                
+                limit = 4 * np.sqrt(steps)
+                ax.set_xlim(0, steps)
+                ax.set_ylim(-limit, limit)
+                
+                # 终点直方图与正态密度
+                self.hist_edges = np.linspace(-limit, limit, 61)
+                self.hist = ax_hist.stairs(np.zeros(60), self.hist_edges, orientation='horizontal',
+                                           fill=True, alpha=0.6, color='tab:blue')
+                self.density_line, = ax_hist.plot([], [], color='red', linewidth=1.5)
+                ax_hist.set_xlim(0, 1.3 / np.sqrt(2 * np.pi * steps))
+                ax_hist.set_xticks([])
+                
+                self.count_text = ax.text(0.02, 0.97, '', transform=ax.transAxes, color=color,
+                                          verticalalignment='top')
+                
+                for a in [ax, ax_hist]:
+                    a.patch.set_alpha(0.1)
+                    for spine in a.spines.values():
+                        spine.set_color(color)
+                    a.tick_params(colors=color, which='both')
+                ax.grid(True, alpha=0.3 if isDarkTheme() else 0.7)
+                ax.set_xlabel('步数 $n$', color=color)
+                ax.set_ylabel('$S_n$', color=color)
+                ax_hist.set_xlabel('终点分布', color=color)
+                name = '简单随机游走' if self.kind == 'walk' else '布朗运动'
+                ax.set_title(f'{name}: {self.paths} 条路径, {steps} 步', color=color)
+                
+                self.figure.subplots_adjust(left=0.1, right=0.97, top=0.93, bottom=0.1)
+                self.canvas.draw()
+            
+            def animate_plot(self):
+                ensemble = self.ensemble
+                if ensemble.finished:
+                    self.animation_timer.stop()
+                    return
+                
+                # 每次定时器回调只计算约 FRAME_BUDGET 秒，保持界面响应
+                start = time.perf_counter()
+                while not ensemble.finished and time.perf_counter() - start < self.FRAME_BUDGET:
+                    ensemble.advance()
+                
+                # 路径较多时重绘本身很耗时，距上次重绘的时间不足重绘耗时的两倍时只计算不重绘
+                if not ensemble.finished and time.perf_counter() - self.last_draw < 2 * self.draw_time:
+                    return
+                
+                self.collection.set_segments(ensemble.segments())
+                n = ensemble.done_steps
+                counts, _ = np.histogram(ensemble.position, bins=self.hist_edges)
+                bin_width = self.hist_edges[1] - self.hist_edges[0]
+                self.hist.set_data(counts / (self.paths * bin_width), self.hist_edges)
+                y = np.linspace(self.hist_edges[0], self.hist_edges[-1], 400)
+                self.density_line.set_data(norm.pdf(y, scale=np.sqrt(n)), y)
+                self.count_text.set_text(f'已模拟 {n:,} / {self.steps:,} 步')
+                
+                start = time.perf_counter()
+                self.canvas.draw()
+                self.last_draw = time.perf_counter()
+                self.draw_time = self.last_draw - start
+        
+        def __init__(self, parent=None):
+            super().__init__(parent)
+            self.flow_layout = FlowLayout(self)
+            
+            self.control_container = QWidget()
+            self.control_container.setFixedWidth(400)
+            self.controls_layout = QGridLayout(self.control_container)
+            
+            # 增量分布选择
+            self.kind_label = BodyLabel("模型：", self)
+            self.kind_combo = ComboBox(self)
+            self.kind_combo.addItems(["简单随机游走", "布朗运动"])
+            
+            self.controls_layout.addWidget(self.kind_label, 0, 0)
+            self.controls_layout.addWidget(self.kind_combo, 0, 1, 1, 2)
+            
+            # 路径条数设置
+            self.paths_label = BodyLabel("路径条数：", self)
+            self.paths_spin = CompactSpinBox(self)
+            self.paths_spin.setRange(10, 5000)
+            self.paths_spin.setValue(500)
+            self.paths_slider = Slider(Qt.Horizontal, self)
+            self.paths_slider.setRange(10, 5000)
+            self.paths_slider.setSingleStep(10)
+            self.paths_slider.setValue(500)
+            
+            self.controls_layout.addWidget(self.paths_label, 1, 0)
+            self.controls_layout.addWidget(self.paths_spin, 1, 1)
+            self.controls_layout.addWidget(self.paths_slider, 1, 2)
+            
+            # 步数设置，跨越多个数量级，滑块取 10 倍的常用对数
+            self.steps_label = BodyLabel("n（步数）：", self)
+            self.steps_spin = CompactSpinBox(self)
+            self.steps_spin.setRange(100, 1000000)
+            self.steps_spin.setSingleStep(100)
+            self.steps_spin.setValue(10000)
+            self.steps_slider = Slider(Qt.Horizontal, self)
+            self.steps_slider.setRange(20, 60)
+            self.steps_slider.setSingleStep(1)
+            self.steps_slider.setValue(40)
+            
+            self.controls_layout.addWidget(self.steps_label, 2, 0)
+            self.controls_layout.addWidget(self.steps_spin, 2, 1)
+            self.controls_layout.addWidget(self.steps_slider, 2, 2)
+            
+            self.flow_layout.addWidget(self.control_container)
+            
+            # 绘图区域
+            self.plot_widget = self.PlotWidget(self)
+            self.flow_layout.addWidget(self.plot_widget)
+            
+            # 连接信号
+            self.paths_spin.valueChanged.connect(self.paths_slider.setValue)
+            self.paths_slider.valueChanged.connect(self.paths_spin.setValue)
+            link_log_slider(self.steps_spin, self.steps_slider)
+            
+            self.kind_combo.currentIndexChanged.connect(self.update_parameters)
+            self.paths_spin.valueChanged.connect(self.update_parameters)
+            self.steps_spin.valueChanged.connect(self.update_parameters)
+            
+            cfg.themeChanged.connect(self.update_parameters)
+        
+        def update_parameters(self):
+            self.plot_widget.update_plot(
+                kind=self.PlotWidget.KINDS[self.kind_combo.currentIndex()],
+                paths=self.paths_spin.value(),
+                steps=self.steps_spin.value()
+            )
+        
+        def resizeEvent(self, event):
+            super().resizeEvent(event)
+            current_size = event.size()
+            self.windowResizeSignal.emit(current_size.width(), current_size.height())
+            event.accept()
+    
+    def __init__(self, parent=None):
+        # 创建工厂函数用于懒加载
+        def create_description_interface():
+            descriptionInterface = MarkdownKaTeXWidget()
+            descriptionInterface.set_markdown(self.desc)
+            return descriptionInterface
+        
+        def create_experiment_interface():
+            scroll_area = ScrollArea()
+            experimentInterface = RandomWalk.ExpInterface()
+            scroll_area.setWidget(experimentInterface)
+            scroll_area.setWidgetResizable(True)
+            scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+            scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+            FluentStyleSheet.NAVIGATION_INTERFACE.apply(scroll_area)
+            return scroll_area
+        
+        super().__init__(
+            '随机游走与布朗运动',
+            descriptionFactory=create_description_interface,
+            experimentFactory=create_experiment_interface,
+            parent=parent
+        )
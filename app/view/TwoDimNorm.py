@@ -1,10 +1,10 @@
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QSizePolicy, QGridLayout
 )
 from qfluentwidgets import (
     FlowLayout, Slider, CompactDoubleSpinBox, CompactSpinBox, isDarkTheme,
-    TitleLabel, BodyLabel, ScrollArea, FluentStyleSheet
+    TitleLabel, BodyLabel, ScrollArea, FluentStyleSheet, TogglePushButton
 )
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
@@ -15,6 +15,9 @@ import numpy as np
 from .ExpWidget import ExpWidget
 from ..common.MarkdownKatex import MarkdownKaTeXWidget
 from ..common.config import cfg
+from ..common.histogram import Histogram2D, sample_bivariate_normal
+from ..common.controls import link_log_slider
+from ..common.framecache import CachedCanvas
 
 class TwoDimNorm(ExpWidget):
     
@@ -36,6 +39,9 @@ $$
 
 其中 $-\infty < \mu_1, \mu_2 < + \infty, \quad \sigma_1^2 > 0, \quad \sigma_2^2 > 0, \quad \left| \rho \right| < 1$，则称随机向量 $(X, Y)$ 服从参数为 $\mu_1, \mu_2, \sigma_1, \sigma_2, \rho$ 的二维正态分布，记作
 $(X, Y) \sim \mathcal{N}(\mu_1, \mu_2, \sigma_1, \sigma_2, \rho)$
+
+抽样模式下，程序由协方差矩阵的 Cholesky 分解 $\Sigma = LL^T$ 生成相关样本 $(X, Y)^T = \mu + LZ$，
+其中 $Z$ 的两个分量为相互独立的标准正态随机变量；样本的二维直方图随抽样逐步逼近理论密度，图中曲线为理论密度的 1σ、2σ、3σ 等高线。
 """
     
     class ExpInterface(ScrollArea):
@@ -48,7 +54,8 @@ $(X, Y) \sim \mathcal{N}(\mu_1, \mu_2, \sigma_1, \sigma_2, \rho)$
                 self.figure = Figure(figsize=(8, 6), dpi=100)
                 self.figure.patch.set_facecolor("none")
                 self.figure.patch.set_edgecolor("none")
-                self.canvas = FigureCanvas(self.figure)
+                # 曲面绘制较慢，来回拖动滑块时复用已渲染的图像
+                self.canvas = CachedCanvas(self.figure, self.update_plot)
                 self.canvas.setStyleSheet("background: transparent;")
                 self.canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
                 
@@ -84,6 +91,11 @@ $(X, Y) \sim \mathcal{N}(\mu_1, \mu_2, \sigma_1, \sigma_2, \rho)$
                     self.elev = self.ax.elev
                     self.azim = self.ax.azim
                 
+                key = self.canvas.key('two_dim_norm', self.mu1, self.mu2, self.sigma1, self.sigma2, self.rho,
+                                      self.elev, self.azim)
+                if self.canvas.show_cached(key):
+                    return
+                
                 self.figure.clear()
                 self.ax = self.figure.add_subplot(111, projection='3d')
                 
@@ -156,6 +168,120 @@ $(X, Y) \sim \mathcal{N}(\mu_1, \mu_2, \sigma_1, \sigma_2, \rho)$
                 
                 self.figure.tight_layout()
                 self.canvas.draw()
+                self.canvas.store(key)
+
+        class SamplingWidget(QWidget):
+            """
+            抽样密度图：分批生成相关正态样本并累加到固定网格的二维直方图中，
+            每批之后只更新图像数据，不保留样本本身
+            """
+            progressChanged = pyqtSignal(str)
+            
+            BINS = 200
+            BATCH_SIZE = 1 << 19
+            
+            def __init__(self, parent=None):
+                super().__init__(parent)
+                
+                self.figure = Figure(figsize=(8, 6), dpi=100)
+                self.figure.patch.set_facecolor("none")
+                self.figure.patch.set_edgecolor("none")
+                self.canvas = FigureCanvas(self.figure)
+                self.canvas.setStyleSheet("background: transparent;")
+                self.canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+                
+                self.layout = QVBoxLayout(self)
+                self.layout.addWidget(self.canvas)
+                self.setLayout(self.layout)
+                
+                self.mu1 = 0
+                self.mu2 = 0
+                self.sigma1 = 1
+                self.sigma2 = 1
+                self.rho = 0
+                self.sample_size = 1000000
+                # 隐藏期间参数变化时只清空直方图，显示时再重画
+                self.stale = False
+                
+                self.timer = QTimer(self)
+                self.timer.setInterval(0)
+                self.timer.timeout.connect(self.sample_batch)
+                
+                self.reset()
+                self.parent().windowResizeSignal.connect(self.onParentResize)
+                
+            def onParentResize(self, parent_width, parent_height):
+                available_width = max(parent_width - 100, 400)
+                max_width = 800
+                width = min(available_width, max_width)
+                height = width * 3 / 4
+                
+                self.figure.set_size_inches(width / 100, height / 100)
+                self.canvas.draw()
+            
+            def covariance(self):
+                return np.array([[self.sigma1**2, self.rho*self.sigma1*self.sigma2],
+                                 [self.rho*self.sigma1*self.sigma2, self.sigma2**2]])
+            
+            def reset(self):
+                """参数变化后清空直方图并重新开始抽样"""
+                self.rng = np.random.default_rng()
+                self.histogram = Histogram2D((-5, 5), (-5, 5), self.BINS)
+                if self.isHidden():
+                    self.stale = True
+                else:
+                    self.update_plot()
+                if self.isVisible():
+                    self.timer.start()
+            
+            def stop(self):
+                self.timer.stop()
+            
+            def sample_batch(self):
+                remaining = self.sample_size - self.histogram.total
+                if remaining <= 0:
+                    self.timer.stop()
+                    return
+                x, y = sample_bivariate_normal(self.rng, (self.mu1, self.mu2), self.covariance(),
+                                               min(remaining, self.BATCH_SIZE))
+                self.histogram.add(x, y)
+                self.image.set_data(self.histogram.density())
+                self.image.autoscale()
+                self.canvas.draw_idle()
+                self.progressChanged.emit(f"已抽取 {self.histogram.total:,} / {self.sample_size:,} 个样本")
+            
+            def update_plot(self):
+                self.stale = False
+                self.figure.clear()
+                ax = self.figure.add_subplot(111)
+                
+                self.image = ax.imshow(self.histogram.density(), origin='lower', extent=self.histogram.extent,
+                                       cmap='viridis', interpolation='nearest', aspect='equal')
+                self.image.autoscale()
+                
+                # 理论密度的等高线取在马氏距离为 1、2、3 处
+                x = np.linspace(-5, 5, 200)
+                X, Y = np.meshgrid(x, x)
+                d = np.dstack((X - self.mu1, Y - self.mu2))
+                mahalanobis = np.sqrt(np.einsum('...i,ij,...j->...', d, np.linalg.inv(self.covariance()), d))
+                ax.contour(X, Y, mahalanobis, levels=[1, 2, 3], colors='white', linewidths=1, alpha=0.8)
+                
+                cb = self.figure.colorbar(self.image, ax=ax)
+                
+                color = 'white' if isDarkTheme() else 'black'
+                for spine in ax.spines.values():
+                    spine.set_color(color)
+                ax.tick_params(colors=color, which='both')
+                ax.set_xlabel('$X$', color=color)
+                ax.set_ylabel('$Y$', color=color)
+                ax.set_title(f'二维正态分布抽样密度 $(\\rho={self.rho:.2f})$', color=color)
+                cb.ax.yaxis.set_tick_params(color=color)
+                cb.outline.set_edgecolor(color)
+                for text in cb.ax.get_yticklabels():
+                    text.set_color(color)
+                
+                self.figure.tight_layout()
+                self.canvas.draw()
 
         def __init__(self, parent=None):
             super().__init__(parent)
@@ -240,12 +366,36 @@ $(X, Y) \sim \mathcal{N}(\mu_1, \mu_2, \sigma_1, \sigma_2, \rho)$
             self.control_layout.addWidget(self.rho_spin, 4, 1)
             self.control_layout.addWidget(self.rho_slider, 4, 2)
             
+            # 抽样模式
+            self.sampling_toggle = TogglePushButton("抽样模式", self)
+            self.sampling_label = BodyLabel("", self)
+            self.sample_size_label = BodyLabel("样本量：", self)
+            self.sample_size_spin = CompactSpinBox(self)
+            self.sample_size_spin.setRange(10000, 10000000)
+            self.sample_size_spin.setSingleStep(10000)
+            self.sample_size_spin.setValue(1000000)
+            # 样本量跨越多个数量级，滑块取 10 倍的常用对数
+            self.sample_size_slider = Slider(Qt.Horizontal, self)
+            self.sample_size_slider.setRange(40, 70)
+            self.sample_size_slider.setSingleStep(1)
+            self.sample_size_slider.setValue(60)
+            
+            self.control_layout.addWidget(self.sampling_toggle, 5, 0)
+            self.control_layout.addWidget(self.sampling_label, 5, 1, 1, 2)
+            self.control_layout.addWidget(self.sample_size_label, 6, 0)
+            self.control_layout.addWidget(self.sample_size_spin, 6, 1)
+            self.control_layout.addWidget(self.sample_size_slider, 6, 2)
+            
             self.flow_layout.addWidget(self.control_container)
             
             # 绘图区域
             self.plot_widget = self.PlotWidget(self)
             self.flow_layout.addWidget(self.plot_widget)
             
+            self.sampling_widget = self.SamplingWidget(self)
+            self.sampling_widget.setVisible(False)
+            self.flow_layout.addWidget(self.sampling_widget)
+            
             # 同步 slider 和 spinbox
             self.mu1_spin.valueChanged.connect(
                 lambda: self.mu1_slider.setValue(int(self.mu1_spin.value() * 100))
@@ -289,7 +439,13 @@ $(X, Y) \sim \mathcal{N}(\mu_1, \mu_2, \sigma_1, \sigma_2, \rho)$
             self.sigma2_spin.valueChanged.connect(lambda: self.update_parameters())
             self.rho_spin.valueChanged.connect(lambda: self.update_parameters())
             
+            link_log_slider(self.sample_size_spin, self.sample_size_slider)
+            self.sample_size_spin.valueChanged.connect(self.update_sample_size)
+            self.sampling_toggle.toggled.connect(self.toggle_sampling)
+            self.sampling_widget.progressChanged.connect(self.sampling_label.setText)
+            
             cfg.themeChanged.connect(lambda: self.plot_widget.update_plot())
+            cfg.themeChanged.connect(lambda: self.sampling_widget.update_plot())
             
         def update_parameters(self):
             self.plot_widget.mu1 = self.mu1_spin.value()
@@ -298,6 +454,27 @@ $(X, Y) \sim \mathcal{N}(\mu_1, \mu_2, \sigma_1, \sigma_2, \rho)$
             self.plot_widget.sigma2 = self.sigma2_spin.value()
             self.plot_widget.rho = self.rho_spin.value()
             self.plot_widget.update_plot()
+            
+            self.sampling_widget.mu1 = self.mu1_spin.value()
+            self.sampling_widget.mu2 = self.mu2_spin.value()
+            self.sampling_widget.sigma1 = self.sigma1_spin.value()
+            self.sampling_widget.sigma2 = self.sigma2_spin.value()
+            self.sampling_widget.rho = self.rho_spin.value()
+            self.sampling_widget.reset()
+        
+        def update_sample_size(self):
+            self.sampling_widget.sample_size = self.sample_size_spin.value()
+            if self.sampling_widget.isVisible():
+                self.sampling_widget.timer.start()
+        
+        def toggle_sampling(self, checked):
+            self.sampling_widget.setVisible(checked)
+            if checked:
+                if self.sampling_widget.stale:
+                    self.sampling_widget.update_plot()
+                self.sampling_widget.timer.start()
+            else:
+                self.sampling_widget.stop()
 
         def resizeEvent(self, event):
             super().resizeEvent(event)
@@ -1,10 +1,12 @@
-from PyQt5.QtCore import Qt, pyqtSignal
+import time
+
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QSizePolicy, QGridLayout
 )
 from qfluentwidgets import (
     FlowLayout, Slider, CompactDoubleSpinBox, CompactSpinBox, isDarkTheme,
-    TitleLabel, BodyLabel, ScrollArea, FluentStyleSheet
+    TitleLabel, BodyLabel, ScrollArea, FluentStyleSheet, TogglePushButton
 )
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
@@ -14,6 +16,10 @@ import numpy as np
 from .ExpWidget import ExpWidget
 from ..common.MarkdownKatex import MarkdownKaTeXWidget
 from ..common.config import cfg
+from ..common.hypothesis import (
+    critical_values, type_two_error, beta_surface, alpha_index, N_GRID, DELTA_GRID
+)
+from ..common.simulation import get_executor, worker_count, simulate_z_tests
 
 class TwoTypesOfErrors(ExpWidget):
     
@@ -27,6 +33,11 @@ $\alpha = P(\text{拒绝} H_0 | H_0 \text{为真})$；$\beta = P(\text{接受} H
 | --- | --- | --- |
 | 拒绝 $H_0$ | 第 I 类错误（概率为 $\alpha$） | 正确（概率为 $1-\beta$） |
 | 接受 $H_0$ | 正确（概率为 $1-\alpha$） | 第 II 类错误（概率为 $\beta$） | 
+
+功效曲面图给出当前 $\alpha$ 下检验功效 $1-\beta$ 随 $\mu_1$ 与样本量 $n$ 的变化，十字线标出当前参数。
+
+开启蒙特卡洛验证后，程序在 $H_0$ 与 $H_1$ 下分别模拟大量样本并实际执行检验，
+经验第一类、第二类错误率随检验次数增加收敛到理论值 $\alpha$ 与 $\beta$，阴影为理论值的 95% 波动范围。
 """
 
     class ExpInterface(ScrollArea):
@@ -50,6 +61,8 @@ $\alpha = P(\text{拒绝} H_0 | H_0 \text{为真})$；$\beta = P(\text{接受} H
                 self.alpha = 0.05
                 self.mu_0 = 0
                 self.mu_1 = 1
+                self.sigma = 1
+                self.n = 1
                 
                 self.update_plot(self.alpha, self.mu_0, self.mu_1)
                 self.parent().windowResizeSignal.connect(self.onParentResize)
@@ -64,24 +77,23 @@ $\alpha = P(\text{拒绝} H_0 | H_0 \text{为真})$；$\beta = P(\text{接受} H
                 self.figure.set_size_inches(width / 100, height / 100)
                 self.canvas.draw()
             
-            def update_plot(self, alpha=None, mu_0=None, mu_1=None):
+            def update_plot(self, alpha=None, mu_0=None, mu_1=None, sigma=None, n=None):
                 if alpha is None:
                     alpha = self.alpha
                 if mu_0 is None:
                     mu_0 = self.mu_0
                 if mu_1 is None:
                     mu_1 = self.mu_1
+                if sigma is None:
+                    sigma = self.sigma
+                if n is None:
+                    n = self.n
+                self.alpha, self.mu_0, self.mu_1, self.sigma, self.n = alpha, mu_0, mu_1, sigma, n
                 
                 self.figure.clear()
                 
-                # 设置标准差为1，简化演示
-                sigma = 1
-                n = 1  # 单个样本
-                
                 # 计算临界值
-                z_alpha_half = norm.ppf(1 - alpha/2)
-                critical_lower = mu_0 - z_alpha_half * sigma / np.sqrt(n)
-                critical_upper = mu_0 + z_alpha_half * sigma / np.sqrt(n)
+                critical_lower, critical_upper = critical_values(alpha, mu_0, sigma, n)
                 
                 # 设置x轴范围
                 x_range = max(abs(mu_0 - 3*sigma/np.sqrt(n)), abs(mu_1 + 3*sigma/np.sqrt(n)))
@@ -111,7 +123,7 @@ $\alpha = P(\text{拒绝} H_0 | H_0 \text{为真})$；$\beta = P(\text{接受} H
                 ax.fill_between(x_fill, 0, y_fill, alpha=0.4, color='blue')
                 
                 # 计算第二类错误概率（β错误）
-                beta = norm.cdf(critical_upper, mu_1, sigma/np.sqrt(n)) - norm.cdf(critical_lower, mu_1, sigma/np.sqrt(n))
+                beta = type_two_error(alpha, mu_0, mu_1, sigma, n)
                 
                 # 填充第二类错误区域
                 x_fill = np.linspace(critical_lower, critical_upper, 500)
@@ -124,7 +136,7 @@ $\alpha = P(\text{拒绝} H_0 | H_0 \text{为真})$；$\beta = P(\text{接受} H
                 
                 ax.set_xlabel('样本均值', fontsize=12)
                 ax.set_ylabel('概率密度', fontsize=12)
-                title = f'两类错误示意图: $\\alpha={alpha}, \\mu_0={mu_0}, \\mu_1={mu_1}$'
+                title = f'两类错误示意图: $\\alpha={alpha}, \\mu_0={mu_0}, \\mu_1={mu_1}, \\sigma={sigma}, n={n}$'
                 ax.set_title(title, fontsize=14)
                 
                 ax.grid(True, alpha=0.3)
@@ -149,6 +161,313 @@ $\alpha = P(\text{拒绝} H_0 | H_0 \text{为真})$；$\beta = P(\text{接受} H
                 self.figure.tight_layout()
                 self.canvas.draw()
 
+        class PowerWidget(QWidget):
+            """
+            功效曲面：在 (α, n, μ₁) 网格上一次算出 β 并按 σ 缓存，
+            滑块移动时只切换 α 切片、平移坐标范围或移动十字线，不重新计算网格
+            """
+            def __init__(self, parent=None):
+                super().__init__(parent)
+                
+                self.figure = Figure(figsize=(9, 6), dpi=100)
+                self.figure.patch.set_facecolor("none")
+                self.figure.patch.set_edgecolor("none")
+                self.canvas = FigureCanvas(self.figure)
+                self.canvas.setStyleSheet("background: transparent;")
+                self.canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+                
+                self.layout = QVBoxLayout(self)
+                self.layout.addWidget(self.canvas)
+                self.setLayout(self.layout)
+                
+                self.sigma = None
+                self.alpha = None
+                self.mu_0 = None
+                self.contours = None
+                
+                self.update_plot(0.05, 0, 1, 1, 1)
+                self.parent().windowResizeSignal.connect(self.onParentResize)
+                
+            def onParentResize(self, parent_width, parent_height):
+                """响应父控件大小变化"""
+                available_width = max(parent_width - 100, 400)
+                max_width = 900
+                width = min(available_width, max_width)
+                height = width * 2 / 3  # 2:3 宽高比
+                
+                self.figure.set_size_inches(width / 100, height / 100)
+                self.canvas.draw()
+            
+            def _extent(self, mu_0):
+                return (mu_0 + DELTA_GRID[0], mu_0 + DELTA_GRID[-1], N_GRID[0] - 0.5, N_GRID[-1] + 0.5)
+            
+            def _power_slice(self, alpha):
+                return 1 - beta_surface(self.sigma)[alpha_index(alpha)]
+            
+            def _draw_contours(self, power):
+                if self.contours is not None:
+                    self.contours.remove()
+                x = self.mu_0 + DELTA_GRID
+                self.contours = self.ax.contour(x, N_GRID, power, levels=[0.5, 0.8, 0.95],
+                                                colors='white', linewidths=1, alpha=0.8)
+            
+            def update_plot(self, alpha, mu_0, mu_1, sigma, n, force=False):
+                if force or sigma != self.sigma:
+                    # σ 变化时才重建整幅图，功效网格由 beta_surface 按 σ 缓存
+                    self.sigma, self.alpha, self.mu_0 = sigma, alpha, mu_0
+                    self._rebuild(mu_1, n)
+                    return
+                
+                if alpha != self.alpha or mu_0 != self.mu_0:
+                    self.alpha, self.mu_0 = alpha, mu_0
+                    power = self._power_slice(alpha)
+                    self.image.set_data(power)
+                    self.image.set_extent(self._extent(mu_0))
+                    self._draw_contours(power)
+                    self.ax.set_title(f'检验功效 $1-\\beta$ ($\\alpha={alpha}, \\mu_0={mu_0}, \\sigma={sigma}$)',
+                                      color='white' if isDarkTheme() else 'black')
+                
+                self.vline.set_xdata([mu_1, mu_1])
+                self.hline.set_ydata([n, n])
+                self.canvas.draw_idle()
+            
+            def _rebuild(self, mu_1, n):
+                self.figure.clear()
+                self.ax = self.figure.add_subplot(111)
+                self.contours = None
+                
+                power = self._power_slice(self.alpha)
+                self.image = self.ax.imshow(power, origin='lower', aspect='auto', cmap='viridis',
+                                            extent=self._extent(self.mu_0), vmin=0, vmax=1,
+                                            interpolation='nearest')
+                self._draw_contours(power)
+                self.vline = self.ax.axvline(mu_1, color='red', linewidth=1.5)
+                self.hline = self.ax.axhline(n, color='red', linewidth=1.5)
+                self.ax.set_xlim(-5, 5)
+                self.ax.set_ylim(N_GRID[0] - 0.5, N_GRID[-1] + 0.5)
+                cb = self.figure.colorbar(self.image, ax=self.ax)
+                
+                color = 'white' if isDarkTheme() else 'black'
+                for spine in self.ax.spines.values():
+                    spine.set_color(color)
+                self.ax.tick_params(colors=color, which='both')
+                self.ax.set_xlabel('$\\mu_1$', color=color, fontsize=12)
+                self.ax.set_ylabel('样本量 $n$', color=color, fontsize=12)
+                self.ax.set_title(f'检验功效 $1-\\beta$ ($\\alpha={self.alpha}, \\mu_0={self.mu_0}, \\sigma={self.sigma}$)',
+                                  color=color, fontsize=14)
+                cb.ax.yaxis.set_tick_params(color=color)
+                cb.outline.set_edgecolor(color)
+                for text in cb.ax.get_yticklabels():
+                    text.set_color(color)
+                
+                self.figure.tight_layout()
+                self.canvas.draw()
+
+        class MonteCarloWidget(QWidget):
+            """
+            蒙特卡洛验证：将模拟任务按块分发到进程池，定时收集结果并更新收敛曲线
+            """
+            finished = pyqtSignal()
+            statusChanged = pyqtSignal(str)
+            
+            # 每个任务在 H0、H1 下各模拟的检验次数，以及单次运行的检验总数上限
+            CHUNK_SIZE = 1 << 22
+            MAX_TESTS = 1 << 30
+            
+            def __init__(self, parent=None):
+                super().__init__(parent)
+                
+                self.figure = Figure(figsize=(9, 6), dpi=100)
+                self.figure.patch.set_facecolor("none")
+                self.figure.patch.set_edgecolor("none")
+                self.canvas = FigureCanvas(self.figure)
+                self.canvas.setStyleSheet("background: transparent;")
+                self.canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+                
+                self.layout = QVBoxLayout(self)
+                self.layout.addWidget(self.canvas)
+                self.setLayout(self.layout)
+                
+                self.running = False
+                self.params = None
+                self.futures = []
+                # 参数变化时递增，丢弃旧参数下仍在运行的任务结果
+                self.generation = 0
+                self.seed_sequence = np.random.SeedSequence()
+                # 隐藏期间参数变化时只记录参数，显示时再重建图像
+                self.stale = False
+                
+                self.timer = QTimer(self)
+                self.timer.setInterval(100)
+                self.timer.timeout.connect(self.poll)
+                
+                self.set_parameters(0.05, 0, 1, 1, 1)
+                self.parent().windowResizeSignal.connect(self.onParentResize)
+            
+            def onParentResize(self, parent_width, parent_height):
+                """响应父控件大小变化"""
+                available_width = max(parent_width - 100, 400)
+                max_width = 900
+                width = min(available_width, max_width)
+                height = width * 2 / 3  # 2:3 宽高比
+                
+                self.figure.set_size_inches(width / 100, height / 100)
+                self.canvas.draw()
+            
+            def set_parameters(self, alpha, mu_0, mu_1, sigma, n, force=False):
+                params = (alpha, mu_0, mu_1, sigma, n)
+                if params == self.params:
+                    if force:
+                        self.refresh()
+                    return
+                self.params = params
+                
+                # H0 下样本均值标准化后的接受域为 (-z, z)，H1 下整体平移 shift
+                z = norm.ppf(1 - alpha / 2)
+                self.lower, self.upper = -z, z
+                self.shift = (mu_1 - mu_0) * np.sqrt(n) / sigma
+                self.alpha = alpha
+                self.beta = type_two_error(alpha, mu_0, mu_1, sigma, n)
+                self.reset()
+            
+            def reset(self):
+                self.generation += 1
+                for _, future in self.futures:
+                    future.cancel()
+                self.futures = []
+                self.submitted = 0
+                self.tests = 0
+                self.type_one = 0
+                self.type_two = 0
+                self.history = ([], [], [])
+                self.elapsed = 0.0
+                self.start_time = time.perf_counter()
+                self.refresh()
+                if self.running:
+                    self._submit()
+            
+            def refresh(self):
+                if self.isHidden():
+                    self.stale = True
+                else:
+                    self._rebuild()
+            
+            def start(self):
+                if self.running:
+                    return
+                self.running = True
+                if self.tests >= self.MAX_TESTS:
+                    self.reset()
+                self.start_time = time.perf_counter() - self.elapsed
+                self._submit()
+                self.timer.start()
+            
+            def stop(self):
+                if not self.running:
+                    return
+                self.running = False
+                self.timer.stop()
+                self.elapsed = time.perf_counter() - self.start_time
+                # 丢弃未完成的任务，已完成的结果保留在收敛曲线中
+                self.generation += 1
+                for _, future in self.futures:
+                    future.cancel()
+                self.futures = []
+                self.submitted = self.tests
+            
+            def _submit(self):
+                """保持进程池中每个工作进程约有两个待处理任务"""
+                executor = get_executor()
+                while len(self.futures) < 2 * worker_count() and self.submitted < self.MAX_TESTS:
+                    seed = self.seed_sequence.spawn(1)[0]
+                    future = executor.submit(simulate_z_tests, seed, self.CHUNK_SIZE,
+                                             self.lower, self.upper, self.shift)
+                    self.futures.append((self.generation, future))
+                    self.submitted += self.CHUNK_SIZE
+            
+            def poll(self):
+                pending = []
+                updated = False
+                for generation, future in self.futures:
+                    if not future.done():
+                        pending.append((generation, future))
+                        continue
+                    if generation != self.generation or future.cancelled():
+                        continue
+                    try:
+                        type_one, type_two = future.result()
+                    except Exception as e:
+                        # 任务出错（如工作进程异常退出）时停止模拟并取消其余任务，保留已完成的结果
+                        self.stop()
+                        self._update_lines()
+                        self.statusChanged.emit(f"模拟出错：{e}")
+                        self.finished.emit()
+                        return
+                    self.tests += self.CHUNK_SIZE
+                    self.type_one += type_one
+                    self.type_two += type_two
+                    self.history[0].append(self.tests)
+                    self.history[1].append(self.type_one / self.tests)
+                    self.history[2].append(self.type_two / self.tests)
+                    updated = True
+                self.futures = pending
+                
+                if updated:
+                    self._update_lines()
+                    elapsed = time.perf_counter() - self.start_time
+                    rate = 2 * self.tests / max(elapsed, 1e-9)
+                    self.statusChanged.emit(
+                        f"已完成 {2 * self.tests:,} 次检验，{rate / 1e6:.1f} 百万次/秒"
+                    )
+                
+                if self.tests >= self.MAX_TESTS:
+                    self.stop()
+                    self.finished.emit()
+                else:
+                    self._submit()
+            
+            def _update_lines(self):
+                tests, type_one, type_two = self.history
+                self.alpha_line.set_data(tests, type_one)
+                self.beta_line.set_data(tests, type_two)
+                self.canvas.draw_idle()
+            
+            def _rebuild(self):
+                self.stale = False
+                self.figure.clear()
+                self.ax_alpha = self.figure.add_subplot(211)
+                self.ax_beta = self.figure.add_subplot(212, sharex=self.ax_alpha)
+                color = 'white' if isDarkTheme() else 'black'
+                
+                # 理论值及其 95% 波动范围 p ± 1.96·sqrt(p(1-p)/N)
+                counts = np.geomspace(self.CHUNK_SIZE, self.MAX_TESTS, 200)
+                lines = []
+                for ax, p, label in [(self.ax_alpha, self.alpha, '第 I 类错误率'),
+                                     (self.ax_beta, self.beta, '第 II 类错误率')]:
+                    half_width = 1.96 * np.sqrt(p * (1 - p) / counts)
+                    ax.fill_between(counts, p - half_width, p + half_width, color='gray', alpha=0.3)
+                    ax.axhline(p, color='red', linestyle='--', linewidth=1.5, label=f'理论值 {p:.6f}')
+                    line, = ax.plot([], [], color='tab:blue', linewidth=1.5, marker='.', label='经验值')
+                    lines.append(line)
+                    ax.set_xscale('log')
+                    ax.set_xlim(self.CHUNK_SIZE, self.MAX_TESTS)
+                    margin = max(4 * half_width[0], 1e-4)
+                    ax.set_ylim(max(p - margin, 0), min(p + margin, 1))
+                    ax.grid(True, alpha=0.3)
+                    ax.patch.set_alpha(0.1)
+                    for spine in ax.spines.values():
+                        spine.set_color(color)
+                    ax.tick_params(colors=color, which='both')
+                    ax.set_ylabel(label, color=color)
+                    ax.legend(loc='upper right')
+                self.alpha_line, self.beta_line = lines
+                self.ax_beta.set_xlabel('每种假设下的检验次数', color=color)
+                self.ax_alpha.set_title('蒙特卡洛验证：经验错误率的收敛', color=color, fontsize=14)
+                
+                self.figure.tight_layout()
+                self._update_lines()
+                self.canvas.draw()
+
         def __init__(self, parent=None):
             super().__init__(parent)
             self.flow_layout = FlowLayout(self)
@@ -203,10 +522,53 @@ $\alpha = P(\text{拒绝} H_0 | H_0 \text{为真})$；$\beta = P(\text{接受} H
             self.controls_layout.addWidget(self.mu_1_spin, 2, 1)
             self.controls_layout.addWidget(self.mu_1_slider, 2, 2)
             
+            # sigma 参数设置
+            self.sigma_label = BodyLabel("σ（总体标准差）：", self)
+            self.sigma_spin = CompactDoubleSpinBox(self)
+            self.sigma_spin.setRange(0.1, 5)
+            self.sigma_spin.setSingleStep(0.1)
+            self.sigma_spin.setValue(1)
+            self.sigma_slider = Slider(Qt.Horizontal, self)
+            self.sigma_slider.setRange(1, 50)
+            self.sigma_slider.setSingleStep(1)
+            self.sigma_slider.setValue(10)
+            
+            self.controls_layout.addWidget(self.sigma_label, 3, 0)
+            self.controls_layout.addWidget(self.sigma_spin, 3, 1)
+            self.controls_layout.addWidget(self.sigma_slider, 3, 2)
+            
+            # n 参数设置
+            self.n_label = BodyLabel("n（样本量）：", self)
+            self.n_spin = CompactSpinBox(self)
+            self.n_spin.setRange(int(N_GRID[0]), int(N_GRID[-1]))
+            self.n_spin.setValue(1)
+            self.n_slider = Slider(Qt.Horizontal, self)
+            self.n_slider.setRange(int(N_GRID[0]), int(N_GRID[-1]))
+            self.n_slider.setSingleStep(1)
+            self.n_slider.setValue(1)
+            
+            self.controls_layout.addWidget(self.n_label, 4, 0)
+            self.controls_layout.addWidget(self.n_spin, 4, 1)
+            self.controls_layout.addWidget(self.n_slider, 4, 2)
+            
+            # 蒙特卡洛验证
+            self.monte_carlo_toggle = TogglePushButton("蒙特卡洛验证", self)
+            self.monte_carlo_label = BodyLabel("", self)
+            
+            self.controls_layout.addWidget(self.monte_carlo_toggle, 5, 0)
+            self.controls_layout.addWidget(self.monte_carlo_label, 5, 1, 1, 2)
+            
             self.flow_layout.addWidget(self.control_container)
             
             self.plot_widget = self.PlotWidget(self)
             self.flow_layout.addWidget(self.plot_widget)
+            
+            self.power_widget = self.PowerWidget(self)
+            self.flow_layout.addWidget(self.power_widget)
+            
+            self.monte_carlo_widget = self.MonteCarloWidget(self)
+            self.monte_carlo_widget.setVisible(False)
+            self.flow_layout.addWidget(self.monte_carlo_widget)
                         
             # 连接 alpha 控制器
             self.alpha_spin.valueChanged.connect(
@@ -232,36 +594,55 @@ $\alpha = P(\text{拒绝} H_0 | H_0 \text{为真})$；$\beta = P(\text{接受} H
                 lambda: self.mu_1_spin.setValue(self.mu_1_slider.value() / 100)
             )
             
-            # 连接更新信号
-            self.alpha_spin.valueChanged.connect(
-                lambda: self.plot_widget.update_plot(
-                    alpha=self.alpha_spin.value(),
-                    mu_0=self.mu_0_spin.value(),
-                    mu_1=self.mu_1_spin.value()
-                )
-            )
-            self.mu_0_spin.valueChanged.connect(
-                lambda: self.plot_widget.update_plot(
-                    alpha=self.alpha_spin.value(),
-                    mu_0=self.mu_0_spin.value(),
-                    mu_1=self.mu_1_spin.value()
-                )
+            # 连接 sigma 与 n 控制器
+            self.sigma_spin.valueChanged.connect(
+                lambda: self.sigma_slider.setValue(int(round(self.sigma_spin.value() * 10)))
             )
-            self.mu_1_spin.valueChanged.connect(
-                lambda: self.plot_widget.update_plot(
-                    alpha=self.alpha_spin.value(),
-                    mu_0=self.mu_0_spin.value(),
-                    mu_1=self.mu_1_spin.value()
-                )
+            self.sigma_slider.valueChanged.connect(
+                lambda: self.sigma_spin.setValue(self.sigma_slider.value() / 10)
             )
+            self.n_spin.valueChanged.connect(self.n_slider.setValue)
+            self.n_slider.valueChanged.connect(self.n_spin.setValue)
+            
+            # 连接更新信号
+            self.alpha_spin.valueChanged.connect(lambda: self.update_parameters())
+            self.mu_0_spin.valueChanged.connect(lambda: self.update_parameters())
+            self.mu_1_spin.valueChanged.connect(lambda: self.update_parameters())
+            self.sigma_spin.valueChanged.connect(lambda: self.update_parameters())
+            self.n_spin.valueChanged.connect(lambda: self.update_parameters())
+            
+            self.monte_carlo_toggle.toggled.connect(self.toggle_monte_carlo)
+            self.monte_carlo_widget.statusChanged.connect(self.monte_carlo_label.setText)
+            self.monte_carlo_widget.finished.connect(self.monte_carlo_finished)
             
-            cfg.themeChanged.connect(
-                lambda: self.plot_widget.update_plot(
-                    alpha=self.alpha_spin.value(),
-                    mu_0=self.mu_0_spin.value(),
-                    mu_1=self.mu_1_spin.value()
-                )
+            cfg.themeChanged.connect(lambda: self.update_parameters(force=True))
+        
+        def toggle_monte_carlo(self, checked):
+            self.monte_carlo_widget.setVisible(checked)
+            if checked:
+                if self.monte_carlo_widget.stale:
+                    self.monte_carlo_widget.refresh()
+                self.monte_carlo_widget.start()
+            else:
+                self.monte_carlo_widget.stop()
+        
+        def monte_carlo_finished(self):
+            # 模拟结束后保留收敛曲线，只复位按钮状态
+            self.monte_carlo_toggle.blockSignals(True)
+            self.monte_carlo_toggle.setChecked(False)
+            self.monte_carlo_toggle.blockSignals(False)
+        
+        def update_parameters(self, force=False):
+            params = dict(
+                alpha=self.alpha_spin.value(),
+                mu_0=self.mu_0_spin.value(),
+                mu_1=self.mu_1_spin.value(),
+                sigma=self.sigma_spin.value(),
+                n=self.n_spin.value()
             )
+            self.plot_widget.update_plot(**params)
+            self.power_widget.update_plot(**params, force=force)
+            self.monte_carlo_widget.set_parameters(**params, force=force)
 
         def resizeEvent(self, event):
             super().resizeEvent(event)
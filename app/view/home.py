@@ -105,4 +105,12 @@ class HomeInterface(QWidget):
         self.flowLayout.addWidget(HomeCard('骰子实验', '投掷骰子并统计结果分布与可视化。', 'dice_rolling_experiment', 8))
         self.flowLayout.addWidget(HomeCard('硬币实验', '投掷硬币并统计结果分布与可视化。', 'coin_tossing_experiment', 9))
         self.flowLayout.addWidget(HomeCard('连续随机变量分布', '若干种常见的连续随机变量的分布函数。', 'continuous_pdf', 10))
-        self.flowLayout.addWidget(HomeCard('离散随机变量分布', '若干种常见的离散随机变量的分布函数。', 'discrete_pdf', 11))
\ No newline at end of file
+        self.flowLayout.addWidget(HomeCard('离散随机变量分布', '若干种常见的离散随机变量的分布函数。', 'discrete_pdf', 11))
+        self.flowLayout.addWidget(HomeCard('高尔顿板实验', '小球穿过多层钉子落入格子，频率分布逐渐逼近二项分布与正态分布。', 'galton_board', 12))
+        self.flowLayout.addWidget(HomeCard('随机游走与布朗运动', '同时模拟上千条随机游走路径，观察 √n 包络与终点的正态分布。', 'random_walk', 13))
+        self.flowLayout.addWidget(HomeCard('蒙特卡洛法估计π', '用蒲丰投针或圆内投点估计 π，观察误差按 1/√n 收敛。', 'pi_estimation', 14))
+        self.flowLayout.addWidget(HomeCard('自助法置信区间', '对样本有放回重抽样，比较百分位数、BCa 与正态理论置信区间。', 'bootstrap', 15))
+        self.flowLayout.addWidget(HomeCard('MCMC 抽样', '数百条 Metropolis–Hastings 链同时运行，观察轨迹、接受率与有效样本量。', 'mcmc_sampling', 16))
+        self.flowLayout.addWidget(HomeCard('大数定律', '任意分布的样本均值随样本量的变化，包括期望不存在的柯西分布。', 'law_of_large_numbers', 17))
+        self.flowLayout.addWidget(HomeCard('经验数据的分布拟合', '分块读取多达 10⁸ 个观测值，用极大似然估计拟合各常见分布并按 AIC 排序。', 'data_fitting', 18))
+        self.flowLayout.addWidget(HomeCard('长程频率历史', '投币、掷骰子多达 10⁹ 步的逐步历史，按 min/max/mean 金字塔随意缩放与平移。', 'long_run_history', 19))
\ No newline at end of file
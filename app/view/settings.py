@@ -1,13 +1,15 @@
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import (
-    QWidget
+    QWidget, QFileDialog
 )
 from qfluentwidgets import (
     TitleLabel, ScrollArea, ExpandLayout,
     FluentIcon, setTheme, FluentStyleSheet,
-    HyperlinkCard, OptionsSettingCard, SettingCardGroup
+    HyperlinkCard, OptionsSettingCard, SettingCardGroup, PushSettingCard
 )
 from ..common.config import cfg
+from ..common.framecache import frame_cache
+from ..common.session import sessions
 
 class SettingsInterface(ScrollArea):
     def __init__(self, parent=None):
@@ -61,6 +63,26 @@ class SettingsInterface(ScrollArea):
             parent=self.personalGroup
         )
         
+        # performance
+        self.performanceGroup = SettingCardGroup("性能", self.scrollWidget)
+        self.frameCacheCard = PushSettingCard(
+            "清空",
+            FluentIcon.BROOM,
+            "图像缓存",
+            "",
+            parent=self.performanceGroup
+        )
+        
+        # session
+        self.sessionGroup = SettingCardGroup("会话", self.scrollWidget)
+        self.recordCard = PushSettingCard(
+            "开始录制",
+            FluentIcon.VIDEO,
+            "录制会话",
+            "",
+            parent=self.sessionGroup
+        )
+        
         # initWidget
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.setWidget(self.scrollWidget)
@@ -76,6 +98,48 @@ class SettingsInterface(ScrollArea):
         self.personalGroup.addSettingCard(self.themeSwitch)
         self.personalGroup.addSettingCard(self.zoomCard)
         self.expandLayout.addWidget(self.personalGroup)
+        self.performanceGroup.addSettingCard(self.frameCacheCard)
+        self.expandLayout.addWidget(self.performanceGroup)
+        self.sessionGroup.addSettingCard(self.recordCard)
+        self.expandLayout.addWidget(self.sessionGroup)
         
         cfg.themeChanged.connect(setTheme)
+        self.frameCacheCard.clicked.connect(self.clearFrameCache)
+        self.recordCard.clicked.connect(self.toggleRecording)
+    
+    def updateFrameCacheInfo(self):
+        total = frame_cache.hits + frame_cache.misses
+        rate = f"{frame_cache.hits / total:.0%}" if total else "—"
+        self.frameCacheCard.setContent(
+            f"已缓存 {len(frame_cache)} 张图像（{frame_cache.bytes / (1 << 20):.1f} MB），"
+            f"命中 {frame_cache.hits} 次，未命中 {frame_cache.misses} 次，命中率 {rate}"
+        )
+    
+    def clearFrameCache(self):
+        frame_cache.clear()
+        self.updateFrameCacheInfo()
+    
+    def updateRecordInfo(self):
+        if sessions.recording:
+            self.recordCard.button.setText("停止录制")
+            self.recordCard.setContent(
+                f"正在录制到 {sessions.recorder.path}，已记录 {sessions.recorder.count} 个事件"
+            )
+        else:
+            self.recordCard.button.setText("开始录制")
+            self.recordCard.setContent("记录参数修改与模拟结果，可用 python -m app.replay 加速回放")
+    
+    def toggleRecording(self):
+        if sessions.recording:
+            sessions.stop()
+        else:
+            path, _ = QFileDialog.getSaveFileName(self, "录制会话", "session.pvsession", "ProbViz 会话 (*.pvsession)")
+            if path:
+                sessions.start(path)
+        self.updateRecordInfo()
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.updateFrameCacheInfo()
+        self.updateRecordInfo()
 
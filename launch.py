@@ -1,3 +1,4 @@
+import multiprocessing
 import os
 import sys
 
@@ -5,35 +6,41 @@ from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont
 from PyQt5.QtWidgets import QApplication
 
-from app.view.MainWindow import MainWindow
-from app.common.config import cfg
 
-import matplotlib
-# add Chinese font support for matplotlib
-matplotlib.use('Qt5Agg')
-matplotlib.rcParams['font.sans-serif'] = ['Microsoft YaHei', 'SimHei', 'Arial Unicode MS', 'DejaVu Sans']
-matplotlib.rcParams['axes.unicode_minus'] = False
+if __name__ == '__main__':
+    # 进程池以 spawn 方式启动工作进程，打包后的程序需要先交由 freeze_support 处理
+    multiprocessing.freeze_support()
+    
+    # 界面模块只在主进程中导入，工作进程导入本文件时不加载 Qt 界面
+    from app.view.MainWindow import MainWindow
+    from app.common.config import cfg
+    
+    import matplotlib
+    # add Chinese font support for matplotlib
+    matplotlib.use('Qt5Agg')
+    matplotlib.rcParams['font.sans-serif'] = ['Microsoft YaHei', 'SimHei', 'Arial Unicode MS', 'DejaVu Sans']
+    matplotlib.rcParams['axes.unicode_minus'] = False
 
-from app.common.pyinstalltools import setup_qtWebEngine
+    from app.common.pyinstalltools import setup_qtWebEngine
 
-setup_qtWebEngine()
+    setup_qtWebEngine()
 
-# # enable dpi scale
-if cfg.get(cfg.dpiScale) == "Auto":
-    QApplication.setHighDpiScaleFactorRoundingPolicy(
-        Qt.HighDpiScaleFactorRoundingPolicy.PassThrough)
-    QApplication.setAttribute(Qt.AA_EnableHighDpiScaling)
-else:
-    os.environ["QT_ENABLE_HIGHDPI_SCALING"] = "0"
-    os.environ["QT_SCALE_FACTOR"] = str(cfg.get(cfg.dpiScale))
+    # # enable dpi scale
+    if cfg.get(cfg.dpiScale) == "Auto":
+        QApplication.setHighDpiScaleFactorRoundingPolicy(
+            Qt.HighDpiScaleFactorRoundingPolicy.PassThrough)
+        QApplication.setAttribute(Qt.AA_EnableHighDpiScaling)
+    else:
+        os.environ["QT_ENABLE_HIGHDPI_SCALING"] = "0"
+        os.environ["QT_SCALE_FACTOR"] = str(cfg.get(cfg.dpiScale))
 
-QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps)
+    QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps)
 
-# create application
-app = QApplication(sys.argv)
-app.setAttribute(Qt.AA_DontCreateNativeWidgetSiblings)
+    # create application
+    app = QApplication(sys.argv)
+    app.setAttribute(Qt.AA_DontCreateNativeWidgetSiblings)
 
-w = MainWindow()
-w.show()
+    w = MainWindow()
+    w.show()
 
-app.exec_()
+    app.exec_()
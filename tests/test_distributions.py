@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from app.common.distributions import ppf_table, freeze
+
+# 界面中可以设置的形状参数下限为 0.1，分位数水平下限为 0.001
+QUANTILE_LEVELS = np.array([0.001, 0.005, 0.025, 0.1, 0.5, 0.9, 0.975, 0.995, 0.999])
+
+
+@pytest.mark.parametrize('dist_type, params', [
+    ('gamma', {'alpha': 0.1, 'beta': 1}),
+    ('gamma', {'alpha': 0.5, 'beta': 2}),
+    ('beta', {'alpha': 0.1, 'beta': 0.1}),
+    ('beta', {'alpha': 0.5, 'beta': 5}),
+    ('t', {'df': 1}),
+    ('normal', {'mu': 0, 'sigma': 1}),
+])
+def test_ppf_table_matches_ppf(dist_type, params):
+    """密度在支撑端点发散（形状参数小于 1）时查找表的分位数仍与 ppf 一致"""
+    expected = freeze(dist_type, params).ppf(QUANTILE_LEVELS)
+    actual = ppf_table(dist_type, params).quantile(QUANTILE_LEVELS)
+    np.testing.assert_allclose(actual, expected, rtol=1e-3, atol=1e-9)
@@ -0,0 +1,32 @@
+import warnings
+
+import numpy as np
+import pytest
+
+from app.common.dataimport import StreamingSummary
+from app.common.fitting import fit_all, fit_params
+
+
+def summarize(values):
+    summary = StreamingSummary()
+    summary.add(np.asarray(values, dtype=float))
+    return summary
+
+
+@pytest.mark.parametrize('value', [0.1, 3.7, 1e6])
+def test_constant_sample_has_no_gamma_fit(value):
+    """数据全部相同时不拟合伽马分布，其余拟合的参数都是有限值且不产生警告"""
+    summary = summarize(np.full(1000, value))
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        assert fit_params('gamma', summary) is None
+        fits = fit_all(summary)
+    for _, params, _, aic in fits:
+        assert np.all(np.isfinite(list(params.values())))
+
+
+def test_gamma_fit_recovers_parameters():
+    summary = summarize(np.random.default_rng(1).gamma(2.0, 1.5, 100000))
+    params = fit_params('gamma', summary)
+    assert params['alpha'] == pytest.approx(2.0, rel=0.05)
+    assert params['beta'] == pytest.approx(1 / 1.5, rel=0.05)
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from app.common.export import trace_chunks
+from app.common.rng import fill_steps, BLOCK_STEPS
+from app.common.simulation import toss_coins, roll_dice, normal_sample_means, MEANS_BLOCK_STEPS
+
+MEANS_ARGS = (0.0, 1.0, [2, 7, 15, 22, 30])
+CASES = [
+    (toss_coins, (3000,), np.uint8, BLOCK_STEPS, ()),
+    (roll_dice, (3000,), np.uint8, BLOCK_STEPS, ()),
+    (normal_sample_means, (300, len(MEANS_ARGS[2])), float, MEANS_BLOCK_STEPS, MEANS_ARGS),
+]
+
+
+def fill(func, shape, dtype, seed, start, block_steps, args):
+    out = np.empty(shape, dtype)
+    fill_steps(func, out, seed, start, block_steps, args)
+    return out
+
+
+@pytest.mark.parametrize('func, shape, dtype, block_steps, args', CASES)
+@pytest.mark.parametrize('offset', [1, 10, 63, 64, 65, 1000])
+def test_offset_matches_full_run(func, shape, dtype, block_steps, args, offset):
+    """从第 offset 步开始生成的结果与一次生成全部步数后截取的部分相同"""
+    full = fill(func, shape, dtype, 42, 0, block_steps, args)
+    offset = min(offset, shape[0] - 1)
+    part = fill(func, (shape[0] - offset,) + shape[1:], dtype, 42, offset, block_steps, args)
+    np.testing.assert_array_equal(part, full[offset:])
+
+
+@pytest.mark.parametrize('func, shape, dtype, block_steps, args', CASES)
+def test_prefix_matches_longer_run(func, shape, dtype, block_steps, args):
+    """步数较少的结果是步数较多的结果的前缀"""
+    full = fill(func, shape, dtype, 7, 0, block_steps, args)
+    longer = fill(func, (2 * shape[0],) + shape[1:], dtype, 7, 0, block_steps, args)
+    np.testing.assert_array_equal(longer[:shape[0]], full)
+
+
+def test_exported_means_do_not_depend_on_steps():
+    """导出 2000 次重复的前 1000 行与导出 1000 次重复相同"""
+    params = {'mu': 0, 'sigma': 1, 'sizes': MEANS_ARGS[2]}
+
+    def export(steps):
+        chunks = [columns for _, columns in trace_chunks('consistency_of_point_estimation', steps, 42, params)]
+        return np.column_stack([np.concatenate([chunk[f'mean_n{size}'] for chunk in chunks])
+                                for size in params['sizes']])
+
+    np.testing.assert_array_equal(export(2000)[:1000], export(1000))
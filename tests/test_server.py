@@ -0,0 +1,55 @@
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip('PyQt5.QtWidgets')
+
+from app.server import RenderServer
+
+
+async def get(port, target):
+    """发送一个 GET 请求，返回 (状态码, 响应体)"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(f'GET {target} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n'.encode('latin-1'))
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b'\r\n\r\n')
+    return int(head.split()[1]), body
+
+
+async def exercise(server):
+    listener = await server.start('127.0.0.1', 0)
+    port = listener.sockets[0].getsockname()[1]
+    try:
+        # 使用 SharedJob 模拟的视图，同时验证工作进程中不再嵌套启动进程池
+        target = '/render?view=coin_tossing_experiment&n=20&seed=7&size=320x240'
+        responses = await asyncio.gather(*(get(port, target) for _ in range(3)))
+        unknown_view = await get(port, '/render?view=no_such_view')
+        unknown_param = await get(port, '/render?view=coin_tossing_experiment&no_such_param=1')
+        status, stats = await get(port, '/stats')
+    finally:
+        listener.close()
+        await listener.wait_closed()
+    return responses, unknown_view, unknown_param, stats
+
+
+def test_render_server_coalesces_and_rejects_bad_requests():
+    server = RenderServer(workers=1, timeout=20.0)
+    try:
+        responses, unknown_view, unknown_param, stats = asyncio.run(asyncio.wait_for(exercise(server), 120))
+    finally:
+        server.executor.shutdown(wait=True)
+
+    assert [status for status, _ in responses] == [200, 200, 200]
+    assert responses[0][1].startswith(b'\x89PNG')
+    assert responses[1][1] == responses[0][1] == responses[2][1]
+    assert unknown_view[0] == 400
+    assert unknown_param[0] == 400
+
+    stats = json.loads(stats)
+    assert stats['coalesced'] == 2
+    # 两个错误请求中只有未知参数需要进入工作进程才能发现
+    assert stats['renders'] == 2
+    assert stats['errors'] == 2
@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+pytest.importorskip('PyQt5.QtWidgets')
+
+from app.common.session import read_session
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RECORD = textwrap.dedent('''
+    import sys
+    from app.common.session import sessions
+
+    if sys.argv[2] == 'qt':
+        from PyQt5.QtCore import QTimer
+        from PyQt5.QtWidgets import QApplication
+        app = QApplication([])
+    sessions.start(sys.argv[1])
+    for i in range(10):
+        sessions.recorder.param('coin_tossing_experiment', 'n', str(10 + i))
+    if sys.argv[2] == 'qt':
+        QTimer.singleShot(0, app.quit)
+        app.exec_()
+''')
+
+
+@pytest.mark.parametrize('exit_path', ['qt', 'atexit'])
+def test_buffered_events_are_written_on_exit(exit_path, tmp_path):
+    """录制中直接退出程序时缓冲区中的事件仍写入文件"""
+    path = tmp_path / 'session.pvsession'
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    result = subprocess.run([sys.executable, '-c', RECORD, str(path), exit_path],
+                            cwd=ROOT, env=env, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    params, results = read_session(path)
+    assert [value for _, _, _, value in params] == [str(10 + i) for i in range(10)]
@@ -0,0 +1,23 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip('PyQt5.QtWidgets')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize('view', ['consistency_of_point_estimation', 'coin_tossing_experiment'])
+def test_parallel_sweep_of_shared_job_views_exits(view, tmp_path):
+    """模拟任务使用 SharedJob 的视图并行扫描后进程池能正常关闭并写出 GIF"""
+    out = tmp_path / 'sweep.gif'
+    result = subprocess.run(
+        [sys.executable, '-m', 'app.sweep', '--view', view, '--sweep', 'n=10:40:3', '--out', str(out),
+         '--jobs', '2', '--size', '320x240', '--timeout', '20'],
+        cwd=ROOT, capture_output=True, text=True, timeout=180
+    )
+    assert result.returncode == 0, result.stderr
+    assert out.stat().st_size > 0
+    assert 'leaked shared_memory' not in result.stderr